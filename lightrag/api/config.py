@@ -349,6 +349,11 @@ def parse_args() -> argparse.Namespace:
     # Select Document loading tool (DOCLING, DEFAULT)
     args.document_loading_engine = get_env_value("DOCUMENT_LOADING_ENGINE", "DEFAULT")
 
+    # Number of processes extracting text from PDF/DOCX/PPTX/XLSX files (0 to parse in threads)
+    args.max_parallel_parse = get_env_value(
+        "MAX_PARALLEL_PARSE", min(4, os.cpu_count() or 1), int
+    )
+
     # Add environment variables that were previously read directly
     args.cors_origins = get_env_value("CORS_ORIGINS", "*")
     args.summary_language = get_env_value("SUMMARY_LANGUAGE", DEFAULT_SUMMARY_LANGUAGE)
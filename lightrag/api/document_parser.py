@@ -0,0 +1,176 @@
+"""
+Document text extraction running in a process pool.
+
+Parsing PDF/DOCX/PPTX/XLSX files is CPU bound and would block the event loop of the
+API worker. The extractors in this module are plain functions so they can be pickled
+and executed in a bounded `ProcessPoolExecutor`, keeping the API responsive while
+bulk scans use all available cores.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Callable, Optional
+
+import pipmaster as pm
+
+from lightrag.utils import logger
+
+_parse_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _extract_with_docling(file_path: str) -> str:
+    if not pm.is_installed("docling"):  # type: ignore
+        pm.install("docling")
+    from docling.document_converter import DocumentConverter  # type: ignore
+
+    converter = DocumentConverter()
+    result = converter.convert(file_path)
+    return result.document.export_to_markdown()
+
+
+def extract_pdf(file_bytes: bytes, file_path: str, engine: str = "DEFAULT") -> str:
+    """Extract text from a PDF file"""
+    if engine == "DOCLING":
+        return _extract_with_docling(file_path)
+
+    if not pm.is_installed("pypdf2"):  # type: ignore
+        pm.install("pypdf2")
+    from PyPDF2 import PdfReader  # type: ignore
+
+    reader = PdfReader(BytesIO(file_bytes))
+    return "".join(page.extract_text() + "\n" for page in reader.pages)
+
+
+def extract_docx(file_bytes: bytes, file_path: str, engine: str = "DEFAULT") -> str:
+    """Extract text from a DOCX file"""
+    if engine == "DOCLING":
+        return _extract_with_docling(file_path)
+
+    if not pm.is_installed("python-docx"):  # type: ignore
+        try:
+            pm.install("python-docx")
+        except Exception:
+            pm.install("docx")
+    from docx import Document  # type: ignore
+
+    doc = Document(BytesIO(file_bytes))
+    return "\n".join([paragraph.text for paragraph in doc.paragraphs])
+
+
+def extract_pptx(file_bytes: bytes, file_path: str, engine: str = "DEFAULT") -> str:
+    """Extract text from a PPTX file"""
+    if engine == "DOCLING":
+        return _extract_with_docling(file_path)
+
+    if not pm.is_installed("python-pptx"):  # type: ignore
+        pm.install("pptx")
+    from pptx import Presentation  # type: ignore
+
+    prs = Presentation(BytesIO(file_bytes))
+    parts = []
+    for slide in prs.slides:
+        for shape in slide.shapes:
+            if hasattr(shape, "text"):
+                parts.append(shape.text + "\n")
+    return "".join(parts)
+
+
+def extract_xlsx(file_bytes: bytes, file_path: str, engine: str = "DEFAULT") -> str:
+    """Extract text from a XLSX file"""
+    if engine == "DOCLING":
+        return _extract_with_docling(file_path)
+
+    if not pm.is_installed("openpyxl"):  # type: ignore
+        pm.install("openpyxl")
+    from openpyxl import load_workbook  # type: ignore
+
+    wb = load_workbook(BytesIO(file_bytes))
+    parts = []
+    for sheet in wb:
+        parts.append(f"Sheet: {sheet.title}\n")
+        for row in sheet.iter_rows(values_only=True):
+            parts.append(
+                "\t".join(str(cell) if cell is not None else "" for cell in row) + "\n"
+            )
+        parts.append("\n")
+    return "".join(parts)
+
+
+DOCUMENT_EXTRACTORS: dict[str, Callable[[bytes, str, str], str]] = {
+    ".pdf": extract_pdf,
+    ".docx": extract_docx,
+    ".pptx": extract_pptx,
+    ".xlsx": extract_xlsx,
+}
+
+
+def get_parse_executor(max_workers: int) -> Optional[ProcessPoolExecutor]:
+    """Return the shared parsing process pool, creating it on first use
+
+    Args:
+        max_workers: Number of parser processes, 0 disables the pool and
+            extraction runs in a thread of the current process instead
+
+    Returns:
+        ProcessPoolExecutor or None if the pool is disabled
+    """
+    global _parse_executor
+    if max_workers <= 0:
+        return None
+    if _parse_executor is None:
+        # Use spawn so that children do not inherit the event loop, locks and
+        # Manager proxies of the (multi-threaded) API worker
+        _parse_executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        logger.info(
+            f"Process {os.getpid()} document parser pool started with {max_workers} workers"
+        )
+    return _parse_executor
+
+
+async def extract_document_text(
+    ext: str,
+    file_bytes: bytes,
+    file_path: str,
+    engine: str = "DEFAULT",
+    max_workers: int = 0,
+) -> str:
+    """Extract text of a document off the event loop
+
+    Args:
+        ext: Lower-case file extension, must be a key of DOCUMENT_EXTRACTORS
+        file_bytes: Raw file content
+        file_path: Path of the file on disk (used by DOCLING engine)
+        engine: Document loading engine, "DEFAULT" or "DOCLING"
+        max_workers: Size of the parsing process pool
+
+    Returns:
+        str: Extracted text content
+
+    Raises:
+        ValueError: If the extension has no extractor
+        Exception: Any error raised by the extractor
+    """
+    extractor = DOCUMENT_EXTRACTORS.get(ext)
+    if extractor is None:
+        raise ValueError(f"No extractor registered for file extension {ext}")
+
+    loop = asyncio.get_running_loop()
+    executor = get_parse_executor(max_workers)
+    return await loop.run_in_executor(
+        executor, extractor, file_bytes, file_path, engine
+    )
+
+
+def shutdown_parse_executor() -> None:
+    """Shut down the parsing process pool if it was started"""
+    global _parse_executor
+    if _parse_executor is not None:
+        _parse_executor.shutdown(wait=False, cancel_futures=True)
+        _parse_executor = None
+        logger.info(f"Process {os.getpid()} document parser pool shut down")
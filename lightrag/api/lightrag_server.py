@@ -35,6 +35,7 @@ from lightrag import LightRAG, __version__ as core_version
 from lightrag.api import __api_version__
 from lightrag.types import GPTKeywordExtractionFormat
 from lightrag.utils import EmbeddingFunc
+from lightrag.llm.router import EndpointRouter, is_multi_endpoint
 from lightrag.constants import (
     DEFAULT_LOG_MAX_BYTES,
     DEFAULT_LOG_BACKUP_COUNT,
@@ -47,6 +48,7 @@ from lightrag.api.routers.document_routes import (
     create_document_routes,
     run_scanning_process,
 )
+from lightrag.api.document_parser import shutdown_parse_executor
 from lightrag.api.routers.query_routes import create_query_routes
 from lightrag.api.routers.graph_routes import create_graph_routes
 from lightrag.api.routers.ollama_api import OllamaAPI
@@ -238,6 +240,9 @@ def create_app(args):
             # Clean up database connections
             await rag.finalize_storages()
 
+            # Stop document parser processes
+            shutdown_parse_executor()
+
             # Clean up shared data
             finalize_share_data()
 
@@ -320,7 +325,7 @@ def create_app(args):
                 prompt,
                 system_prompt=system_prompt,
                 history_messages=history_messages,
-                base_url=args.llm_binding_host,
+                base_url=kwargs.pop("base_url", args.llm_binding_host),
                 api_key=args.llm_binding_api_key,
                 **kwargs,
             )
@@ -357,7 +362,7 @@ def create_app(args):
                 prompt,
                 system_prompt=system_prompt,
                 history_messages=history_messages,
-                base_url=args.llm_binding_host,
+                base_url=kwargs.pop("base_url", args.llm_binding_host),
                 api_key=os.getenv("AZURE_OPENAI_API_KEY", args.llm_binding_api_key),
                 api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-08-01-preview"),
                 **kwargs,
@@ -366,6 +371,27 @@ def create_app(args):
         return optimized_azure_openai_model_complete
 
     def create_llm_model_func(binding: str):
+        """
+        Create LLM model function based on binding type, routed over the
+        endpoints when LLM_BINDING_HOST lists several of them.
+        """
+        llm_func = create_binding_llm_model_func(binding)
+        if llm_router is None:
+            return llm_func
+        url_param = "host" if binding in ["lollms", "ollama"] else "base_url"
+        return llm_router.wrap(llm_func, url_param)
+
+    def create_query_llm_model_func(binding: str):
+        """
+        Create the LLM model function of the query pool when LLM_QUERY_BINDING_HOST
+        is set, otherwise queries use the ingestion endpoints.
+        """
+        if query_llm_router is None:
+            return None
+        url_param = "host" if binding in ["lollms", "ollama"] else "base_url"
+        return query_llm_router.wrap(create_binding_llm_model_func(binding), url_param)
+
+    def create_binding_llm_model_func(binding: str):
         """
         Create LLM model function based on binding type.
         Uses optimized functions for OpenAI bindings and lazy import for others.
@@ -419,7 +445,7 @@ def create_app(args):
         Uses lazy imports for all bindings and avoids repeated configuration parsing.
         """
 
-        async def optimized_embedding_function(texts):
+        async def optimized_embedding_function(texts, host=host):
             try:
                 if binding == "lollms":
                     from lightrag.llm.lollms import lollms_embed
@@ -476,6 +502,36 @@ def create_app(args):
         "EMBEDDING_TIMEOUT", DEFAULT_EMBEDDING_TIMEOUT, int
     )
 
+    # Load balance and fail over when a binding host lists several endpoints
+    llm_router = None
+    if is_multi_endpoint(args.llm_binding_host):
+        if args.llm_binding == "aws_bedrock":
+            logger.warning("aws_bedrock LLM binding ignores LLM_BINDING_HOST endpoints")
+        else:
+            llm_router = EndpointRouter.from_spec(
+                args.llm_binding_host, name="LLM endpoints"
+            )
+    # Queries may use endpoints of their own, see LLM_QUERY_MAX_ASYNC
+    query_llm_router = None
+    query_llm_host = os.getenv("LLM_QUERY_BINDING_HOST")
+    if query_llm_host:
+        if args.llm_binding == "aws_bedrock":
+            logger.warning("aws_bedrock LLM binding ignores LLM_QUERY_BINDING_HOST")
+        else:
+            query_llm_router = EndpointRouter.from_spec(
+                query_llm_host, name="LLM query endpoints"
+            )
+    embedding_router = None
+    if is_multi_endpoint(args.embedding_binding_host):
+        if args.embedding_binding in ["azure_openai", "aws_bedrock"]:
+            logger.warning(
+                f"{args.embedding_binding} embedding binding ignores EMBEDDING_BINDING_HOST endpoints"
+            )
+        else:
+            embedding_router = EndpointRouter.from_spec(
+                args.embedding_binding_host, name="Embedding endpoints"
+            )
+
     async def bedrock_model_complete(
         prompt,
         system_prompt=None,
@@ -504,17 +560,20 @@ def create_app(args):
         )
 
     # Create embedding function with optimized configuration
+    embedding_binding_func = create_optimized_embedding_function(
+        config_cache=config_cache,
+        binding=args.embedding_binding,
+        model=args.embedding_model,
+        host=args.embedding_binding_host,
+        api_key=args.embedding_binding_api_key,
+        dimensions=args.embedding_dim,
+        args=args,  # Pass args object for fallback option generation
+    )
+    if embedding_router is not None:
+        embedding_binding_func = embedding_router.wrap(embedding_binding_func, "host")
     embedding_func = EmbeddingFunc(
         embedding_dim=args.embedding_dim,
-        func=create_optimized_embedding_function(
-            config_cache=config_cache,
-            binding=args.embedding_binding,
-            model=args.embedding_model,
-            host=args.embedding_binding_host,
-            api_key=args.embedding_binding_api_key,
-            dimensions=args.embedding_dim,
-            args=args,  # Pass args object for fallback option generation
-        ),
+        func=embedding_binding_func,
     )
 
     # Configure rerank function based on args.rerank_bindingparameter
@@ -585,6 +644,7 @@ def create_app(args):
             working_dir=args.working_dir,
             workspace=args.workspace,
             llm_model_func=create_llm_model_func(args.llm_binding),
+            query_llm_model_func=create_query_llm_model_func(args.llm_binding),
             llm_model_name=args.llm_model,
             llm_model_max_async=args.max_async,
             summary_max_tokens=args.summary_max_tokens,
@@ -762,6 +822,15 @@ def create_app(args):
                 "auth_mode": auth_mode,
                 "pipeline_busy": pipeline_status.get("busy", False),
                 "keyed_locks": keyed_lock_info,
+                "llm_concurrency": rag.llm_model_func.get_stats(),
+                "embedding_concurrency": rag.embedding_func.get_stats(),
+                "llm_endpoints": llm_router.get_stats() if llm_router else None,
+                "llm_query_endpoints": query_llm_router.get_stats()
+                if query_llm_router
+                else None,
+                "embedding_endpoints": embedding_router.get_stats()
+                if embedding_router
+                else None,
                 "core_version": core_version,
                 "api_version": __api_version__,
                 "webui_title": webui_title,
@@ -3,11 +3,11 @@ This module contains all document-related routes for the LightRAG API.
 """
 
 import asyncio
+import json
 from lightrag.utils import logger, get_pinyin_sort_key
 import aiofiles
 import shutil
 import traceback
-import pipmaster as pm
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Literal
@@ -16,18 +16,40 @@ from fastapi import (
     BackgroundTasks,
     Depends,
     File,
+    Header,
     HTTPException,
+    Request,
     UploadFile,
 )
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, field_validator
 
 from lightrag import LightRAG
 from lightrag.base import DeletionResult, DocProcessingStatus, DocStatus
 from lightrag.utils import generate_track_id
 from lightrag.api.utils_api import get_combined_auth_dependency
+from lightrag.api.document_parser import extract_document_text
 from ..config import global_args
 
 
+# Pipeline status fields pushed to event stream subscribers as deltas
+PIPELINE_STREAM_FIELDS = (
+    "autoscanned",
+    "busy",
+    "job_name",
+    "job_start",
+    "docs",
+    "batchs",
+    "cur_batch",
+    "request_pending",
+    "latest_message",
+)
+# Max seconds before a stream subscriber checks for events published by other workers
+PIPELINE_STREAM_CHECK_INTERVAL = 0.2
+# Seconds between keep-alive comments on an idle event stream
+PIPELINE_STREAM_HEARTBEAT_INTERVAL = 15
+
+
 # Function to format datetime to ISO format string with timezone information
 def format_datetime(dt: Any) -> Optional[str]:
     """Format datetime to ISO format string with timezone information
@@ -1000,73 +1022,24 @@ async def pipeline_enqueue_file(
                         )
                         return False, track_id
 
-                case ".pdf":
+                case ".pdf" | ".docx" | ".pptx" | ".xlsx":
+                    # CPU bound extraction runs in the parser process pool so the
+                    # event loop keeps serving requests during bulk uploads/scans
+                    format_name = ext[1:].upper()
                     try:
-                        if global_args.document_loading_engine == "DOCLING":
-                            if not pm.is_installed("docling"):  # type: ignore
-                                pm.install("docling")
-                            from docling.document_converter import DocumentConverter  # type: ignore
-
-                            converter = DocumentConverter()
-                            result = converter.convert(file_path)
-                            content = result.document.export_to_markdown()
-                        else:
-                            if not pm.is_installed("pypdf2"):  # type: ignore
-                                pm.install("pypdf2")
-                            from PyPDF2 import PdfReader  # type: ignore
-                            from io import BytesIO
-
-                            pdf_file = BytesIO(file)
-                            reader = PdfReader(pdf_file)
-                            for page in reader.pages:
-                                content += page.extract_text() + "\n"
-                    except Exception as e:
-                        error_files = [
-                            {
-                                "file_path": str(file_path.name),
-                                "error_description": "[File Extraction]PDF processing error",
-                                "original_error": f"Failed to extract text from PDF: {str(e)}",
-                                "file_size": file_size,
-                            }
-                        ]
-                        await rag.apipeline_enqueue_error_documents(
-                            error_files, track_id
+                        content = await extract_document_text(
+                            ext,
+                            file,
+                            str(file_path),
+                            engine=global_args.document_loading_engine,
+                            max_workers=global_args.max_parallel_parse,
                         )
-                        logger.error(
-                            f"[File Extraction]Error processing PDF {file_path.name}: {str(e)}"
-                        )
-                        return False, track_id
-
-                case ".docx":
-                    try:
-                        if global_args.document_loading_engine == "DOCLING":
-                            if not pm.is_installed("docling"):  # type: ignore
-                                pm.install("docling")
-                            from docling.document_converter import DocumentConverter  # type: ignore
-
-                            converter = DocumentConverter()
-                            result = converter.convert(file_path)
-                            content = result.document.export_to_markdown()
-                        else:
-                            if not pm.is_installed("python-docx"):  # type: ignore
-                                try:
-                                    pm.install("python-docx")
-                                except Exception:
-                                    pm.install("docx")
-                            from docx import Document  # type: ignore
-                            from io import BytesIO
-
-                            docx_file = BytesIO(file)
-                            doc = Document(docx_file)
-                            content = "\n".join(
-                                [paragraph.text for paragraph in doc.paragraphs]
-                            )
                     except Exception as e:
                         error_files = [
                             {
                                 "file_path": str(file_path.name),
-                                "error_description": "[File Extraction]DOCX processing error",
-                                "original_error": f"Failed to extract text from DOCX: {str(e)}",
+                                "error_description": f"[File Extraction]{format_name} processing error",
+                                "original_error": f"Failed to extract text from {format_name}: {str(e)}",
                                 "file_size": file_size,
                             }
                         ]
@@ -1074,92 +1047,7 @@ async def pipeline_enqueue_file(
                             error_files, track_id
                         )
                         logger.error(
-                            f"[File Extraction]Error processing DOCX {file_path.name}: {str(e)}"
-                        )
-                        return False, track_id
-
-                case ".pptx":
-                    try:
-                        if global_args.document_loading_engine == "DOCLING":
-                            if not pm.is_installed("docling"):  # type: ignore
-                                pm.install("docling")
-                            from docling.document_converter import DocumentConverter  # type: ignore
-
-                            converter = DocumentConverter()
-                            result = converter.convert(file_path)
-                            content = result.document.export_to_markdown()
-                        else:
-                            if not pm.is_installed("python-pptx"):  # type: ignore
-                                pm.install("pptx")
-                            from pptx import Presentation  # type: ignore
-                            from io import BytesIO
-
-                            pptx_file = BytesIO(file)
-                            prs = Presentation(pptx_file)
-                            for slide in prs.slides:
-                                for shape in slide.shapes:
-                                    if hasattr(shape, "text"):
-                                        content += shape.text + "\n"
-                    except Exception as e:
-                        error_files = [
-                            {
-                                "file_path": str(file_path.name),
-                                "error_description": "[File Extraction]PPTX processing error",
-                                "original_error": f"Failed to extract text from PPTX: {str(e)}",
-                                "file_size": file_size,
-                            }
-                        ]
-                        await rag.apipeline_enqueue_error_documents(
-                            error_files, track_id
-                        )
-                        logger.error(
-                            f"[File Extraction]Error processing PPTX {file_path.name}: {str(e)}"
-                        )
-                        return False, track_id
-
-                case ".xlsx":
-                    try:
-                        if global_args.document_loading_engine == "DOCLING":
-                            if not pm.is_installed("docling"):  # type: ignore
-                                pm.install("docling")
-                            from docling.document_converter import DocumentConverter  # type: ignore
-
-                            converter = DocumentConverter()
-                            result = converter.convert(file_path)
-                            content = result.document.export_to_markdown()
-                        else:
-                            if not pm.is_installed("openpyxl"):  # type: ignore
-                                pm.install("openpyxl")
-                            from openpyxl import load_workbook  # type: ignore
-                            from io import BytesIO
-
-                            xlsx_file = BytesIO(file)
-                            wb = load_workbook(xlsx_file)
-                            for sheet in wb:
-                                content += f"Sheet: {sheet.title}\n"
-                                for row in sheet.iter_rows(values_only=True):
-                                    content += (
-                                        "\t".join(
-                                            str(cell) if cell is not None else ""
-                                            for cell in row
-                                        )
-                                        + "\n"
-                                    )
-                                content += "\n"
-                    except Exception as e:
-                        error_files = [
-                            {
-                                "file_path": str(file_path.name),
-                                "error_description": "[File Extraction]XLSX processing error",
-                                "original_error": f"Failed to extract text from XLSX: {str(e)}",
-                                "file_size": file_size,
-                            }
-                        ]
-                        await rag.apipeline_enqueue_error_documents(
-                            error_files, track_id
-                        )
-                        logger.error(
-                            f"[File Extraction]Error processing XLSX {file_path.name}: {str(e)}"
+                            f"[File Extraction]Error processing {format_name} {file_path.name}: {str(e)}"
                         )
                         return False, track_id
 
@@ -1320,7 +1208,7 @@ async def pipeline_index_file(rag: LightRAG, file_path: Path, track_id: str = No
 async def pipeline_index_files(
     rag: LightRAG, file_paths: List[Path], track_id: str = None
 ):
-    """Index multiple files sequentially to avoid high CPU load
+    """Index multiple files, extracting at most MAX_PARALLEL_PARSE files at a time
 
     Args:
         rag: LightRAG instance
@@ -1337,11 +1225,19 @@ async def pipeline_index_files(
             file_paths, key=lambda p: get_pinyin_sort_key(str(p))
         )
 
-        # Process files sequentially with track_id
-        for file_path in sorted_file_paths:
-            success, _ = await pipeline_enqueue_file(rag, file_path, track_id)
-            if success:
-                enqueued = True
+        # Extract files concurrently, bounded so a large scan does not hold every
+        # file in memory at once; each file is enqueued as soon as it is parsed
+        semaphore = asyncio.Semaphore(max(1, global_args.max_parallel_parse))
+
+        async def enqueue_with_limit(file_path: Path) -> bool:
+            async with semaphore:
+                success, _ = await pipeline_enqueue_file(rag, file_path, track_id)
+                return success
+
+        results = await asyncio.gather(
+            *[enqueue_with_limit(file_path) for file_path in sorted_file_paths]
+        )
+        enqueued = any(results)
 
         # Process the queue only if at least one file was successfully enqueued
         if enqueued:
@@ -2096,6 +1992,122 @@ def create_document_routes(
             logger.error(traceback.format_exc())
             raise HTTPException(status_code=500, detail=str(e))
 
+    @router.get("/pipeline_status/stream", dependencies=[Depends(combined_auth)])
+    async def stream_pipeline_status(
+        request: Request,
+        last_event_id: Optional[str] = Header(default=None),
+    ):
+        """
+        Stream pipeline progress as Server-Sent Events instead of polling.
+
+        The stream starts with a `snapshot` event holding the current pipeline status,
+        followed by:
+            - `status`: changed pipeline status fields (e.g. latest_message, cur_batch)
+            - `pipeline`: job start/stop and batch progress
+            - `docs_enqueued`: documents added to the queue for a track_id
+            - `doc_status`: per-document state transitions
+            - `track_completed`: all documents of a track_id are finished
+
+        Every event carries its sequence number as the SSE `id`, so reconnecting
+        clients (which send `Last-Event-ID`) resume without missing events still
+        held in the event log. Unlike /pipeline_status, streaming does not take
+        the pipeline status lock or scan document status storage.
+
+        Events published in the worker serving the stream are delivered at once.
+        With several Gunicorn workers, events published by another worker are only
+        noticed on the next check of the shared sequence number, so they arrive up
+        to 0.2 seconds (the stream check interval) late.
+
+        Returns:
+            StreamingResponse: A `text/event-stream` response
+        """
+        from lightrag.kg.shared_storage import (
+            get_namespace_data,
+            get_pipeline_event_seq,
+            get_pipeline_events,
+            wait_for_pipeline_event,
+        )
+
+        try:
+            pipeline_status = await get_namespace_data("pipeline_status")
+        except Exception as e:
+            logger.error(f"Error opening pipeline status stream: {str(e)}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+        try:
+            last_seq = int(last_event_id) if last_event_id else None
+        except ValueError:
+            last_seq = None
+
+        def read_status_fields() -> dict:
+            status_dict = dict(pipeline_status)
+            fields = {k: status_dict.get(k) for k in PIPELINE_STREAM_FIELDS}
+            fields["job_start"] = format_datetime(fields["job_start"])
+            return fields
+
+        def format_sse(event_type: str, data: dict, event_id: int | None = None):
+            lines = []
+            if event_id is not None:
+                lines.append(f"id: {event_id}")
+            lines.append(f"event: {event_type}")
+            lines.append(f"data: {json.dumps(data, ensure_ascii=False, default=str)}")
+            return "\n".join(lines) + "\n\n"
+
+        async def event_generator():
+            nonlocal last_seq
+            current_seq = get_pipeline_event_seq()
+            if last_seq is None or last_seq > current_seq:
+                last_seq = current_seq
+            last_fields = read_status_fields()
+            yield format_sse("snapshot", last_fields, last_seq)
+
+            idle_time = 0.0
+            try:
+                while not await request.is_disconnected():
+                    has_event = await wait_for_pipeline_event(
+                        last_seq, PIPELINE_STREAM_CHECK_INTERVAL
+                    )
+                    sent = False
+
+                    if has_event:
+                        for event in await get_pipeline_events(last_seq):
+                            last_seq = event["seq"]
+                            payload = {**event["data"], "time": event["time"]}
+                            yield format_sse(event["type"], payload, last_seq)
+                            sent = True
+
+                    # Idle pipeline fields only change along with a published event
+                    if has_event or last_fields.get("busy"):
+                        fields = read_status_fields()
+                        changed = {
+                            k: v for k, v in fields.items() if last_fields.get(k) != v
+                        }
+                        if changed:
+                            last_fields = fields
+                            yield format_sse("status", changed)
+                            sent = True
+
+                    if sent:
+                        idle_time = 0.0
+                    else:
+                        idle_time += PIPELINE_STREAM_CHECK_INTERVAL
+                        if idle_time >= PIPELINE_STREAM_HEARTBEAT_INTERVAL:
+                            idle_time = 0.0
+                            yield ": keep-alive\n\n"
+            except asyncio.CancelledError:
+                logger.debug("Pipeline status stream cancelled by client")
+                raise
+
+        return StreamingResponse(
+            event_generator(),
+            media_type="text/event-stream",
+            headers={
+                "Cache-Control": "no-cache",
+                "Connection": "keep-alive",
+                "X-Accel-Buffering": "no",  # Ensure proper handling of streaming response when proxied by Nginx
+            },
+        )
+
     @router.get(
         "", response_model=DocsStatusesResponse, dependencies=[Depends(combined_auth)]
     )
@@ -11,7 +11,10 @@ import asyncio
 from ascii_colors import trace_exception
 from lightrag import LightRAG, QueryParam
 from lightrag.utils import TiktokenTokenizer
-from lightrag.api.utils_api import get_combined_auth_dependency
+from lightrag.api.utils_api import (
+    get_combined_auth_dependency,
+    get_query_admission_dependency,
+)
 from fastapi import Depends
 
 
@@ -230,6 +233,7 @@ class OllamaAPI:
     def setup_routes(self):
         # Create combined auth dependency for Ollama API routes
         combined_auth = get_combined_auth_dependency(self.api_key)
+        query_admission = get_query_admission_dependency(self.rag)
 
         @self.router.get("/version", dependencies=[Depends(combined_auth)])
         async def get_version():
@@ -284,7 +288,9 @@ class OllamaAPI:
             )
 
         @self.router.post(
-            "/generate", dependencies=[Depends(combined_auth)], include_in_schema=True
+            "/generate",
+            dependencies=[Depends(combined_auth), Depends(query_admission)],
+            include_in_schema=True,
         )
         async def generate(raw_request: Request):
             """Handle generate completion requests acting as an Ollama model
@@ -305,7 +311,7 @@ class OllamaAPI:
 
                 if request.stream:
                     response = await self.rag.llm_model_func(
-                        query, stream=True, **self.rag.llm_model_kwargs
+                        query, stream=True, _priority=5, **self.rag.llm_model_kwargs
                     )
 
                     async def stream_generator():
@@ -435,7 +441,7 @@ class OllamaAPI:
                 else:
                     first_chunk_time = time.time_ns()
                     response_text = await self.rag.llm_model_func(
-                        query, stream=False, **self.rag.llm_model_kwargs
+                        query, stream=False, _priority=5, **self.rag.llm_model_kwargs
                     )
                     last_chunk_time = time.time_ns()
 
@@ -466,7 +472,9 @@ class OllamaAPI:
                 raise HTTPException(status_code=500, detail=str(e))
 
         @self.router.post(
-            "/chat", dependencies=[Depends(combined_auth)], include_in_schema=True
+            "/chat",
+            dependencies=[Depends(combined_auth), Depends(query_admission)],
+            include_in_schema=True,
         )
         async def chat(raw_request: Request):
             """Process chat completion requests by acting as an Ollama model.
@@ -527,6 +535,7 @@ class OllamaAPI:
                             cleaned_query,
                             stream=True,
                             history_messages=conversation_history,
+                            _priority=5,
                             **self.rag.llm_model_kwargs,
                         )
                     else:
@@ -695,6 +704,7 @@ class OllamaAPI:
                             cleaned_query,
                             stream=False,
                             history_messages=conversation_history,
+                            _priority=5,
                             **self.rag.llm_model_kwargs,
                         )
                     else:
@@ -8,7 +8,7 @@ from typing import Any, Dict, List, Literal, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
 from lightrag.base import QueryParam
-from ..utils_api import get_combined_auth_dependency
+from ..utils_api import get_combined_auth_dependency, get_query_admission_dependency
 from pydantic import BaseModel, Field, field_validator
 
 from ascii_colors import trace_exception
@@ -151,9 +151,12 @@ class QueryDataResponse(BaseModel):
 
 def create_query_routes(rag, api_key: Optional[str] = None, top_k: int = 60):
     combined_auth = get_combined_auth_dependency(api_key)
+    query_admission = get_query_admission_dependency(rag)
 
     @router.post(
-        "/query", response_model=QueryResponse, dependencies=[Depends(combined_auth)]
+        "/query",
+        response_model=QueryResponse,
+        dependencies=[Depends(combined_auth), Depends(query_admission)],
     )
     async def query_text(request: QueryRequest):
         """
@@ -187,7 +190,9 @@ def create_query_routes(rag, api_key: Optional[str] = None, top_k: int = 60):
             trace_exception(e)
             raise HTTPException(status_code=500, detail=str(e))
 
-    @router.post("/query/stream", dependencies=[Depends(combined_auth)])
+    @router.post(
+        "/query/stream", dependencies=[Depends(combined_auth), Depends(query_admission)]
+    )
     async def query_text_stream(request: QueryRequest):
         """
         This endpoint performs a retrieval-augmented generation (RAG) query and streams the response.
@@ -239,7 +244,7 @@ def create_query_routes(rag, api_key: Optional[str] = None, top_k: int = 60):
     @router.post(
         "/query/data",
         response_model=QueryDataResponse,
-        dependencies=[Depends(combined_auth)],
+        dependencies=[Depends(combined_auth), Depends(query_admission)],
     )
     async def query_data(request: QueryRequest):
         """
@@ -166,6 +166,30 @@ def get_combined_auth_dependency(api_key: Optional[str] = None):
     return combined_dependency
 
 
+def get_query_admission_dependency(rag):
+    """
+    Create a dependency that rejects queries with HTTP 429 while the query LLM
+    queue holds QUERY_MAX_QUEUE calls or more, so clients back off quickly instead
+    of waiting behind a saturated queue.
+
+    Args:
+        rag: LightRAG instance serving the queries
+
+    Returns:
+        Callable: A dependency function that implements the admission check
+    """
+
+    async def query_admission():
+        if rag.query_max_queue > 0 and rag.query_queue_depth() >= rag.query_max_queue:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many queries waiting for the LLM, retry later",
+                headers={"Retry-After": "1"},
+            )
+
+    return query_admission
+
+
 def display_splash_screen(args: argparse.Namespace) -> None:
     """
     Display a colorful splash screen showing LightRAG server configuration
@@ -5,6 +5,7 @@ from enum import Enum
 import os
 from dotenv import load_dotenv
 from dataclasses import dataclass, field
+import numpy as np
 from typing import (
     Any,
     Literal,
@@ -303,6 +304,47 @@ class BaseVectorStorage(StorageNameSpace, ABC):
         """
         pass
 
+    async def get_vector_matrix_by_ids(
+        self, ids: list[str]
+    ) -> tuple[list[str], np.ndarray]:
+        """Get vectors by their IDs as one contiguous float32 matrix
+
+        Storages that keep vectors in numpy form should override this to avoid
+        building intermediate Python lists.
+
+        Args:
+            ids: List of unique identifiers
+
+        Returns:
+            Tuple of (found_ids, matrix) where row i of matrix is the vector of found_ids[i]
+        """
+        vectors = await self.get_vectors_by_ids(ids)
+        found_ids = [id for id in ids if id in vectors]
+        if not found_ids:
+            return [], np.empty(
+                (0, self.embedding_func.embedding_dim), dtype=np.float32
+            )
+        matrix = np.asarray([vectors[id] for id in found_ids], dtype=np.float32)
+        return found_ids, matrix
+
+    async def similarity_by_ids(
+        self, query_embedding: list[float], ids: list[str], top_k: int
+    ) -> list[tuple[str, float]] | None:
+        """Rank the given IDs by cosine similarity to query_embedding inside the storage
+
+        Only backends able to compute similarity server-side implement this; the
+        default returns None and callers fall back to get_vector_matrix_by_ids.
+
+        Args:
+            query_embedding: Query vector
+            ids: Candidate IDs to restrict the search to
+            top_k: Number of results to return
+
+        Returns:
+            List of (id, similarity) sorted by similarity descending, or None if unsupported
+        """
+        return None
+
 
 @dataclass
 class BaseKVStorage(StorageNameSpace, ABC):
@@ -13,6 +13,12 @@ DEFAULT_MAX_GRAPH_NODES = 1000
 # Default values for extraction settings
 DEFAULT_SUMMARY_LANGUAGE = "English"  # Default language for document processing
 DEFAULT_MAX_GLEANING = 1
+# Max number of small chunks packed into one extraction request (1 disables packing)
+DEFAULT_ENTITY_EXTRACT_PACK_SIZE = 1
+# Gleaning policy: "always" runs the gleaning pass for every chunk, "adaptive"
+# skips it where it rarely adds records in the current corpus
+DEFAULT_GLEANING_POLICY = "always"
+DEFAULT_GLEANING_MIN_YIELD = 0.2
 
 # Number of description fragments to trigger LLM summary
 DEFAULT_FORCE_LLM_SUMMARY_ON_MERGE = 8
@@ -39,6 +45,15 @@ DEFAULT_ENTITY_TYPES = [
 # Separator for graph fields
 GRAPH_FIELD_SEP = "<SEP>"
 
+# Priority of the LLM and embedding calls made for queries (lower runs first),
+# background calls such as extraction use higher values
+QUERY_CALL_PRIORITY = 5
+
+# Version of the workspace data layout, recorded in schema_version.json of the
+# workspace directory once startup migrations completed
+# 1: full_entities/full_relations are populated
+DATA_SCHEMA_VERSION = 1
+
 # Query and retrieval configuration defaults
 DEFAULT_TOP_K = 40
 DEFAULT_CHUNK_TOP_K = 20
@@ -65,9 +80,32 @@ DEFAULT_TEMPERATURE = 1.0
 DEFAULT_MAX_ASYNC = 4  # Default maximum async operations
 DEFAULT_MAX_PARALLEL_INSERT = 2  # Default maximum parallel insert operations
 
+# Hedged query-priority LLM/embedding calls: duplicate a call slower than this
+# latency percentile, for at most this fraction of calls
+DEFAULT_HEDGE_PERCENTILE = 95
+DEFAULT_HEDGE_BUDGET = 0.05
+
+# Documents longer than this (in characters) are chunked by the streaming chunker
+DEFAULT_STREAMING_CHUNK_THRESHOLD = 10 * 1024 * 1024
+# Number of chunks written to chunks_vdb/text_chunks, then extracted, per batch when streaming
+DEFAULT_STREAMING_CHUNK_BATCH_SIZE = 256
+
+# Change logs of file based storages are truncated beyond this size, workers
+# that have not replayed the truncated records fall back to a full reload
+DEFAULT_CHANGE_LOG_MAX_BYTES = 64 * 1024 * 1024
+
+# Routing over several LLM/embedding endpoints (comma separated *_BINDING_HOST)
+DEFAULT_ENDPOINT_ROUTING = "least_outstanding"  # or "latency"
+DEFAULT_ENDPOINT_EJECT_FAILURES = 3  # Consecutive failures before ejecting a replica
+DEFAULT_ENDPOINT_EJECT_SECONDS = 30  # Seconds an ejected replica is skipped
+
 # Embedding configuration defaults
 DEFAULT_EMBEDDING_FUNC_MAX_ASYNC = 8  # Default max async for embedding functions
 DEFAULT_EMBEDDING_BATCH_NUM = 10  # Default batch size for embedding computations
+# Seconds small embedding calls wait to be coalesced into one batch (0 disables)
+DEFAULT_EMBEDDING_BATCH_LINGER = 0.01
+# Entity/relation vectors written per upsert when merge phases flush their buffers
+DEFAULT_VDB_UPSERT_BATCH_SIZE = 1000
 
 # Gunicorn worker timeout
 DEFAULT_TIMEOUT = 300
@@ -11,6 +11,7 @@ STORAGE_IMPLEMENTATIONS = {
     "GRAPH_STORAGE": {
         "implementations": [
             "NetworkXStorage",
+            "CompactGraphStorage",
             "Neo4JStorage",
             "PGGraphStorage",
             "MongoGraphStorage",
@@ -50,6 +51,7 @@ STORAGE_ENV_REQUIREMENTS: dict[str, list[str]] = {
     "PGKVStorage": ["POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_DATABASE"],
     # Graph Storage Implementations
     "NetworkXStorage": [],
+    "CompactGraphStorage": [],
     "Neo4JStorage": ["NEO4J_URI", "NEO4J_USERNAME", "NEO4J_PASSWORD"],
     "MongoGraphStorage": [],
     "MemgraphStorage": ["MEMGRAPH_URI"],
@@ -81,6 +83,7 @@ STORAGE_ENV_REQUIREMENTS: dict[str, list[str]] = {
 # Storage implementation module mapping
 STORAGES = {
     "NetworkXStorage": ".kg.networkx_impl",
+    "CompactGraphStorage": ".kg.compact_graph_impl",
     "JsonKVStorage": ".kg.json_kv_impl",
     "NanoVectorDBStorage": ".kg.nano_vector_db_impl",
     "JsonDocStatusStorage": ".kg.json_doc_status_impl",
@@ -103,6 +106,18 @@ STORAGES = {
     "MemgraphStorage": ".kg.memgraph_impl",
 }
 
+# Storages keeping their data in the shared storage of the process (loaded from
+# files in the working directory under the shared data init lock), they must be
+# initialized one by one
+SHARED_DATA_STORAGES = {
+    "NetworkXStorage",
+    "CompactGraphStorage",
+    "JsonKVStorage",
+    "NanoVectorDBStorage",
+    "JsonDocStatusStorage",
+    "FaissVectorDBStorage",
+}
+
 
 def verify_storage_implementation(storage_type: str, storage_name: str) -> None:
     """Verify if storage implementation is compatible with specified storage type
@@ -0,0 +1,82 @@
+"""
+Stable serialization of the tables written by the binary storage formats.
+
+The graph files and change logs hold nested lists and dicts of strings,
+numbers, booleans and None, plus `bytes` for packed arrays and vectors. Unlike
+`marshal`, whose format may change between Python versions, this encoding can
+be read by any interpreter:
+
+    JSON section length (8 bytes) | JSON section | (blob length | blob) ...
+
+`bytes` values are moved out of the JSON section into blobs and referenced as
+{"__blob__": index}. Tuples come back as lists.
+"""
+
+import json
+import struct
+from typing import Any
+
+_SECTION_LENGTH = struct.Struct("<Q")
+_BLOB_KEY = "__blob__"
+
+
+def encode_tables(tables: Any) -> bytes:
+    """Serialize tables to bytes
+
+    Raises:
+        TypeError: If tables hold a value that cannot be stored
+    """
+    blobs: list[bytes] = []
+
+    def _blob_ref(value: Any) -> dict[str, int]:
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            blobs.append(bytes(value))
+            return {_BLOB_KEY: len(blobs) - 1}
+        raise TypeError(f"Cannot store value of type {type(value).__name__}")
+
+    header = json.dumps(
+        tables, ensure_ascii=False, separators=(",", ":"), default=_blob_ref
+    ).encode("utf-8", "surrogatepass")
+
+    parts = [_SECTION_LENGTH.pack(len(header)), header]
+    for blob in blobs:
+        parts.append(_SECTION_LENGTH.pack(len(blob)))
+        parts.append(blob)
+    return b"".join(parts)
+
+
+def decode_tables(data: bytes | memoryview) -> Any:
+    """Deserialize tables written by `encode_tables`
+
+    Raises:
+        ValueError: If data is truncated or malformed
+    """
+    view = memoryview(data)
+    sections = []
+    offset = 0
+    while offset < len(view):
+        if offset + _SECTION_LENGTH.size > len(view):
+            raise ValueError("Truncated table data")
+        (length,) = _SECTION_LENGTH.unpack_from(view, offset)
+        offset += _SECTION_LENGTH.size
+        if offset + length > len(view):
+            raise ValueError("Truncated table data")
+        sections.append(view[offset : offset + length])
+        offset += length
+    if not sections:
+        raise ValueError("Empty table data")
+
+    blobs = sections[1:]
+
+    def _resolve_blob(obj: dict) -> Any:
+        if len(obj) == 1 and _BLOB_KEY in obj:
+            index = obj[_BLOB_KEY]
+            if not 0 <= index < len(blobs):
+                raise ValueError(f"Missing table blob {index}")
+            return bytes(blobs[index])
+        return obj
+
+    return json.loads(
+        bytes(sections[0]).decode("utf-8", "surrogatepass"),
+        object_hook=_resolve_blob,
+    )
@@ -0,0 +1,193 @@
+"""
+Sequence-numbered change log shared by the workers of a file based storage.
+
+When one worker persists a storage, `set_all_update_flags` makes every other
+worker reload the whole file on its next access. With a change log, the
+persisting worker also appends the records it changed since its previous
+persist to `<storage file>.changes`, and the other workers replay the new
+entries on top of their in-memory copy. A full reload is only needed when a
+worker missed entries (log truncated, reset or missing).
+
+File layout: a header (epoch, base_seq) followed by entries (seq, changes),
+each stored as a 4-byte little-endian length and a `binary_tables` payload. Entry
+sequence numbers start at base_seq + 1 and increase by one. Once the log grows
+beyond max_bytes a new epoch is started with base_seq set to the last written
+sequence number, so only workers that had not caught up need a full reload.
+
+The log is only written in multi-worker mode. All methods must be called while
+holding the storage lock of the namespace.
+"""
+
+import os
+import struct
+import uuid
+from typing import Any, BinaryIO, Iterator
+
+from lightrag.constants import DEFAULT_CHANGE_LOG_MAX_BYTES
+from lightrag.utils import get_env_value, logger
+
+from .binary_tables import decode_tables, encode_tables
+
+CHANGE_LOG_SUFFIX = ".changes"
+
+_LENGTH = struct.Struct("<I")
+
+
+def _encode(record: Any) -> bytes:
+    payload = encode_tables(record)
+    return _LENGTH.pack(len(payload)) + payload
+
+
+def _read_entries(f: BinaryIO) -> Iterator[tuple[Any, int]]:
+    """Yield (record, end offset) from the current position, stopping at a torn write"""
+    while True:
+        prefix = f.read(_LENGTH.size)
+        if len(prefix) < _LENGTH.size:
+            return
+        (length,) = _LENGTH.unpack(prefix)
+        payload = f.read(length)
+        if len(payload) < length:
+            return
+        yield decode_tables(payload), f.tell()
+
+
+class ChangeLog:
+    """Append-only change log of one storage namespace
+
+    Args:
+        file_name: Path of the log file, usually the storage file + CHANGE_LOG_SUFFIX
+        enabled: Write and replay the log; when False every update is a full reload
+        max_bytes: Size beyond which the log is truncated
+    """
+
+    def __init__(
+        self, file_name: str, enabled: bool = True, max_bytes: int | None = None
+    ):
+        self.file_name = file_name
+        self.enabled = enabled
+        self.max_bytes = (
+            max_bytes
+            if max_bytes is not None
+            else get_env_value(
+                "CHANGE_LOG_MAX_BYTES", DEFAULT_CHANGE_LOG_MAX_BYTES, int
+            )
+        )
+        # Position of this worker: log epoch, last applied seq and file offset
+        self._epoch: str | None = None
+        self._seq = 0
+        self._offset = 0
+
+    def _scan(self) -> tuple[str, int, int, list[tuple[int, Any]]] | None:
+        """Read (epoch, base_seq, end offset, entries after own position) from disk
+
+        Entries are only returned from the current position when the epoch is
+        unchanged, otherwise from the start of the log.
+        """
+        if not os.path.exists(self.file_name):
+            return None
+        with open(self.file_name, "rb") as f:
+            header = next(_read_entries(f), None)
+            if header is None:
+                return None
+            (epoch, base_seq), offset = header
+            if epoch == self._epoch and self._offset > offset:
+                offset = self._offset
+            f.seek(offset)
+            entries = []
+            for entry, end in _read_entries(f):
+                entries.append(entry)
+                offset = end
+        return epoch, base_seq, offset, entries
+
+    def sync(self) -> None:
+        """Mark every entry in the log as applied, e.g. after a full reload"""
+        if not self.enabled:
+            return
+        self._epoch = None
+        scan = self._scan()
+        if scan is None:
+            # No log yet: the first epoch written by any worker starts at seq 0
+            self._epoch, self._seq, self._offset = "", 0, 0
+            return
+        self._epoch, base_seq, self._offset, entries = scan
+        self._seq = entries[-1][0] if entries else base_seq
+
+    def read_new(self) -> list[Any] | None:
+        """Changes appended by other workers since the last call
+
+        Returns:
+            The new change lists in order, or None if they cannot be replayed
+            and the storage must be reloaded from its file
+        """
+        if not self.enabled or self._epoch is None:
+            return None
+        scan = self._scan()
+        if scan is None:
+            return None
+        epoch, base_seq, offset, entries = scan
+        if epoch != self._epoch and base_seq != self._seq:
+            # Log was truncated or reset past our position
+            return None
+
+        changes = []
+        seq = self._seq
+        for entry_seq, entry_changes in entries:
+            if entry_seq <= seq:
+                continue
+            if entry_seq != seq + 1:
+                return None
+            changes.append(entry_changes)
+            seq = entry_seq
+
+        self._epoch, self._seq, self._offset = epoch, seq, offset
+        return changes
+
+    def _start_epoch(self, base_seq: int) -> None:
+        epoch = uuid.uuid4().hex
+        tmp_file = f"{self.file_name}.tmp"
+        with open(tmp_file, "wb") as f:
+            f.write(_encode((epoch, base_seq)))
+            offset = f.tell()
+        os.replace(tmp_file, self.file_name)
+        self._epoch, self._seq, self._offset = epoch, base_seq, offset
+
+    def append(self, changes: list) -> None:
+        """Append the changes of one persist"""
+        if not self.enabled:
+            return
+        scan = self._scan()
+        if scan is None:
+            self._start_epoch(self._seq)
+        else:
+            epoch, base_seq, offset, entries = scan
+            # Entries of other writers, only expected if persists raced
+            self._epoch, self._offset = epoch, offset
+            self._seq = max(self._seq, entries[-1][0] if entries else base_seq)
+
+        seq = self._seq + 1
+        try:
+            record = _encode((seq, changes))
+        except TypeError as e:
+            logger.warning(
+                f"Change log {self.file_name} cannot store changes ({e}), workers will reload"
+            )
+            self.reset()
+            return
+
+        if self._offset + len(record) > self.max_bytes:
+            self._start_epoch(self._seq)
+        with open(self.file_name, "ab") as f:
+            f.write(record)
+            self._offset = f.tell()
+        self._seq = seq
+
+    def reset(self) -> None:
+        """Start a new epoch that no other worker can continue from
+
+        Used when the storage file was replaced wholesale (e.g. drop), so every
+        other worker does a full reload.
+        """
+        if not self.enabled:
+            return
+        self.sync()
+        self._start_epoch(self._seq + 1)
@@ -0,0 +1,658 @@
+"""
+Array-backed undirected graph used by `CompactGraphStorage`.
+
+`nx.Graph` keeps one Python dict per node, one per adjacency entry and one per
+edge, which costs several hundred bytes per edge before any attribute is
+stored. This engine keeps the graph in flat arrays instead:
+
+    - node ids in an id table (list + dict lookup), edges as two int32 columns
+      of node indexes
+    - adjacency in CSR form: `indptr` (row offsets), `targets` (neighbor
+      indexes) and `slots` (edge indexes), rows sorted by neighbor index so an
+      edge lookup is a binary search
+    - edges added after the last CSR build live in a small append buffer
+      (node -> {neighbor: edge}), deleted nodes and edges are tombstoned
+    - attributes in columns keyed by attribute name; string values are
+      interned into a shared string table and stored as int32 indexes
+
+`compact()` folds the append buffer into a new CSR, drops tombstones and
+unreferenced strings. It runs on persist and whenever the append buffer grows
+too large. Node and edge indexes are only stable between compactions, so
+callers must address nodes by id.
+"""
+
+import heapq
+import os
+from array import array
+from typing import Any, Iterable
+
+import numpy as np
+
+from .binary_tables import decode_tables, encode_tables
+
+MAGIC = b"LRCG"
+FORMAT_VERSION = 1
+
+_MISSING_STR = -1
+# The append buffer is folded into the CSR once it holds this many edges,
+# or a quarter of all edges for larger graphs
+_MIN_PENDING_EDGES = 65536
+
+
+def _int_array(values: np.ndarray) -> array:
+    result = array("i")
+    result.frombytes(np.ascontiguousarray(values, dtype=np.intc).tobytes())
+    return result
+
+
+def _view(values: array | bytearray, dtype) -> np.ndarray:
+    # Temporary zero-copy view, must not outlive the current call since the
+    # underlying buffer cannot grow while it is exported
+    return np.frombuffer(values, dtype=dtype)
+
+
+class _StringTable:
+    def __init__(self, strings: list[str] | None = None):
+        self.strings: list[str] = strings if strings is not None else []
+        self._index: dict[str, int] = {
+            value: idx for idx, value in enumerate(self.strings)
+        }
+
+    def intern(self, value: str) -> int:
+        idx = self._index.get(value)
+        if idx is None:
+            idx = len(self.strings)
+            self._index[value] = idx
+            self.strings.append(value)
+        return idx
+
+
+class _Columns:
+    """Row-addressed attribute storage with one column per attribute name
+
+    Columns holding only strings ("s") store string table indexes in an int32
+    array, other columns ("v") keep the raw values with None for missing.
+    """
+
+    def __init__(self, strings: _StringTable, rows: int = 0):
+        self._strings = strings
+        self.rows = rows
+        self.kinds: dict[str, str] = {}
+        self.data: dict[str, array | list] = {}
+
+    def append_row(self) -> None:
+        for key, column in self.data.items():
+            column.append(_MISSING_STR if self.kinds[key] == "s" else None)
+        self.rows += 1
+
+    def _to_values(self, key: str) -> list:
+        strings = self._strings.strings
+        values = [
+            None if idx == _MISSING_STR else strings[idx] for idx in self.data[key]
+        ]
+        self.kinds[key] = "v"
+        self.data[key] = values
+        return values
+
+    def update(self, row: int, attrs: dict[str, Any]) -> None:
+        for key, value in attrs.items():
+            kind = self.kinds.get(key)
+            if kind is None:
+                kind = "s" if type(value) is str else "v"
+                self.kinds[key] = kind
+                self.data[key] = (
+                    array("i", [_MISSING_STR]) * self.rows
+                    if kind == "s"
+                    else [None] * self.rows
+                )
+            if kind == "s":
+                if type(value) is str:
+                    self.data[key][row] = self._strings.intern(value)
+                    continue
+                self._to_values(key)
+            self.data[key][row] = value
+
+    def clear(self, row: int) -> None:
+        for key, column in self.data.items():
+            column[row] = _MISSING_STR if self.kinds[key] == "s" else None
+
+    def get(self, row: int) -> dict[str, Any]:
+        strings = self._strings.strings
+        attrs = {}
+        for key, column in self.data.items():
+            value = column[row]
+            if self.kinds[key] == "s":
+                if value != _MISSING_STR:
+                    attrs[key] = strings[value]
+            elif value is not None:
+                attrs[key] = value
+        return attrs
+
+    def take(self, rows: np.ndarray) -> dict[str, tuple[str, Any]]:
+        """Columns restricted to rows, string columns as numpy index arrays"""
+        row_list = rows.tolist()
+        taken = {}
+        for key, column in self.data.items():
+            if self.kinds[key] == "s":
+                taken[key] = ("s", _view(column, np.intc)[rows])
+            else:
+                taken[key] = ("v", [column[row] for row in row_list])
+        return taken
+
+    @classmethod
+    def from_taken(
+        cls,
+        taken: dict[str, tuple[str, Any]],
+        strings: _StringTable,
+        rows: int,
+        remap: np.ndarray,
+    ) -> "_Columns":
+        columns = cls(strings, rows)
+        for key, (kind, data) in taken.items():
+            columns.kinds[key] = kind
+            if kind == "s":
+                data = np.where(data >= 0, remap[np.maximum(data, 0)], _MISSING_STR)
+                columns.data[key] = _int_array(data)
+            else:
+                columns.data[key] = data
+        return columns
+
+    def to_tables(self) -> dict[str, tuple[str, Any]]:
+        return {
+            key: (kind, self.data[key].tobytes() if kind == "s" else self.data[key])
+            for key, kind in self.kinds.items()
+        }
+
+    @classmethod
+    def from_tables(
+        cls, tables: dict[str, tuple[str, Any]], strings: _StringTable, rows: int
+    ) -> "_Columns":
+        columns = cls(strings, rows)
+        for key, (kind, data) in tables.items():
+            columns.kinds[key] = kind
+            if kind == "s":
+                column = array("i")
+                column.frombytes(data)
+                columns.data[key] = column
+            else:
+                columns.data[key] = data
+        return columns
+
+
+def build_csr(
+    num_nodes: int, sources: np.ndarray, targets: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Build undirected CSR adjacency for edges (sources[i], targets[i])
+
+    Returns:
+        (indptr, neighbors, slots): row offsets, neighbor node indexes sorted
+        within each row, and the edge index of every adjacency entry
+    """
+    edge_ids = np.arange(len(sources), dtype=np.int32)
+    # Self loops appear once in the adjacency of their node
+    reverse = sources != targets
+    rows = np.concatenate([sources, targets[reverse]])
+    cols = np.concatenate([targets, sources[reverse]])
+    eids = np.concatenate([edge_ids, edge_ids[reverse]])
+    order = np.lexsort((cols, rows))
+
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=num_nodes), out=indptr[1:])
+    return (
+        indptr,
+        cols[order].astype(np.int32),
+        eids[order].astype(np.int32),
+    )
+
+
+class CompactGraph:
+    """Undirected graph with string node ids stored in flat arrays"""
+
+    def __init__(self):
+        self._strings = _StringTable()
+        # Node table, ids of deleted nodes are None until the next compaction
+        self._ids: list[str | None] = []
+        self._index: dict[str, int] = {}
+        self._degree = array("i")
+        self._node_columns = _Columns(self._strings)
+        self._num_nodes = 0
+
+        # Edge table, deleted edges have alive == 0
+        self._sources = array("i")
+        self._targets = array("i")
+        self._alive = bytearray()
+        self._edge_columns = _Columns(self._strings)
+        self._num_edges = 0
+
+        # CSR adjacency covering the first _csr_rows nodes and the edges
+        # present at the last build
+        self._csr_rows = 0
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._neighbors = np.zeros(0, dtype=np.int32)
+        self._slots = np.zeros(0, dtype=np.int32)
+        # Append buffer: node index -> {neighbor index: edge index}
+        self._pending: dict[int, dict[int, int]] = {}
+        self._pending_edges = 0
+
+    def number_of_nodes(self) -> int:
+        return self._num_nodes
+
+    def number_of_edges(self) -> int:
+        return self._num_edges
+
+    # ----- nodes -----
+
+    def has_node(self, node_id: str) -> bool:
+        return node_id in self._index
+
+    def node_ids(self) -> list[str]:
+        return [node_id for node_id in self._ids if node_id is not None]
+
+    def node_index(self, node_id: str) -> int:
+        return self._index.get(node_id, -1)
+
+    def node_id(self, idx: int) -> str:
+        return self._ids[idx]
+
+    def _new_node(self, node_id: str) -> int:
+        idx = len(self._ids)
+        self._ids.append(node_id)
+        self._index[node_id] = idx
+        self._degree.append(0)
+        self._node_columns.append_row()
+        self._num_nodes += 1
+        return idx
+
+    def add_node(
+        self, node_id: str, attrs: dict[str, Any], replace: bool = False
+    ) -> bool:
+        """Add node_id or update its attributes, returns True if it is new
+
+        With replace, attributes not in attrs are removed from an existing node.
+        """
+        idx = self._index.get(node_id)
+        is_new = idx is None
+        if is_new:
+            idx = self._new_node(node_id)
+        elif replace:
+            self._node_columns.clear(idx)
+        self._node_columns.update(idx, attrs)
+        return is_new
+
+    def get_node(self, node_id: str) -> dict[str, Any] | None:
+        idx = self._index.get(node_id)
+        if idx is None:
+            return None
+        return self._node_columns.get(idx)
+
+    def remove_node(self, node_id: str) -> None:
+        idx = self._index.pop(node_id, None)
+        if idx is None:
+            return
+        for _, eid in self.neighbors(idx):
+            self._remove_edge(eid)
+        self._pending.pop(idx, None)
+        self._ids[idx] = None
+        self._degree[idx] = 0
+        self._num_nodes -= 1
+
+    def degree(self, node_id: str) -> int:
+        idx = self._index.get(node_id)
+        return 0 if idx is None else self._degree[idx]
+
+    def degrees(self, node_ids: list[str]) -> list[int]:
+        """Degrees of node_ids, 0 for missing nodes"""
+        indexes = np.fromiter(
+            (self._index.get(node_id, -1) for node_id in node_ids),
+            dtype=np.int64,
+            count=len(node_ids),
+        )
+        degrees = _view(self._degree, np.intc)[np.maximum(indexes, 0)]
+        return np.where(indexes >= 0, degrees, 0).tolist()
+
+    def top_degree(self, limit: int) -> list[tuple[str, int]]:
+        """Up to limit (node id, degree) pairs with the highest degree
+
+        Ties are broken alphabetically.
+        """
+        limit = min(limit, self._num_nodes)
+        if limit <= 0:
+            return []
+        degrees = _view(self._degree, np.intc).astype(np.int64)
+        if self._num_nodes != len(self._ids):
+            for idx, node_id in enumerate(self._ids):
+                if node_id is None:
+                    degrees[idx] = -1
+        kth = len(degrees) - limit
+        threshold = np.partition(degrees, kth)[kth]
+        above = np.flatnonzero(degrees > threshold)
+        ties = np.flatnonzero(degrees == threshold)
+
+        result = sorted(
+            ((self._ids[idx], int(degrees[idx])) for idx in above.tolist()),
+            key=lambda x: (-x[1], x[0]),
+        )
+        for node_id in heapq.nsmallest(
+            limit - len(result), (self._ids[idx] for idx in ties.tolist())
+        ):
+            result.append((node_id, int(threshold)))
+        return result
+
+    # ----- edges -----
+
+    def _find_edge(self, u: int, v: int) -> int:
+        pending = self._pending.get(u)
+        if pending is not None:
+            eid = pending.get(v)
+            if eid is not None and self._alive[eid]:
+                return eid
+        if u < self._csr_rows:
+            lo, hi = int(self._indptr[u]), int(self._indptr[u + 1])
+            if hi > lo:
+                pos = lo + int(np.searchsorted(self._neighbors[lo:hi], v))
+                if pos < hi and self._neighbors[pos] == v:
+                    eid = int(self._slots[pos])
+                    if self._alive[eid]:
+                        return eid
+        return -1
+
+    def find_edge(self, source_id: str, target_id: str) -> int:
+        """Edge index of (source_id, target_id), -1 if there is no such edge"""
+        u = self._index.get(source_id)
+        v = self._index.get(target_id)
+        if u is None or v is None:
+            return -1
+        return self._find_edge(u, v)
+
+    def has_edge(self, source_id: str, target_id: str) -> bool:
+        return self.find_edge(source_id, target_id) >= 0
+
+    def get_edge(self, source_id: str, target_id: str) -> dict[str, Any] | None:
+        eid = self.find_edge(source_id, target_id)
+        if eid < 0:
+            return None
+        return self._edge_columns.get(eid)
+
+    def edge_endpoints(self, eid: int) -> tuple[str, str]:
+        return self._ids[self._sources[eid]], self._ids[self._targets[eid]]
+
+    def edge_attrs(self, eid: int) -> dict[str, Any]:
+        return self._edge_columns.get(eid)
+
+    def add_edge(
+        self,
+        source_id: str,
+        target_id: str,
+        attrs: dict[str, Any],
+        replace: bool = False,
+    ) -> bool:
+        """Add an edge or update its attributes, returns True if it is new
+
+        Missing endpoint nodes are created without attributes. With replace,
+        attributes not in attrs are removed from an existing edge.
+        """
+        u = self._index.get(source_id)
+        if u is None:
+            u = self._new_node(source_id)
+        v = self._index.get(target_id)
+        if v is None:
+            v = self._new_node(target_id)
+
+        eid = self._find_edge(u, v)
+        is_new = eid < 0
+        if is_new:
+            eid = len(self._sources)
+            self._sources.append(u)
+            self._targets.append(v)
+            self._alive.append(1)
+            self._edge_columns.append_row()
+            self._pending.setdefault(u, {})[v] = eid
+            self._pending.setdefault(v, {})[u] = eid
+            self._degree[u] += 1
+            self._degree[v] += 1
+            self._num_edges += 1
+            self._pending_edges += 1
+        elif replace:
+            self._edge_columns.clear(eid)
+        self._edge_columns.update(eid, attrs)
+
+        if self._pending_edges > max(_MIN_PENDING_EDGES, self._num_edges // 4):
+            self.compact()
+        return is_new
+
+    def _remove_edge(self, eid: int) -> None:
+        if not self._alive[eid]:
+            return
+        self._alive[eid] = 0
+        u, v = self._sources[eid], self._targets[eid]
+        for a, b in ((u, v), (v, u)):
+            pending = self._pending.get(a)
+            if pending is not None and pending.get(b) == eid:
+                del pending[b]
+        self._degree[u] -= 1
+        self._degree[v] -= 1
+        self._num_edges -= 1
+
+    def remove_edge(self, source_id: str, target_id: str) -> bool:
+        eid = self.find_edge(source_id, target_id)
+        if eid < 0:
+            return False
+        self._remove_edge(eid)
+        return True
+
+    def neighbors(self, idx: int) -> list[tuple[int, int]]:
+        """(neighbor index, edge index) pairs of node idx"""
+        result = []
+        if idx < self._csr_rows:
+            lo, hi = int(self._indptr[idx]), int(self._indptr[idx + 1])
+            if hi > lo:
+                slots = self._slots[lo:hi]
+                alive = _view(self._alive, np.uint8)[slots].astype(bool)
+                result.extend(
+                    zip(self._neighbors[lo:hi][alive].tolist(), slots[alive].tolist())
+                )
+        pending = self._pending.get(idx)
+        if pending:
+            result.extend(
+                (neighbor, eid) for neighbor, eid in pending.items() if self._alive[eid]
+            )
+        return result
+
+    def neighbors_batch(self, indexes: list[int]) -> list[list[tuple[int, int]]]:
+        """`neighbors` for many nodes, with one vectorized gather over the CSR"""
+        rows = np.asarray(indexes, dtype=np.int64)
+        in_csr = rows < self._csr_rows
+        # Rows outside the CSR read the empty range [indptr[0], indptr[0])
+        csr_rows = np.where(in_csr, rows, 0)
+        starts = np.where(in_csr, self._indptr[csr_rows], 0)
+        ends = np.where(in_csr, self._indptr[np.where(in_csr, rows + 1, 0)], 0)
+        lengths = ends - starts
+
+        total = int(lengths.sum())
+        offsets = np.cumsum(lengths) - lengths
+        positions = (
+            np.arange(total, dtype=np.int64)
+            - np.repeat(offsets, lengths)
+            + np.repeat(starts, lengths)
+        )
+        slots = self._slots[positions]
+        alive = _view(self._alive, np.uint8)[slots].astype(bool)
+        neighbors = self._neighbors[positions]
+        boundaries = np.cumsum(lengths)[:-1]
+
+        result = []
+        for idx, row_neighbors, row_slots, row_alive in zip(
+            indexes,
+            np.split(neighbors, boundaries),
+            np.split(slots, boundaries),
+            np.split(alive, boundaries),
+        ):
+            entries = list(
+                zip(row_neighbors[row_alive].tolist(), row_slots[row_alive].tolist())
+            )
+            pending = self._pending.get(idx)
+            if pending:
+                entries.extend(
+                    (neighbor, eid)
+                    for neighbor, eid in pending.items()
+                    if self._alive[eid]
+                )
+            result.append(entries)
+        return result
+
+    def edges(self) -> Iterable[tuple[str, str, int]]:
+        """(source id, target id, edge index) of all edges"""
+        ids = self._ids
+        for eid in np.flatnonzero(_view(self._alive, np.uint8)).tolist():
+            yield ids[self._sources[eid]], ids[self._targets[eid]], eid
+
+    # ----- maintenance -----
+
+    def compact(self) -> None:
+        """Rebuild the CSR and drop deleted nodes, edges and unused strings"""
+        node_rows = np.fromiter(
+            (idx for idx, node_id in enumerate(self._ids) if node_id is not None),
+            dtype=np.int64,
+        )
+        edge_rows = np.flatnonzero(_view(self._alive, np.uint8))
+        node_remap = np.full(len(self._ids), -1, dtype=np.int32)
+        node_remap[node_rows] = np.arange(len(node_rows), dtype=np.int32)
+        sources = node_remap[_view(self._sources, np.intc)[edge_rows]]
+        targets = node_remap[_view(self._targets, np.intc)[edge_rows]]
+
+        node_taken = self._node_columns.take(node_rows)
+        edge_taken = self._edge_columns.take(edge_rows)
+
+        # Keep only strings still referenced by a string column
+        used = [
+            data[data >= 0]
+            for kind, data in (*node_taken.values(), *edge_taken.values())
+            if kind == "s"
+        ]
+        used = np.unique(np.concatenate(used)) if used else np.zeros(0, np.int64)
+        string_remap = np.full(len(self._strings.strings) + 1, -1, dtype=np.int32)
+        string_remap[used] = np.arange(len(used), dtype=np.int32)
+        old_strings = self._strings.strings
+        strings = _StringTable([old_strings[idx] for idx in used.tolist()])
+
+        ids = [self._ids[idx] for idx in node_rows.tolist()]
+        self._load(
+            strings=strings,
+            ids=ids,
+            node_columns=_Columns.from_taken(
+                node_taken, strings, len(ids), string_remap
+            ),
+            sources=sources,
+            targets=targets,
+            edge_columns=_Columns.from_taken(
+                edge_taken, strings, len(edge_rows), string_remap
+            ),
+        )
+
+    def _load(
+        self,
+        strings: _StringTable,
+        ids: list[str],
+        node_columns: _Columns,
+        sources: np.ndarray,
+        targets: np.ndarray,
+        edge_columns: _Columns,
+        csr: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None,
+    ) -> None:
+        num_nodes = len(ids)
+        self._strings = strings
+        self._ids = ids
+        self._index = {node_id: idx for idx, node_id in enumerate(ids)}
+        self._node_columns = node_columns
+        self._num_nodes = num_nodes
+
+        self._sources = _int_array(sources)
+        self._targets = _int_array(targets)
+        self._alive = bytearray(b"\x01") * len(sources)
+        self._edge_columns = edge_columns
+        self._num_edges = len(sources)
+        # Self loops count twice, as in networkx
+        self._degree = _int_array(
+            np.bincount(sources, minlength=num_nodes)
+            + np.bincount(targets, minlength=num_nodes)
+        )
+
+        self._indptr, self._neighbors, self._slots = csr or build_csr(
+            num_nodes, sources, targets
+        )
+        self._csr_rows = num_nodes
+        self._pending = {}
+        self._pending_edges = 0
+
+    # ----- persistence -----
+
+    def to_bytes(self) -> bytes:
+        """Serialize the graph, compacting it first"""
+        self.compact()
+        tables = {
+            "strings": self._strings.strings,
+            "ids": self._ids,
+            "node_columns": self._node_columns.to_tables(),
+            "sources": self._sources.tobytes(),
+            "targets": self._targets.tobytes(),
+            "edge_columns": self._edge_columns.to_tables(),
+            "indptr": self._indptr.tobytes(),
+            "neighbors": self._neighbors.tobytes(),
+            "slots": self._slots.tobytes(),
+        }
+        return MAGIC + bytes([FORMAT_VERSION]) + encode_tables(tables)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CompactGraph":
+        if data[:4] != MAGIC:
+            raise ValueError("Not a LightRAG compact graph file")
+        if data[4] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compact graph format version: {data[4]}")
+        tables = decode_tables(memoryview(data)[5:])
+
+        strings = _StringTable(tables["strings"])
+        ids = tables["ids"]
+        sources = np.frombuffer(tables["sources"], dtype=np.intc)
+        graph = cls()
+        graph._load(
+            strings=strings,
+            ids=ids,
+            node_columns=_Columns.from_tables(
+                tables["node_columns"], strings, len(ids)
+            ),
+            sources=sources,
+            targets=np.frombuffer(tables["targets"], dtype=np.intc),
+            edge_columns=_Columns.from_tables(
+                tables["edge_columns"], strings, len(sources)
+            ),
+            csr=(
+                np.frombuffer(tables["indptr"], dtype=np.int64),
+                np.frombuffer(tables["neighbors"], dtype=np.int32),
+                np.frombuffer(tables["slots"], dtype=np.int32),
+            ),
+        )
+        return graph
+
+    def write(self, file_name: str) -> None:
+        """Atomically write the graph to file_name"""
+        data = self.to_bytes()
+        tmp_file = f"{file_name}.tmp"
+        with open(tmp_file, "wb") as f:
+            f.write(data)
+        os.replace(tmp_file, file_name)
+
+    @classmethod
+    def read(cls, file_name: str) -> "CompactGraph":
+        with open(file_name, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    @classmethod
+    def from_networkx(cls, nx_graph) -> "CompactGraph":
+        """Build a compact graph from an undirected networkx graph"""
+        graph = cls()
+        for node_id, attrs in nx_graph.nodes(data=True):
+            graph.add_node(node_id, attrs)
+        for source, target, attrs in nx_graph.edges(data=True):
+            graph.add_edge(source, target, attrs)
+        graph.compact()
+        return graph
@@ -0,0 +1,675 @@
+import os
+from dataclasses import dataclass
+from typing import final
+
+from lightrag.types import KnowledgeGraph, KnowledgeGraphNode, KnowledgeGraphEdge
+from lightrag.utils import logger
+from lightrag.base import BaseGraphStorage
+from .compact_graph import CompactGraph
+from .label_index import LabelIndex
+from .file_graph_storage import FileGraphStorageMixin
+from .shared_storage import set_all_update_flags
+
+from dotenv import load_dotenv
+
+# use the .env that is inside the current folder
+# allows to use different .env file for each lightrag instance
+# the OS environment variables take precedence over the .env file
+load_dotenv(dotenv_path=".env", override=False)
+
+COMPACT_GRAPH_SUFFIX = ".cgraph"
+
+
+@final
+@dataclass
+class CompactGraphStorage(FileGraphStorageMixin, BaseGraphStorage):
+    """File based graph storage on an array-backed graph engine
+
+    Same semantics and file layout conventions as NetworkXStorage, but the graph
+    is held in CSR arrays and attribute columns (see compact_graph.py), which
+    needs a fraction of the memory of `nx.Graph` for large graphs. An existing
+    NetworkXStorage graph file is imported on first start.
+    """
+
+    @staticmethod
+    def load_graph(file_name) -> CompactGraph | None:
+        if os.path.exists(file_name):
+            return CompactGraph.read(file_name)
+        return None
+
+    @staticmethod
+    def write_graph(graph: CompactGraph, file_name, workspace="_"):
+        logger.info(
+            f"[{workspace}] Writing graph with {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges"
+        )
+        graph.write(file_name)
+
+    def __post_init__(self):
+        working_dir = self.global_config["working_dir"]
+        if self.workspace:
+            # Include workspace in the file path for data isolation
+            workspace_dir = os.path.join(working_dir, self.workspace)
+            self.final_namespace = f"{self.workspace}_{self.namespace}"
+        else:
+            # Default behavior when workspace is empty
+            self.final_namespace = self.namespace
+            workspace_dir = working_dir
+            self.workspace = "_"
+
+        os.makedirs(workspace_dir, exist_ok=True)
+        self._graph_file = os.path.join(
+            workspace_dir, f"graph_{self.namespace}{COMPACT_GRAPH_SUFFIX}"
+        )
+        # NetworkXStorage files, imported when no compact graph file exists yet
+        self._networkx_files = [
+            os.path.join(workspace_dir, f"graph_{self.namespace}{suffix}")
+            for suffix in (".nxb", ".graphml")
+        ]
+        self._storage_lock = None
+        self.storage_updated = None
+        # Inverted index: chunk id -> node ids / (sorted) edge keys referencing it
+        self._chunk_to_nodes: dict[str, set[str]] = {}
+        self._chunk_to_edges: dict[str, set[tuple[str, str]]] = {}
+        # Label search index for the WebUI
+        self._label_index = LabelIndex()
+        # Nodes and (sorted) edge keys changed since the last persist, written to
+        # the change log so other workers can replay them instead of reloading
+        self._change_log = None
+        self._dirty_nodes: set[str] = set()
+        self._dirty_edges: set[tuple[str, str]] = set()
+
+        # Load initial graph
+        preloaded_graph = CompactGraphStorage.load_graph(self._graph_file)
+        if preloaded_graph is None:
+            preloaded_graph = self._import_networkx_graph()
+        if preloaded_graph is not None:
+            logger.info(
+                f"[{self.workspace}] Loaded graph from {self._graph_file} with {preloaded_graph.number_of_nodes()} nodes, {preloaded_graph.number_of_edges()} edges"
+            )
+        else:
+            logger.info(
+                f"[{self.workspace}] Created new empty graph file: {self._graph_file}"
+            )
+        self._swap_graph(preloaded_graph or CompactGraph())
+
+    def _import_networkx_graph(self) -> CompactGraph | None:
+        """Convert the graph file of NetworkXStorage, if any, to the compact format"""
+        for networkx_file in self._networkx_files:
+            if not os.path.exists(networkx_file):
+                continue
+            from .networkx_impl import NetworkXStorage
+
+            graph = CompactGraph.from_networkx(
+                NetworkXStorage.load_nx_graph(networkx_file)
+            )
+            CompactGraphStorage.write_graph(graph, self._graph_file, self.workspace)
+            logger.info(
+                f"[{self.workspace}] Imported {networkx_file} into compact graph file {self._graph_file}"
+            )
+            return graph
+        return None
+
+    def _load_graph_file(self) -> CompactGraph:
+        return CompactGraphStorage.load_graph(self._graph_file) or CompactGraph()
+
+    @staticmethod
+    def _get_node_data(graph: CompactGraph, node_id: str) -> dict | None:
+        return graph.get_node(node_id)
+
+    @staticmethod
+    def _get_edge_data(graph: CompactGraph, source: str, target: str) -> dict | None:
+        return graph.get_edge(source, target)
+
+    @staticmethod
+    def _put_node(
+        graph: CompactGraph, node_id: str, node_data: dict, replace: bool
+    ) -> None:
+        graph.add_node(node_id, node_data, replace)
+
+    @staticmethod
+    def _put_edge(
+        graph: CompactGraph, source: str, target: str, edge_data: dict, replace: bool
+    ) -> None:
+        graph.add_edge(source, target, edge_data, replace)
+
+    def _index_new_node(self, node_id: str) -> None:
+        self._label_index.add(node_id)
+
+    def _unindex_node(self, graph: CompactGraph, node_id: str) -> None:
+        """Remove a node and its incident edges from all indexes"""
+        self._unindex_chunks(
+            self._chunk_to_nodes, graph.get_node(node_id).get("source_id"), node_id
+        )
+        for neighbor, eid in graph.neighbors(graph.node_index(node_id)):
+            self._unindex_chunks(
+                self._chunk_to_edges,
+                graph.edge_attrs(eid).get("source_id"),
+                self._edge_key(node_id, graph.node_id(neighbor)),
+            )
+        self._label_index.remove(node_id)
+
+    def _build_indexes(self, graph: CompactGraph) -> dict:
+        """Chunk and label indexes of graph"""
+        chunk_to_nodes: dict[str, set[str]] = {}
+        chunk_to_edges: dict[str, set[tuple[str, str]]] = {}
+        for node_id in graph.node_ids():
+            self._index_chunks(
+                chunk_to_nodes, graph.get_node(node_id).get("source_id"), node_id
+            )
+        for source, target, eid in graph.edges():
+            self._index_chunks(
+                chunk_to_edges,
+                graph.edge_attrs(eid).get("source_id"),
+                self._edge_key(source, target),
+            )
+        return {
+            "_label_index": LabelIndex(graph.node_ids()),
+            "_chunk_to_nodes": chunk_to_nodes,
+            "_chunk_to_edges": chunk_to_edges,
+        }
+
+    def _remove_node(self, graph: CompactGraph, node_id: str) -> None:
+        self._unindex_node(graph, node_id)
+        graph.remove_node(node_id)
+
+    def _remove_edge(self, graph: CompactGraph, source: str, target: str) -> None:
+        self._unindex_chunks(
+            self._chunk_to_edges,
+            graph.get_edge(source, target).get("source_id"),
+            self._edge_key(source, target),
+        )
+        graph.remove_edge(source, target)
+
+    def _mark_node_deleted(self, graph: CompactGraph, node_id: str) -> None:
+        # Incident edges disappear with the node
+        self._dirty_nodes.add(node_id)
+        for neighbor, _ in graph.neighbors(graph.node_index(node_id)):
+            self._dirty_edges.add(self._edge_key(node_id, graph.node_id(neighbor)))
+
+    async def has_node(self, node_id: str) -> bool:
+        graph = await self._get_graph()
+        return graph.has_node(node_id)
+
+    async def has_edge(self, source_node_id: str, target_node_id: str) -> bool:
+        graph = await self._get_graph()
+        return graph.has_edge(source_node_id, target_node_id)
+
+    async def get_node(self, node_id: str) -> dict[str, str] | None:
+        graph = await self._get_graph()
+        return graph.get_node(node_id)
+
+    async def node_degree(self, node_id: str) -> int:
+        graph = await self._get_graph()
+        return graph.degree(node_id)
+
+    async def edge_degree(self, src_id: str, tgt_id: str) -> int:
+        graph = await self._get_graph()
+        return graph.degree(src_id) + graph.degree(tgt_id)
+
+    async def get_edge(
+        self, source_node_id: str, target_node_id: str
+    ) -> dict[str, str] | None:
+        graph = await self._get_graph()
+        return graph.get_edge(source_node_id, target_node_id)
+
+    async def get_node_edges(self, source_node_id: str) -> list[tuple[str, str]] | None:
+        graph = await self._get_graph()
+        idx = graph.node_index(source_node_id)
+        if idx < 0:
+            return None
+        return [
+            (source_node_id, graph.node_id(neighbor))
+            for neighbor, _ in graph.neighbors(idx)
+        ]
+
+    async def get_nodes_batch(self, node_ids: list[str]) -> dict[str, dict]:
+        graph = await self._get_graph()
+        result = {}
+        for node_id in node_ids:
+            node = graph.get_node(node_id)
+            if node is not None:
+                result[node_id] = node
+        return result
+
+    async def node_degrees_batch(self, node_ids: list[str]) -> dict[str, int]:
+        graph = await self._get_graph()
+        return dict(zip(node_ids, graph.degrees(node_ids)))
+
+    async def edge_degrees_batch(
+        self, edge_pairs: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], int]:
+        graph = await self._get_graph()
+        src_degrees = graph.degrees([src for src, _ in edge_pairs])
+        tgt_degrees = graph.degrees([tgt for _, tgt in edge_pairs])
+        return {
+            pair: src_degree + tgt_degree
+            for pair, src_degree, tgt_degree in zip(
+                edge_pairs, src_degrees, tgt_degrees
+            )
+        }
+
+    async def get_edges_batch(
+        self, pairs: list[dict[str, str]]
+    ) -> dict[tuple[str, str], dict]:
+        graph = await self._get_graph()
+        result = {}
+        for pair in pairs:
+            edge = graph.get_edge(pair["src"], pair["tgt"])
+            if edge is not None:
+                result[(pair["src"], pair["tgt"])] = edge
+        return result
+
+    async def get_nodes_edges_batch(
+        self, node_ids: list[str]
+    ) -> dict[str, list[tuple[str, str]]]:
+        graph = await self._get_graph()
+        result = {node_id: [] for node_id in node_ids}
+        present = [node_id for node_id in node_ids if graph.has_node(node_id)]
+        neighbors_batch = graph.neighbors_batch(
+            [graph.node_index(node_id) for node_id in present]
+        )
+        for node_id, neighbors in zip(present, neighbors_batch):
+            result[node_id] = [
+                (node_id, graph.node_id(neighbor)) for neighbor, _ in neighbors
+            ]
+        return result
+
+    async def upsert_node(self, node_id: str, node_data: dict[str, str]) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        graph = await self._get_graph()
+        self._set_node(graph, node_id, node_data)
+        self._dirty_nodes.add(node_id)
+
+    async def upsert_edge(
+        self, source_node_id: str, target_node_id: str, edge_data: dict[str, str]
+    ) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        graph = await self._get_graph()
+        for node_id in (source_node_id, target_node_id):
+            if not graph.has_node(node_id):
+                self._dirty_nodes.add(node_id)
+        self._set_edge(graph, source_node_id, target_node_id, edge_data)
+        self._dirty_edges.add(self._edge_key(source_node_id, target_node_id))
+
+    async def delete_node(self, node_id: str) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        graph = await self._get_graph()
+        if graph.has_node(node_id):
+            self._mark_node_deleted(graph, node_id)
+            self._remove_node(graph, node_id)
+            logger.debug(f"[{self.workspace}] Node {node_id} deleted from the graph")
+        else:
+            logger.warning(
+                f"[{self.workspace}] Node {node_id} not found in the graph for deletion"
+            )
+
+    async def remove_nodes(self, nodes: list[str]):
+        """Delete multiple nodes
+
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+
+        Args:
+            nodes: List of node IDs to be deleted
+        """
+        graph = await self._get_graph()
+        for node in nodes:
+            if graph.has_node(node):
+                self._mark_node_deleted(graph, node)
+                self._remove_node(graph, node)
+
+    async def remove_edges(self, edges: list[tuple[str, str]]):
+        """Delete multiple edges
+
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+
+        Args:
+            edges: List of edges to be deleted, each edge is a (source, target) tuple
+        """
+        graph = await self._get_graph()
+        for source, target in edges:
+            if graph.has_edge(source, target):
+                self._dirty_edges.add(self._edge_key(source, target))
+                self._remove_edge(graph, source, target)
+
+    async def get_all_labels(self) -> list[str]:
+        """
+        Get all node labels in the graph
+        Returns:
+            [label1, label2, ...]  # Alphabetically sorted label list
+        """
+        graph = await self._get_graph()
+        return sorted(graph.node_ids())
+
+    async def get_popular_labels(self, limit: int = 300) -> list[str]:
+        """
+        Get popular labels by node degree (most connected entities)
+
+        Args:
+            limit: Maximum number of labels to return
+
+        Returns:
+            List of labels sorted by degree (highest first)
+        """
+        graph = await self._get_graph()
+        popular_labels = [node for node, _ in graph.top_degree(limit)]
+
+        logger.debug(
+            f"[{self.workspace}] Retrieved {len(popular_labels)} popular labels (limit: {limit})"
+        )
+
+        return popular_labels
+
+    async def search_labels(self, query: str, limit: int = 50) -> list[str]:
+        """
+        Search labels with fuzzy matching
+
+        Args:
+            query: Search query string
+            limit: Maximum number of results to return
+
+        Returns:
+            List of matching labels sorted by relevance
+        """
+        await self._get_graph()
+        search_results = self._label_index.search(query, limit)
+
+        logger.debug(
+            f"[{self.workspace}] Search query '{query}' returned {len(search_results)} results (limit: {limit})"
+        )
+
+        return search_results
+
+    async def get_knowledge_graph(
+        self,
+        node_label: str,
+        max_depth: int = 3,
+        max_nodes: int = None,
+    ) -> KnowledgeGraph:
+        """
+        Retrieve a connected subgraph of nodes where the label includes the specified `node_label`.
+
+        Args:
+            node_label: Label of the starting node，* means all nodes
+            max_depth: Maximum depth of the subgraph, Defaults to 3
+            max_nodes: Maxiumu nodes to return by BFS, Defaults to 1000
+
+        Returns:
+            KnowledgeGraph object containing nodes and edges, with an is_truncated flag
+            indicating whether the graph was truncated due to max_nodes limit
+        """
+        # Get max_nodes from global_config if not provided
+        if max_nodes is None:
+            max_nodes = self.global_config.get("max_graph_nodes", 1000)
+        else:
+            # Limit max_nodes to not exceed global_config max_graph_nodes
+            max_nodes = min(max_nodes, self.global_config.get("max_graph_nodes", 1000))
+
+        graph = await self._get_graph()
+
+        result = KnowledgeGraph()
+
+        # Handle special case for "*" label
+        if node_label == "*":
+            # Check if graph is truncated
+            if graph.number_of_nodes() > max_nodes:
+                result.is_truncated = True
+                logger.info(
+                    f"[{self.workspace}] Graph truncated: {graph.number_of_nodes()} nodes found, limited to {max_nodes}"
+                )
+
+            # Take top max_nodes nodes by degree
+            selected_nodes = [node for node, _ in graph.top_degree(max_nodes)]
+        else:
+            # Check if node exists
+            if not graph.has_node(node_label):
+                logger.warning(
+                    f"[{self.workspace}] Node {node_label} not found in the graph"
+                )
+                return KnowledgeGraph()  # Return empty graph
+
+            # Use modified BFS to get nodes, prioritizing high-degree nodes at the same depth
+            selected_nodes = []
+            visited = set()
+            # Store (node, depth, degree) in the queue
+            queue = [(node_label, 0, graph.degree(node_label))]
+
+            # Flag to track if there are unexplored neighbors due to depth limit
+            has_unexplored_neighbors = False
+
+            # Modified breadth-first search with degree-based prioritization
+            while queue and len(selected_nodes) < max_nodes:
+                # Get the current depth from the first node in queue
+                current_depth = queue[0][1]
+
+                # Collect all nodes at the current depth
+                current_level_nodes = []
+                while queue and queue[0][1] == current_depth:
+                    current_level_nodes.append(queue.pop(0))
+
+                # Sort nodes at current depth by degree (highest first)
+                current_level_nodes.sort(key=lambda x: x[2], reverse=True)
+
+                # Process all nodes at current depth in order of degree
+                for current_node, depth, degree in current_level_nodes:
+                    if current_node not in visited:
+                        visited.add(current_node)
+                        selected_nodes.append(current_node)
+
+                        neighbors = [
+                            graph.node_id(neighbor)
+                            for neighbor, _ in graph.neighbors(
+                                graph.node_index(current_node)
+                            )
+                        ]
+                        # Filter out already visited neighbors
+                        unvisited_neighbors = [n for n in neighbors if n not in visited]
+                        # Only explore neighbors if we haven't reached max_depth
+                        if depth < max_depth:
+                            # Add neighbors to the queue with their degrees
+                            for neighbor, neighbor_degree in zip(
+                                unvisited_neighbors,
+                                graph.degrees(unvisited_neighbors),
+                            ):
+                                queue.append((neighbor, depth + 1, neighbor_degree))
+                        elif unvisited_neighbors:
+                            # Neighbors skipped due to depth limit
+                            has_unexplored_neighbors = True
+
+                    # Check if we've reached max_nodes
+                    if len(selected_nodes) >= max_nodes:
+                        break
+
+            # Check if graph is truncated - either due to max_nodes limit or depth limit
+            if (queue and len(selected_nodes) >= max_nodes) or has_unexplored_neighbors:
+                result.is_truncated = True
+                if len(selected_nodes) >= max_nodes:
+                    logger.info(
+                        f"[{self.workspace}] Graph truncated: max_nodes limit {max_nodes} reached"
+                    )
+                else:
+                    logger.info(
+                        f"[{self.workspace}] Graph truncated: only {len(selected_nodes)} nodes found within max_depth {max_depth}"
+                    )
+
+        # Add nodes to result
+        for node in selected_nodes:
+            result.nodes.append(
+                KnowledgeGraphNode(
+                    id=str(node), labels=[str(node)], properties=graph.get_node(node)
+                )
+            )
+
+        # Add edges between the selected nodes to result
+        selected_indexes = [graph.node_index(node) for node in selected_nodes]
+        selected_set = set(selected_indexes)
+        seen_edges = set()
+        for neighbors in graph.neighbors_batch(selected_indexes):
+            for neighbor, eid in neighbors:
+                if neighbor not in selected_set or eid in seen_edges:
+                    continue
+                seen_edges.add(eid)
+                source, target = graph.edge_endpoints(eid)
+                # Esure unique edge_id for undirect graph
+                if str(source) > str(target):
+                    source, target = target, source
+                result.edges.append(
+                    KnowledgeGraphEdge(
+                        id=f"{source}-{target}",
+                        type="DIRECTED",
+                        source=str(source),
+                        target=str(target),
+                        properties=graph.edge_attrs(eid),
+                    )
+                )
+
+        logger.info(
+            f"[{self.workspace}] Subgraph query successful | Node count: {len(result.nodes)} | Edge count: {len(result.edges)}"
+        )
+        return result
+
+    async def get_nodes_by_chunk_ids(self, chunk_ids: list[str]) -> list[dict]:
+        graph = await self._get_graph()
+        node_ids = set()
+        for chunk_id in chunk_ids:
+            node_ids.update(self._chunk_to_nodes.get(chunk_id, ()))
+        matching_nodes = []
+        for node_id in node_ids:
+            node_data_with_id = graph.get_node(node_id)
+            node_data_with_id["id"] = node_id
+            matching_nodes.append(node_data_with_id)
+        return matching_nodes
+
+    async def get_edges_by_chunk_ids(self, chunk_ids: list[str]) -> list[dict]:
+        graph = await self._get_graph()
+        edge_keys = set()
+        for chunk_id in chunk_ids:
+            edge_keys.update(self._chunk_to_edges.get(chunk_id, ()))
+        matching_edges = []
+        for u, v in edge_keys:
+            edge_data_with_nodes = graph.get_edge(u, v)
+            edge_data_with_nodes["source"] = u
+            edge_data_with_nodes["target"] = v
+            matching_edges.append(edge_data_with_nodes)
+        return matching_edges
+
+    async def get_all_nodes(self) -> list[dict]:
+        """Get all nodes in the graph.
+
+        Returns:
+            A list of all nodes, where each node is a dictionary of its properties
+        """
+        graph = await self._get_graph()
+        all_nodes = []
+        for node_id in graph.node_ids():
+            node_data_with_id = graph.get_node(node_id)
+            node_data_with_id["id"] = node_id
+            all_nodes.append(node_data_with_id)
+        return all_nodes
+
+    async def get_all_edges(self) -> list[dict]:
+        """Get all edges in the graph.
+
+        Returns:
+            A list of all edges, where each edge is a dictionary of its properties
+        """
+        graph = await self._get_graph()
+        all_edges = []
+        for u, v, eid in graph.edges():
+            edge_data_with_nodes = graph.edge_attrs(eid)
+            edge_data_with_nodes["source"] = u
+            edge_data_with_nodes["target"] = v
+            all_edges.append(edge_data_with_nodes)
+        return all_edges
+
+    async def index_done_callback(self) -> bool:
+        """Save data to disk"""
+        async with self._storage_lock:
+            # Check if storage was updated by another process
+            if self.storage_updated.value:
+                # Storage was updated by another process, reload data instead of saving
+                logger.info(
+                    f"[{self.workspace}] Graph was updated by another process, reloading..."
+                )
+                self._reload_graph()
+                # Reset update flag
+                self.storage_updated.value = False
+                return False  # Return error
+
+        # Acquire lock and perform persistence
+        async with self._storage_lock:
+            try:
+                # Save data to disk, compacting the in-memory graph
+                CompactGraphStorage.write_graph(
+                    self._graph, self._graph_file, self.workspace
+                )
+                self._change_log.append(self._collect_changes())
+                # Notify other processes that data has been updated
+                await set_all_update_flags(self.final_namespace)
+                # Reset own update flag to avoid self-reloading
+                self.storage_updated.value = False
+                return True  # Return success
+            except Exception as e:
+                logger.error(f"[{self.workspace}] Error saving graph: {e}")
+                return False  # Return error
+
+        return True
+
+    async def drop(self) -> dict[str, str]:
+        """Drop all graph data from storage and clean up resources
+
+        This method will:
+        1. Replace the graph storage file with an empty graph
+        2. Reset the graph to an empty state
+        3. Update flags to notify other processes
+        4. Changes is persisted to disk immediately
+
+        Returns:
+            dict[str, str]: Operation status and message
+            - On success: {"status": "success", "message": "data dropped"}
+            - On failure: {"status": "error", "message": "<error details>"}
+        """
+        try:
+            async with self._storage_lock:
+                # Keep an empty graph file rather than none, so that the files of
+                # NetworkXStorage (left untouched) are not imported again
+                graph = CompactGraph()
+                CompactGraphStorage.write_graph(graph, self._graph_file, self.workspace)
+                self._swap_graph(graph)
+                self._dirty_nodes.clear()
+                self._dirty_edges.clear()
+                # Other processes must reload the (now empty) graph
+                self._change_log.reset()
+                # Notify other processes that data has been updated
+                await set_all_update_flags(self.final_namespace)
+                # Reset own update flag to avoid self-reloading
+                self.storage_updated.value = False
+                logger.info(
+                    f"[{self.workspace}] Process {os.getpid()} drop graph file:{self._graph_file}"
+                )
+            return {"status": "success", "message": "data dropped"}
+        except Exception as e:
+            logger.error(
+                f"[{self.workspace}] Error dropping graph file:{self._graph_file}: {e}"
+            )
+            return {"status": "error", "message": str(e)}
@@ -9,9 +9,11 @@ from dataclasses import dataclass
 from lightrag.utils import logger, compute_mdhash_id
 from lightrag.base import BaseVectorStorage
 
+from .change_log import CHANGE_LOG_SUFFIX, ChangeLog
 from .shared_storage import (
     get_storage_lock,
     get_update_flag,
+    is_multiprocess,
     set_all_update_flags,
 )
 
@@ -67,6 +69,10 @@ class FaissVectorDBStorage(BaseVectorStorage):
         # Keep a local store for metadata, IDs, etc.
         # Maps <int faiss_id> → metadata (including your original ID).
         self._id_to_meta = {}
+        # Custom ids changed since the last persist, written to the change log
+        # so other workers can replay them instead of reloading
+        self._change_log = None
+        self._dirty_ids: set[str] = set()
 
         self._load_faiss_index()
 
@@ -76,21 +82,96 @@ class FaissVectorDBStorage(BaseVectorStorage):
         self.storage_updated = await get_update_flag(self.final_namespace)
         # Get the storage lock for use in other methods
         self._storage_lock = get_storage_lock()
+        self._change_log = ChangeLog(
+            self._meta_file + CHANGE_LOG_SUFFIX, enabled=is_multiprocess()
+        )
+        async with self._storage_lock:
+            self._change_log.sync()
+
+    def _reload_index(self):
+        """Bring the index up to date with changes persisted by another process
+
+        Replays the change log when possible, otherwise reloads the index files.
+        """
+        changes_list = self._change_log.read_new()
+        if changes_list is not None:
+            for changes in changes_list:
+                self._apply_changes(changes)
+            logger.debug(
+                f"[{self.workspace}] Process {os.getpid()} replayed {len(changes_list)} FAISS change sets of {self.namespace}"
+            )
+            return
+
+        logger.info(
+            f"[{self.workspace}] Process {os.getpid()} FAISS reloading {self.namespace} due to update by another process"
+        )
+        self._index = faiss.IndexFlatIP(self._dim)
+        self._id_to_meta = {}
+        self._load_faiss_index()
+        self._dirty_ids.clear()
+        self._change_log.sync()
+
+    def _collect_changes(self) -> list[tuple]:
+        """Current metadata (with vectors) of all ids changed since the last persist"""
+        upserts = []
+        found = set()
+        if self._dirty_ids:
+            for meta in self._id_to_meta.values():
+                if meta.get("__id__") in self._dirty_ids:
+                    upserts.append(meta)
+                    found.add(meta["__id__"])
+        changes = [
+            ("delete", list(self._dirty_ids - found)),
+            ("upsert", upserts),
+        ]
+        self._dirty_ids.clear()
+        return changes
+
+    def _apply_changes(self, changes: list[tuple]) -> None:
+        """Apply changes collected by another process"""
+        touched_ids = set()
+        upserts = []
+        for kind, payload in changes:
+            if kind == "delete":
+                touched_ids.update(payload)
+            elif kind == "upsert":
+                touched_ids.update(meta["__id__"] for meta in payload)
+                upserts.extend(payload)
+
+        stale_fids = [
+            fid
+            for fid, meta in self._id_to_meta.items()
+            if meta.get("__id__") in touched_ids
+        ]
+        if stale_fids:
+            self._drop_faiss_ids(stale_fids)
+
+        if upserts:
+            # Vectors in the metadata are already normalized
+            start_idx = self._index.ntotal
+            self._index.add(
+                np.array([meta["__vector__"] for meta in upserts], dtype=np.float32)
+            )
+            for i, meta in enumerate(upserts):
+                self._id_to_meta[start_idx + i] = meta
 
     async def _get_index(self):
-        """Check if the shtorage should be reloaded"""
-        # Acquire lock to prevent concurrent read and write
+        """Check if the storage should be reloaded"""
+        # Readers take the index without locking. A persist by another process
+        # is applied here: replay rebuilds the index and _id_to_meta when rows
+        # were replaced and then appends the new rows, a full reload creates
+        # both anew. Nothing awaits in between, so a query that searches and
+        # reads _id_to_meta without awaiting always sees them match.
+        if not self.storage_updated.value:
+            return self._index
+
         async with self._storage_lock:
-            # Check if storage was updated by another process
+            # Another coroutine may have reloaded while we waited for the lock
             if self.storage_updated.value:
-                logger.info(
-                    f"[{self.workspace}] Process {os.getpid()} FAISS reloading {self.namespace} due to update by another process"
-                )
-                # Reload data
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
-                self._load_faiss_index()
+                self._reload_index()
+                # Reset update flag
                 self.storage_updated.value = False
+
             return self._index
 
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
@@ -173,6 +254,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
             # Store the raw vector so we can rebuild if something is removed
             meta["__vector__"] = embeddings[i].tolist()
             self._id_to_meta.update({fid: meta})
+        self._dirty_ids.update(meta["__id__"] for meta in list_data)
 
         logger.debug(
             f"[{self.workspace}] Upserted {len(list_data)} vectors into Faiss index."
@@ -252,6 +334,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
 
         if to_remove:
             await self._remove_faiss_ids(to_remove)
+        self._dirty_ids.update(ids)
         logger.debug(
             f"[{self.workspace}] Successfully deleted {len(to_remove)} vectors from {self.namespace}"
         )
@@ -286,6 +369,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
             f"[{self.workspace}] Found {len(relations)} relations for {entity_name}"
         )
         if relations:
+            self._dirty_ids.update(self._id_to_meta[fid]["__id__"] for fid in relations)
             await self._remove_faiss_ids(relations)
             logger.debug(
                 f"[{self.workspace}] Deleted {len(relations)} relations for {entity_name}"
@@ -310,7 +394,13 @@ class FaissVectorDBStorage(BaseVectorStorage):
         Because IndexFlatIP doesn't support 'removals',
         we rebuild the index excluding those vectors.
         """
-        keep_fids = [fid for fid in self._id_to_meta if fid not in fid_list]
+        async with self._storage_lock:
+            self._drop_faiss_ids(fid_list)
+
+    def _drop_faiss_ids(self, fid_list):
+        """Rebuild the index without fid_list, caller must hold the storage lock"""
+        fid_set = set(fid_list)
+        keep_fids = [fid for fid in self._id_to_meta if fid not in fid_set]
 
         # Rebuild the index
         vectors_to_keep = []
@@ -320,14 +410,13 @@ class FaissVectorDBStorage(BaseVectorStorage):
             vectors_to_keep.append(vec_meta["__vector__"])  # stored as list
             new_id_to_meta[new_fid] = vec_meta
 
-        async with self._storage_lock:
-            # Re-init index
-            self._index = faiss.IndexFlatIP(self._dim)
-            if vectors_to_keep:
-                arr = np.array(vectors_to_keep, dtype=np.float32)
-                self._index.add(arr)
+        # Re-init index
+        self._index = faiss.IndexFlatIP(self._dim)
+        if vectors_to_keep:
+            arr = np.array(vectors_to_keep, dtype=np.float32)
+            self._index.add(arr)
 
-            self._id_to_meta = new_id_to_meta
+        self._id_to_meta = new_id_to_meta
 
     def _save_faiss_index(self):
         """
@@ -388,9 +477,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
                 logger.warning(
                     f"[{self.workspace}] Storage for FAISS {self.namespace} was updated by another process, reloading..."
                 )
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
-                self._load_faiss_index()
+                self._reload_index()
                 self.storage_updated.value = False
                 return False  # Return error
 
@@ -399,6 +486,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
             try:
                 # Save data to disk
                 self._save_faiss_index()
+                self._change_log.append(self._collect_changes())
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.final_namespace)
                 # Reset own update flag to avoid self-reloading
@@ -495,6 +583,34 @@ class FaissVectorDBStorage(BaseVectorStorage):
 
         return vectors_dict
 
+    async def get_vector_matrix_by_ids(
+        self, ids: list[str]
+    ) -> tuple[list[str], np.ndarray]:
+        """Get vectors by their IDs as one contiguous float32 matrix
+
+        Rows are reconstructed from the Faiss index in one call.
+
+        Args:
+            ids: List of unique identifiers
+
+        Returns:
+            Tuple of (found_ids, matrix) where row i of matrix is the vector of found_ids[i]
+        """
+        found_ids = []
+        fids = []
+        for id in ids:
+            fid = self._find_faiss_id_by_custom_id(id)
+            if fid is not None and fid in self._id_to_meta:
+                found_ids.append(id)
+                fids.append(fid)
+
+        if not fids:
+            return [], np.empty((0, self._dim), dtype=np.float32)
+
+        index = await self._get_index()
+        matrix = index.reconstruct_batch(np.asarray(fids, dtype=np.int64))
+        return found_ids, np.ascontiguousarray(matrix, dtype=np.float32)
+
     async def drop(self) -> dict[str, str]:
         """Drop all vector data from storage and clean up resources
 
@@ -525,6 +641,9 @@ class FaissVectorDBStorage(BaseVectorStorage):
 
                 self._id_to_meta = {}
                 self._load_faiss_index()
+                self._dirty_ids.clear()
+                # Other processes must reload the (now empty) index
+                self._change_log.reset()
 
                 # Notify other processes
                 await set_all_update_flags(self.final_namespace)
@@ -0,0 +1,204 @@
+"""
+Code shared by the file based graph storages (NetworkXStorage, CompactGraphStorage).
+
+Both keep the whole graph of a workspace in memory, index nodes and edges by the
+chunks referencing them, and let workers catch up with each other by replaying a
+change log. Only access to the graph engine differs, so storages provide it
+through a few hooks:
+
+    - `_get_node_data` / `_get_edge_data`: attributes of a node or edge, None if missing
+    - `_put_node` / `_put_edge`: write attributes, merged or replacing the old ones
+    - `_index_new_node` / `_index_new_edge`: update the label and degree indexes
+    - `_remove_node` / `_remove_edge`: remove from the graph and all indexes
+    - `_build_indexes`: build every index of a graph
+    - `_load_graph_file`: load the graph file, or an empty graph if there is none
+"""
+
+import os
+from typing import Any
+
+from lightrag.constants import GRAPH_FIELD_SEP
+from lightrag.utils import logger
+from .change_log import CHANGE_LOG_SUFFIX, ChangeLog
+from .shared_storage import get_storage_lock, get_update_flag, is_multiprocess
+
+
+class FileGraphStorageMixin:
+    """Chunk indexes, change log replay and reloads of in-memory graph storages
+
+    Expects `_graph`, `_graph_file`, `_chunk_to_nodes`, `_chunk_to_edges`,
+    `_dirty_nodes` and `_dirty_edges` to be set up by the storage.
+    """
+
+    async def initialize(self):
+        """Initialize storage data"""
+        # Get the update flag for cross-process update notification
+        self.storage_updated = await get_update_flag(self.final_namespace)
+        # Get the storage lock for use in other methods
+        self._storage_lock = get_storage_lock()
+        self._change_log = ChangeLog(
+            self._graph_file + CHANGE_LOG_SUFFIX, enabled=is_multiprocess()
+        )
+        async with self._storage_lock:
+            self._change_log.sync()
+
+    def _reload_graph(self) -> None:
+        """Bring the graph up to date with changes persisted by another process
+
+        Replays the change log when possible, otherwise reloads the graph file.
+        """
+        changes_list = self._change_log.read_new()
+        if changes_list is not None:
+            for changes in changes_list:
+                self._apply_changes(changes)
+            logger.debug(
+                f"[{self.workspace}] Process {os.getpid()} replayed {len(changes_list)} graph change sets"
+            )
+            return
+
+        logger.info(
+            f"[{self.workspace}] Process {os.getpid()} reloading graph {self._graph_file} due to modifications by another process"
+        )
+        self._swap_graph(self._load_graph_file())
+        self._dirty_nodes.clear()
+        self._dirty_edges.clear()
+        self._change_log.sync()
+
+    def _swap_graph(self, graph: Any) -> None:
+        """Replace the graph, building the indexes of the new one first"""
+        indexes = self._build_indexes(graph)
+        self._graph = graph
+        for name, index in indexes.items():
+            setattr(self, name, index)
+
+    async def _get_graph(self):
+        """Check if the storage should be reloaded"""
+        # Readers take the graph without locking. A persist by another process
+        # is applied here, under the storage lock. A full reload builds the new
+        # graph and its indexes before swapping them in, so readers keep the
+        # graph they were handed. Replaying the change log updates the graph
+        # in place instead, as copying the graph and its indexes for every
+        # replay would cost as much as a reload: replay does not await, so no
+        # coroutine sees a partial update, but a reader holding the graph across
+        # an await sees the replayed changes when it resumes, just like local
+        # writes. CompactGraph may also renumber its node indexes when it
+        # compacts, so readers must not keep a node index across an await.
+        if not self.storage_updated.value:
+            return self._graph
+
+        async with self._storage_lock:
+            # Another coroutine may have reloaded while we waited for the lock
+            if self.storage_updated.value:
+                self._reload_graph()
+                # Reset update flag
+                self.storage_updated.value = False
+
+            return self._graph
+
+    @staticmethod
+    def _edge_key(source: str, target: str) -> tuple[str, str]:
+        # Undirected graph: (a, b) and (b, a) are the same edge
+        return (source, target) if source <= target else (target, source)
+
+    @staticmethod
+    def _index_chunks(index: dict[str, set], source_id: str | None, key) -> None:
+        if not source_id:
+            return
+        for chunk_id in source_id.split(GRAPH_FIELD_SEP):
+            index.setdefault(chunk_id, set()).add(key)
+
+    @staticmethod
+    def _unindex_chunks(index: dict[str, set], source_id: str | None, key) -> None:
+        if not source_id:
+            return
+        for chunk_id in source_id.split(GRAPH_FIELD_SEP):
+            keys = index.get(chunk_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del index[chunk_id]
+
+    def _index_new_edge(self, source: str, target: str) -> None:
+        """Called after an edge was added to the graph"""
+
+    def _set_node(
+        self, graph: Any, node_id: str, node_data: dict, replace: bool = False
+    ) -> None:
+        old_node = self._get_node_data(graph, node_id)
+        old_source_id = None if old_node is None else old_node.get("source_id")
+        self._put_node(graph, node_id, node_data, replace)
+        if old_node is None:
+            self._index_new_node(node_id)
+        new_source_id = self._get_node_data(graph, node_id).get("source_id")
+        if new_source_id != old_source_id:
+            self._unindex_chunks(self._chunk_to_nodes, old_source_id, node_id)
+            self._index_chunks(self._chunk_to_nodes, new_source_id, node_id)
+
+    def _set_edge(
+        self,
+        graph: Any,
+        source_node_id: str,
+        target_node_id: str,
+        edge_data: dict,
+        replace: bool = False,
+    ) -> None:
+        old_edge = self._get_edge_data(graph, source_node_id, target_node_id)
+        old_source_id = None if old_edge is None else old_edge.get("source_id")
+        # Adding an edge implicitly creates missing endpoint nodes
+        new_nodes = [
+            node_id
+            for node_id in dict.fromkeys((source_node_id, target_node_id))
+            if not graph.has_node(node_id)
+        ]
+        self._put_edge(graph, source_node_id, target_node_id, edge_data, replace)
+        for node_id in new_nodes:
+            self._index_new_node(node_id)
+        if old_edge is None:
+            self._index_new_edge(source_node_id, target_node_id)
+        new_source_id = self._get_edge_data(graph, source_node_id, target_node_id).get(
+            "source_id"
+        )
+        if new_source_id != old_source_id:
+            edge_key = self._edge_key(source_node_id, target_node_id)
+            self._unindex_chunks(self._chunk_to_edges, old_source_id, edge_key)
+            self._index_chunks(self._chunk_to_edges, new_source_id, edge_key)
+
+    def _collect_changes(self) -> list[tuple]:
+        """Current state of everything changed since the last persist"""
+        graph = self._graph
+        nodes = {
+            node_id: self._get_node_data(graph, node_id)
+            for node_id in self._dirty_nodes
+        }
+        changes = []
+        for node_id, node in nodes.items():
+            if node is None:
+                changes.append(("del_node", node_id))
+        for node_id, node in nodes.items():
+            if node is not None:
+                changes.append(("node", node_id, dict(node)))
+        for source, target in self._dirty_edges:
+            edge = self._get_edge_data(graph, source, target)
+            if edge is not None:
+                changes.append(("edge", source, target, dict(edge)))
+            else:
+                changes.append(("del_edge", source, target))
+        self._dirty_nodes.clear()
+        self._dirty_edges.clear()
+        return changes
+
+    def _apply_changes(self, changes: list[tuple]) -> None:
+        """Apply changes collected by another process"""
+        graph = self._graph
+        for change in changes:
+            kind = change[0]
+            if kind == "node":
+                self._set_node(graph, change[1], change[2], replace=True)
+            elif kind == "edge":
+                self._set_edge(graph, change[1], change[2], change[3], replace=True)
+            elif kind == "del_node":
+                if graph.has_node(change[1]):
+                    self._remove_node(graph, change[1])
+            elif kind == "del_edge":
+                if graph.has_edge(change[1], change[2]):
+                    self._remove_edge(graph, change[1], change[2])
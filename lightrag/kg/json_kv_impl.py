@@ -16,7 +16,6 @@ from .shared_storage import (
     get_storage_lock,
     get_data_init_lock,
     get_update_flag,
-    set_all_update_flags,
     clear_all_update_flags,
     try_initialize_namespace,
 )
@@ -43,6 +42,9 @@ class JsonKVStorage(BaseKVStorage):
         self._data = None
         self._storage_lock = None
         self.storage_updated = None
+        # Whether this process changed the shared data since it was last
+        # persisted; tracked locally so writes need no cross-process traffic
+        self._dirty = False
 
     async def initialize(self):
         """Initialize storage data"""
@@ -70,7 +72,7 @@ class JsonKVStorage(BaseKVStorage):
 
     async def index_done_callback(self) -> None:
         async with self._storage_lock:
-            if self.storage_updated.value:
+            if self._dirty or self.storage_updated.value:
                 data_dict = (
                     dict(self._data) if hasattr(self._data, "_getvalue") else self._data
                 )
@@ -82,6 +84,8 @@ class JsonKVStorage(BaseKVStorage):
                     f"[{self.workspace}] Process {os.getpid()} KV writting {data_count} records to {self.namespace}"
                 )
                 write_json(data_dict, self._file_name)
+                self._dirty = False
+                # The shared data is persisted, no worker needs to write it again
                 await clear_all_update_flags(self.final_namespace)
 
     async def get_all(self) -> dict[str, Any]:
@@ -90,60 +94,62 @@ class JsonKVStorage(BaseKVStorage):
         Returns:
             Dictionary containing all stored data
         """
-        async with self._storage_lock:
-            result = {}
-            for key, value in self._data.items():
-                if value:
-                    # Create a copy to avoid modifying the original data
-                    data = dict(value)
-                    # Ensure time fields are present, provide default values for old data
-                    data.setdefault("create_time", 0)
-                    data.setdefault("update_time", 0)
-                    result[key] = data
-                else:
-                    result[key] = value
-            return result
+        # Getters read the shared dict without the storage lock. Records are
+        # never modified in place: upsert publishes a new record object under
+        # the key in one assignment, so a reader keeps whichever version it
+        # fetched. get_all reads every record without awaiting (a single call
+        # to the manager in multi-worker mode), so it returns one version of all.
+        result = {}
+        for key, value in self._data.items():
+            if value:
+                # Create a copy to avoid modifying the original data
+                data = dict(value)
+                # Ensure time fields are present, provide default values for old data
+                data.setdefault("create_time", 0)
+                data.setdefault("update_time", 0)
+                result[key] = data
+            else:
+                result[key] = value
+        return result
 
     async def get_by_id(self, id: str) -> dict[str, Any] | None:
-        async with self._storage_lock:
-            result = self._data.get(id)
-            if result:
+        result = self._data.get(id)
+        if result:
+            # Create a copy to avoid modifying the original data
+            result = dict(result)
+            # Ensure time fields are present, provide default values for old data
+            result.setdefault("create_time", 0)
+            result.setdefault("update_time", 0)
+            # Ensure _id field contains the clean ID
+            result["_id"] = id
+        return result
+
+    async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
+        results = []
+        for id in ids:
+            data = self._data.get(id, None)
+            if data:
                 # Create a copy to avoid modifying the original data
-                result = dict(result)
+                result = {k: v for k, v in data.items()}
                 # Ensure time fields are present, provide default values for old data
                 result.setdefault("create_time", 0)
                 result.setdefault("update_time", 0)
                 # Ensure _id field contains the clean ID
                 result["_id"] = id
-            return result
-
-    async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
-        async with self._storage_lock:
-            results = []
-            for id in ids:
-                data = self._data.get(id, None)
-                if data:
-                    # Create a copy to avoid modifying the original data
-                    result = {k: v for k, v in data.items()}
-                    # Ensure time fields are present, provide default values for old data
-                    result.setdefault("create_time", 0)
-                    result.setdefault("update_time", 0)
-                    # Ensure _id field contains the clean ID
-                    result["_id"] = id
-                    results.append(result)
-                else:
-                    results.append(None)
-            return results
+                results.append(result)
+            else:
+                results.append(None)
+        return results
 
     async def filter_keys(self, keys: set[str]) -> set[str]:
-        async with self._storage_lock:
-            return set(keys) - set(self._data.keys())
+        return set(keys) - set(self._data.keys())
 
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
         """
         Importance notes for in-memory storage:
         1. Changes will be persisted to disk during the next index_done_callback
-        2. update flags to notify other processes that data persistence is needed
+        2. the storage is only marked dirty in this process, other processes are
+           not notified since they share the in-memory data
         """
         if not data:
             return
@@ -174,15 +180,18 @@ class JsonKVStorage(BaseKVStorage):
 
                 v["_id"] = k
 
-            self._data.update(data)
-            await set_all_update_flags(self.final_namespace)
+            # Store copies so the published records are never changed in place
+            # by callers still holding the dicts they passed in
+            self._data.update({k: dict(v) for k, v in data.items()})
+            self._dirty = True
 
     async def delete(self, ids: list[str]) -> None:
         """Delete specific records from storage by their IDs
 
         Importance notes for in-memory storage:
         1. Changes will be persisted to disk during the next index_done_callback
-        2. update flags to notify other processes that data persistence is needed
+        2. the storage is only marked dirty in this process, other processes are
+           not notified since they share the in-memory data
 
         Args:
             ids (list[str]): List of document IDs to be deleted from storage
@@ -198,7 +207,7 @@ class JsonKVStorage(BaseKVStorage):
                     any_deleted = True
 
             if any_deleted:
-                await set_all_update_flags(self.final_namespace)
+                self._dirty = True
 
     async def drop(self) -> dict[str, str]:
         """Drop all data from storage and clean up resources
@@ -206,7 +215,7 @@ class JsonKVStorage(BaseKVStorage):
 
         This method will:
         1. Clear all data from memory
-        2. Update flags to notify other processes
+        2. Mark the storage dirty
         3. Trigger index_done_callback to save the empty state
 
         Returns:
@@ -217,7 +226,7 @@ class JsonKVStorage(BaseKVStorage):
         try:
             async with self._storage_lock:
                 self._data.clear()
-                await set_all_update_flags(self.final_namespace)
+                self._dirty = True
 
             await self.index_done_callback()
             logger.info(
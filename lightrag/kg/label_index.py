@@ -0,0 +1,194 @@
+"""
+In-memory indexes for node label search and degree ranking.
+
+Used by in-memory graph storages to answer WebUI label autocomplete and
+popular-label requests without scanning every node:
+
+    - LabelIndex: lowercase trigram index for substring matches plus a sorted
+      label list for prefix matches (queries shorter than three characters)
+    - DegreeIndex: nodes bucketed by degree, updated incrementally on edge changes
+"""
+
+import heapq
+from bisect import bisect_left, insort
+from typing import Iterable
+
+_GRAM_SIZE = 3
+# Upper bound of candidates collected for queries shorter than a trigram
+_SHORT_QUERY_CANDIDATE_FACTOR = 20
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + _GRAM_SIZE] for i in range(len(text) - _GRAM_SIZE + 1)}
+
+
+def score_label(label: str, label_lower: str, query_lower: str) -> int:
+    """Relevance of a label containing query_lower, higher is better"""
+    # Exact match gets highest score
+    if label_lower == query_lower:
+        return 1000
+    # Prefix match gets high score
+    if label_lower.startswith(query_lower):
+        return 500
+    # Contains match gets base score, with bonus for shorter strings
+    score = 100 - len(label)
+    # Bonus for word boundary matches
+    if f" {query_lower}" in label_lower or f"_{query_lower}" in label_lower:
+        score += 50
+    return score
+
+
+class LabelIndex:
+    """Substring and prefix index over node labels"""
+
+    def __init__(self, labels: Iterable[str] = ()):
+        self._lower: dict[str, str] = {}
+        self._grams: dict[str, set[str]] = {}
+        for label in labels:
+            self._index(label)
+        self._sorted: list[tuple[str, str]] = sorted(
+            (label_lower, label) for label, label_lower in self._lower.items()
+        )
+
+    def __len__(self) -> int:
+        return len(self._lower)
+
+    def _index(self, label: str) -> str | None:
+        if label in self._lower:
+            return None
+        label_lower = label.lower()
+        self._lower[label] = label_lower
+        for gram in _trigrams(label_lower):
+            self._grams.setdefault(gram, set()).add(label)
+        return label_lower
+
+    def add(self, label: str) -> None:
+        label_lower = self._index(label)
+        if label_lower is not None:
+            insort(self._sorted, (label_lower, label))
+
+    def remove(self, label: str) -> None:
+        label_lower = self._lower.pop(label, None)
+        if label_lower is None:
+            return
+        for gram in _trigrams(label_lower):
+            labels = self._grams.get(gram)
+            if labels is not None:
+                labels.discard(label)
+                if not labels:
+                    del self._grams[gram]
+        pos = bisect_left(self._sorted, (label_lower, label))
+        if pos < len(self._sorted) and self._sorted[pos] == (label_lower, label):
+            del self._sorted[pos]
+
+    def _prefix_matches(self, query_lower: str, limit: int) -> list[str]:
+        matches = []
+        pos = bisect_left(self._sorted, (query_lower, ""))
+        while pos < len(self._sorted) and len(matches) < limit:
+            label_lower, label = self._sorted[pos]
+            if not label_lower.startswith(query_lower):
+                break
+            matches.append(label)
+            pos += 1
+        return matches
+
+    def _candidates(self, query_lower: str, limit: int) -> set[str]:
+        if len(query_lower) >= _GRAM_SIZE:
+            postings = sorted(
+                (self._grams.get(gram, set()) for gram in _trigrams(query_lower)),
+                key=len,
+            )
+            candidates = set(postings[0])
+            for labels in postings[1:]:
+                candidates &= labels
+                if not candidates:
+                    break
+            return candidates
+
+        # Too short for trigrams: all prefix matches rank first, then a bounded
+        # number of labels containing the query
+        max_candidates = limit * _SHORT_QUERY_CANDIDATE_FACTOR
+        candidates = set(self._prefix_matches(query_lower, max_candidates))
+        for gram, labels in self._grams.items():
+            if len(candidates) >= max_candidates:
+                break
+            if query_lower in gram:
+                candidates.update(labels)
+        return candidates
+
+    def search(self, query: str, limit: int = 50) -> list[str]:
+        """Labels containing query (case-insensitive), best matches first
+
+        Exact and prefix matches always outrank other substring matches, so the
+        substring index is only consulted when there are fewer than limit
+        prefix matches. Prefix matches are taken in case-insensitive order, and
+        queries shorter than three characters only consider a bounded sample of
+        non-prefix substring matches.
+        """
+        query_lower = query.lower().strip()
+        if not query_lower or limit <= 0:
+            return []
+
+        prefix_matches = self._prefix_matches(query_lower, limit)
+        labels = set(prefix_matches)
+        if len(prefix_matches) < limit:
+            labels.update(self._candidates(query_lower, limit))
+
+        matches = []
+        for label in labels:
+            label_lower = self._lower[label]
+            if query_lower in label_lower:
+                matches.append((label, score_label(label, label_lower, query_lower)))
+
+        # Sort by relevance score (desc) then alphabetically
+        matches.sort(key=lambda x: (-x[1], x[0]))
+        return [label for label, _ in matches[:limit]]
+
+
+class DegreeIndex:
+    """Nodes bucketed by degree for top-k by degree queries"""
+
+    def __init__(self, degrees: Iterable[tuple[str, int]] = ()):
+        self._degree: dict[str, int] = {}
+        self._buckets: dict[int, set[str]] = {}
+        for node, degree in degrees:
+            self._set(node, degree)
+
+    def __len__(self) -> int:
+        return len(self._degree)
+
+    def _set(self, node: str, degree: int) -> None:
+        self._degree[node] = degree
+        self._buckets.setdefault(degree, set()).add(node)
+
+    def _unset(self, node: str) -> int | None:
+        degree = self._degree.pop(node, None)
+        if degree is not None:
+            bucket = self._buckets[degree]
+            bucket.discard(node)
+            if not bucket:
+                del self._buckets[degree]
+        return degree
+
+    def add_node(self, node: str) -> None:
+        if node not in self._degree:
+            self._set(node, 0)
+
+    def remove_node(self, node: str) -> None:
+        self._unset(node)
+
+    def adjust(self, node: str, delta: int) -> None:
+        """Change the degree of node by delta"""
+        degree = self._unset(node) or 0
+        self._set(node, max(0, degree + delta))
+
+    def top(self, limit: int) -> list[tuple[str, int]]:
+        """Up to limit (node, degree) pairs with the highest degree"""
+        result = []
+        for degree in sorted(self._buckets, reverse=True):
+            if len(result) >= limit:
+                break
+            # Ties are broken alphabetically
+            for node in heapq.nsmallest(limit - len(result), self._buckets[degree]):
+                result.append((node, degree))
+        return result
@@ -1303,6 +1303,42 @@ class MilvusVectorDBStorage(BaseVectorStorage):
             )
             return {}
 
+    async def similarity_by_ids(
+        self, query_embedding: list[float], ids: list[str], top_k: int
+    ) -> list[tuple[str, float]] | None:
+        """Rank the given IDs by cosine similarity with a filtered Milvus search
+
+        Args:
+            query_embedding: Query vector
+            ids: Candidate IDs to restrict the search to
+            top_k: Number of results to return
+
+        Returns:
+            List of (id, similarity) sorted by similarity descending, or None on error
+        """
+        if not ids or top_k <= 0:
+            return []
+
+        try:
+            # Ensure collection is loaded before searching
+            self._ensure_collection_loaded()
+
+            id_list = '", "'.join(ids)
+            results = self._client.search(
+                collection_name=self.final_namespace,
+                data=[query_embedding],
+                filter=f'id in ["{id_list}"]',
+                limit=min(top_k, len(ids)),
+                output_fields=["id"],
+                search_params={"metric_type": "COSINE"},
+            )
+            return [(dp["id"], float(dp["distance"])) for dp in results[0]]
+        except Exception as e:
+            logger.error(
+                f"[{self.workspace}] Error ranking vectors by IDs in {self.namespace}: {e}"
+            )
+            return None
+
     async def drop(self) -> dict[str, str]:
         """Drop all vector data from storage and clean up resources
 
@@ -1,5 +1,6 @@
 import asyncio
 import base64
+import copy
 import os
 import zlib
 from typing import Any, final
@@ -10,17 +11,36 @@ import time
 from lightrag.utils import (
     logger,
     compute_mdhash_id,
+    get_env_value,
 )
 
 from lightrag.base import BaseVectorStorage
 from nano_vectordb import NanoVectorDB
+from .change_log import CHANGE_LOG_SUFFIX, ChangeLog
+from .shared_matrix import SharedMatrixFile
 from .shared_storage import (
     get_storage_lock,
     get_update_flag,
+    is_multiprocess,
     set_all_update_flags,
 )
 
 
+def get_client_storage(client: NanoVectorDB) -> dict[str, Any]:
+    """Storage dict of a NanoVectorDB client: row metadata under "data", vectors
+    under "matrix"
+
+    NanoVectorDB keeps it in a name-mangled private attribute, so all access to
+    it goes through this accessor and set_client_storage.
+    """
+    return getattr(client, "_NanoVectorDB__storage")
+
+
+def set_client_storage(client: NanoVectorDB, storage: dict[str, Any]) -> None:
+    """Replace the storage dict of a NanoVectorDB client"""
+    setattr(client, "_NanoVectorDB__storage", storage)
+
+
 @final
 @dataclass
 class NanoVectorDBStorage(BaseVectorStorage):
@@ -29,6 +49,12 @@ class NanoVectorDBStorage(BaseVectorStorage):
         self._client = None
         self._storage_lock = None
         self.storage_updated = None
+        # Ids changed since the last persist, written to the change log so
+        # other workers can replay them instead of reloading
+        self._change_log = None
+        self._dirty_ids: set[str] = set()
+        # Matrix mapped from a file shared by all workers (SHARED_VECTOR_MATRIX)
+        self._shared_matrix = None
 
         # Use global config value if specified, otherwise use default
         kwargs = self.global_config.get("vector_db_storage_cls_kwargs", {})
@@ -68,21 +94,147 @@ class NanoVectorDBStorage(BaseVectorStorage):
         self.storage_updated = await get_update_flag(self.final_namespace)
         # Get the storage lock for use in other methods
         self._storage_lock = get_storage_lock(enable_logging=False)
+        self._change_log = ChangeLog(
+            self._client_file_name + CHANGE_LOG_SUFFIX, enabled=is_multiprocess()
+        )
+        if is_multiprocess() and get_env_value("SHARED_VECTOR_MATRIX", False, bool):
+            self._shared_matrix = SharedMatrixFile(self._client_file_name)
+        async with self._storage_lock:
+            self._change_log.sync()
+            self._attach_shared_matrix(self._client)
+
+    def _attach_shared_matrix(self, client: NanoVectorDB) -> None:
+        """Swap the private matrix of client for the shared mapping
+
+        Only done when the client holds exactly the rows of the published
+        generation, i.e. right after a persist or after catching up with one.
+        """
+        if self._shared_matrix is None or self._dirty_ids:
+            return
+        shared = self._shared_matrix.open()
+        if shared is None:
+            return
+        ids, matrix = shared
+        storage = get_client_storage(client)
+        data = storage["data"]
+        if len(data) != len(ids) or matrix.shape != storage["matrix"].shape:
+            return
+        if any(dp["__id__"] != row_id for dp, row_id in zip(data, ids)):
+            by_id = {dp["__id__"]: dp for dp in data}
+            if by_id.keys() != set(ids):
+                return
+            # Same rows in another order, e.g. after replaying the change log
+            storage["data"] = [by_id[row_id] for row_id in ids]
+        storage["matrix"] = matrix
+
+    def _copy_client(self) -> NanoVectorDB:
+        """Copy of the client that can be updated while readers use the original"""
+        client = copy.copy(self._client)
+        # The query functions are methods bound to the original client
+        client.usable_metrics = {
+            metric: getattr(client, func.__name__)
+            for metric, func in self._client.usable_metrics.items()
+        }
+        storage = get_client_storage(self._client)
+        set_client_storage(
+            client,
+            {
+                **storage,
+                "data": list(storage["data"]),
+                "matrix": np.array(storage["matrix"]),
+            },
+        )
+        return client
+
+    def _reload_client(self) -> None:
+        """Bring the client up to date with changes persisted by another process
+
+        Replays the change log when possible, otherwise reloads the storage file.
+        Either way the new version is built on a separate client that replaces
+        the current one in a single assignment, so queries still running on the
+        old client keep a consistent snapshot.
+        """
+        changes_list = self._change_log.read_new()
+        if changes_list is not None:
+            client = self._copy_client()
+            for changes in changes_list:
+                self._apply_changes(client, changes)
+            self._attach_shared_matrix(client)
+            self._client = client
+            logger.debug(
+                f"[{self.workspace}] Process {os.getpid()} replayed {len(changes_list)} change sets of {self.namespace}"
+            )
+            return
+
+        logger.info(
+            f"[{self.workspace}] Process {os.getpid()} reloading {self.namespace} due to update by another process"
+        )
+        client = NanoVectorDB(
+            self.embedding_func.embedding_dim,
+            storage_file=self._client_file_name,
+        )
+        self._dirty_ids.clear()
+        self._attach_shared_matrix(client)
+        self._client = client
+        self._change_log.sync()
+
+    def _collect_changes(self) -> list[tuple]:
+        """Current rows of all ids changed since the last persist"""
+        storage = get_client_storage(self._client)
+        upserts = []
+        found = set()
+        if self._dirty_ids:
+            for i, dp in enumerate(storage["data"]):
+                if dp["__id__"] in self._dirty_ids:
+                    upserts.append(
+                        {
+                            **dp,
+                            "__vector__": storage["matrix"][i]
+                            .astype(np.float32)
+                            .tobytes(),
+                        }
+                    )
+                    found.add(dp["__id__"])
+        changes = [
+            ("delete", list(self._dirty_ids - found)),
+            ("upsert", upserts),
+        ]
+        self._dirty_ids.clear()
+        return changes
+
+    @staticmethod
+    def _apply_changes(client: NanoVectorDB, changes: list[tuple]) -> None:
+        """Apply changes collected by another process to client"""
+        for kind, payload in changes:
+            if not payload:
+                continue
+            if kind == "delete":
+                client.delete(payload)
+            elif kind == "upsert":
+                client.upsert(
+                    datas=[
+                        {
+                            **dp,
+                            "__vector__": np.frombuffer(
+                                dp["__vector__"], dtype=np.float32
+                            ),
+                        }
+                        for dp in payload
+                    ]
+                )
 
     async def _get_client(self):
         """Check if the storage should be reloaded"""
-        # Acquire lock to prevent concurrent read and write
+        # Readers take the client without locking. A persist by another process
+        # is applied here, on a new client (see _reload_client) that is swapped
+        # in once complete, so a query keeps the client it started with.
+        if not self.storage_updated.value:
+            return self._client
+
         async with self._storage_lock:
-            # Check if data needs to be reloaded
+            # Another coroutine may have reloaded while we waited for the lock
             if self.storage_updated.value:
-                logger.info(
-                    f"[{self.workspace}] Process {os.getpid()} reloading {self.namespace} due to update by another process"
-                )
-                # Reload data
-                self._client = NanoVectorDB(
-                    self.embedding_func.embedding_dim,
-                    storage_file=self._client_file_name,
-                )
+                self._reload_client()
                 # Reset update flag
                 self.storage_updated.value = False
 
@@ -129,6 +281,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
                 d["__vector__"] = embeddings[i]
             client = await self._get_client()
             results = client.upsert(datas=list_data)
+            self._dirty_ids.update(data.keys())
             return results
         else:
             # sometimes the embedding is not returned correctly. just log it.
@@ -169,7 +322,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
     @property
     async def client_storage(self):
         client = await self._get_client()
-        return getattr(client, "_NanoVectorDB__storage")
+        return get_client_storage(client)
 
     async def delete(self, ids: list[str]):
         """Delete vectors with specified IDs
@@ -185,6 +338,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
         try:
             client = await self._get_client()
             client.delete(ids)
+            self._dirty_ids.update(ids)
             logger.debug(
                 f"[{self.workspace}] Successfully deleted {len(ids)} vectors from {self.namespace}"
             )
@@ -211,6 +365,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
             client = await self._get_client()
             if client.get([entity_id]):
                 client.delete([entity_id])
+                self._dirty_ids.add(entity_id)
                 logger.debug(
                     f"[{self.workspace}] Successfully deleted entity {entity_name}"
                 )
@@ -231,7 +386,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
 
         try:
             client = await self._get_client()
-            storage = getattr(client, "_NanoVectorDB__storage")
+            storage = get_client_storage(client)
             relations = [
                 dp
                 for dp in storage["data"]
@@ -245,6 +400,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
             if ids_to_delete:
                 client = await self._get_client()
                 client.delete(ids_to_delete)
+                self._dirty_ids.update(ids_to_delete)
                 logger.debug(
                     f"[{self.workspace}] Deleted {len(ids_to_delete)} relations for {entity_name}"
                 )
@@ -266,10 +422,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
                 logger.warning(
                     f"[{self.workspace}] Storage for {self.namespace} was updated by another process, reloading..."
                 )
-                self._client = NanoVectorDB(
-                    self.embedding_func.embedding_dim,
-                    storage_file=self._client_file_name,
-                )
+                self._reload_client()
                 # Reset update flag
                 self.storage_updated.value = False
                 return False  # Return error
@@ -279,6 +432,13 @@ class NanoVectorDBStorage(BaseVectorStorage):
             try:
                 # Save data to disk
                 self._client.save()
+                self._change_log.append(self._collect_changes())
+                if self._shared_matrix is not None:
+                    storage = get_client_storage(self._client)
+                    self._shared_matrix.publish(
+                        storage["matrix"], [dp["__id__"] for dp in storage["data"]]
+                    )
+                    self._attach_shared_matrix(self._client)
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.final_namespace)
                 # Reset own update flag to avoid self-reloading
@@ -363,6 +523,43 @@ class NanoVectorDBStorage(BaseVectorStorage):
 
         return vectors_dict
 
+    async def get_vector_matrix_by_ids(
+        self, ids: list[str]
+    ) -> tuple[list[str], np.ndarray]:
+        """Get vectors by their IDs as one contiguous float32 matrix
+
+        Vectors are decompressed straight into the matrix rows without
+        converting them to Python lists.
+
+        Args:
+            ids: List of unique identifiers
+
+        Returns:
+            Tuple of (found_ids, matrix) where row i of matrix is the vector of found_ids[i]
+        """
+        if not ids:
+            return [], np.empty(
+                (0, self.embedding_func.embedding_dim), dtype=np.float32
+            )
+
+        client = await self._get_client()
+        results = [
+            result
+            for result in client.get(ids)
+            if result and "vector" in result and "__id__" in result
+        ]
+
+        found_ids = []
+        matrix = np.empty(
+            (len(results), self.embedding_func.embedding_dim), dtype=np.float32
+        )
+        for result in results:
+            decompressed = zlib.decompress(base64.b64decode(result["vector"]))
+            matrix[len(found_ids)] = np.frombuffer(decompressed, dtype=np.float16)
+            found_ids.append(result["__id__"])
+
+        return found_ids, matrix
+
     async def drop(self) -> dict[str, str]:
         """Drop all vector data from storage and clean up resources
 
@@ -389,6 +586,11 @@ class NanoVectorDBStorage(BaseVectorStorage):
                     self.embedding_func.embedding_dim,
                     storage_file=self._client_file_name,
                 )
+                self._dirty_ids.clear()
+                if self._shared_matrix is not None:
+                    self._shared_matrix.clear()
+                # Other processes must reload the (now empty) storage
+                self._change_log.reset()
 
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.final_namespace)
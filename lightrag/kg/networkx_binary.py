@@ -0,0 +1,301 @@
+"""
+Compact binary on-disk format for NetworkX graphs.
+
+GraphML is slow to parse for large graphs, which makes startup, cross-process
+reloads and every `index_done_callback` of `NetworkXStorage` expensive. This
+format stores the graph as columnar tables:
+
+    - one table of interned strings (node ids and string attribute values)
+    - node ids as indexes into the string table
+    - edge endpoints as two columns of node indexes
+    - one column per node/edge attribute key
+
+Node ids, edge endpoints and string-only attribute columns (-1 for missing
+values) are string table indexes packed as little-endian int32 blobs, and
+integer or float columns are packed as int64/float64 blobs, so loading decodes
+them with `np.frombuffer` instead of parsing JSON. Columns mixing value types
+keep the raw values. Non-string columns carry a presence mask, so the round trip
+is lossless. Only the string table, the graph attributes and mixed columns go
+through JSON. Tables are serialized with `binary_tables` and optionally
+compressed with zlib or zstd.
+
+File layout: MAGIC (4 bytes) | version (1 byte) | codec (1 byte) | payload
+"""
+
+import gc
+import os
+import zlib
+from typing import Any
+
+import networkx as nx
+import numpy as np
+import pipmaster as pm
+
+from .binary_tables import decode_tables, encode_tables
+
+MAGIC = b"LRGB"
+FORMAT_VERSION = 2
+# Version 1 stored the integer columns as JSON lists
+_READABLE_VERSIONS = (1, FORMAT_VERSION)
+
+CODEC_NONE = 0
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+
+_CODECS = {"none": CODEC_NONE, "zlib": CODEC_ZLIB, "zstd": CODEC_ZSTD}
+
+_MISSING_STR = -1
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+
+def _get_zstd():
+    if not pm.is_installed("zstandard"):
+        pm.install("zstandard")
+    import zstandard  # type: ignore
+
+    return zstandard
+
+
+def _compress(payload: bytes, codec: int) -> bytes:
+    if codec == CODEC_ZLIB:
+        return zlib.compress(payload, 1)
+    if codec == CODEC_ZSTD:
+        return _get_zstd().ZstdCompressor(level=3).compress(payload)
+    return payload
+
+
+def _decompress(payload: bytes, codec: int) -> bytes:
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(payload)
+    if codec == CODEC_ZSTD:
+        return _get_zstd().ZstdDecompressor().decompress(payload)
+    if codec != CODEC_NONE:
+        raise ValueError(f"Unknown graph compression codec: {codec}")
+    return payload
+
+
+class _StringTable:
+    def __init__(self):
+        self.strings: list[str] = []
+        self._index: dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        idx = self._index.get(value)
+        if idx is None:
+            idx = len(self.strings)
+            self._index[value] = idx
+            self.strings.append(value)
+        return idx
+
+
+def _pack_ints(values, dtype: str = "<i4") -> bytes:
+    return np.asarray(values, dtype=dtype).tobytes()
+
+
+def _unpack_ints(data: bytes | list, dtype: str = "<i4") -> np.ndarray:
+    # Version 1 files keep integer columns as plain lists
+    if isinstance(data, list):
+        return np.asarray(data, dtype=np.int64)
+    return np.frombuffer(data, dtype=dtype)
+
+
+def _pack_mask(present: list[bool]) -> bytes | None:
+    return None if all(present) else np.asarray(present, dtype=np.bool_).tobytes()
+
+
+def _unpack_mask(data: bytes | list | None) -> np.ndarray | None:
+    if data is None:
+        return None
+    if isinstance(data, list):
+        mask = np.asarray(data, dtype=np.bool_)
+    else:
+        mask = np.frombuffer(data, dtype=np.bool_)
+    return None if mask.all() else mask
+
+
+def _encode_columns(
+    rows: list[dict[str, Any]], strings: _StringTable
+) -> dict[str, tuple[str, Any]]:
+    """Turn a list of attribute dicts into columns keyed by attribute name"""
+    keys: dict[str, None] = {}
+    for attrs in rows:
+        for key in attrs:
+            keys[key] = None
+
+    columns = {}
+    for key in keys:
+        values = [attrs.get(key) for attrs in rows]
+        if all(value is None or type(value) is str for value in values):
+            columns[key] = (
+                "s",
+                _pack_ints(
+                    [
+                        _MISSING_STR if value is None else strings.intern(value)
+                        for value in values
+                    ]
+                ),
+            )
+            continue
+
+        # Missing and None values cannot be told apart in "v" columns, so all
+        # non-string columns keep a presence mask (None when every row has a value)
+        present = [key in attrs for attrs in rows]
+        kinds = {type(value) for value, has in zip(values, present) if has}
+        if kinds == {int} and all(
+            _INT64_MIN <= value <= _INT64_MAX for value in values if type(value) is int
+        ):
+            data = [value if type(value) is int else 0 for value in values]
+            columns[key] = ("i", [_pack_ints(data, "<i8"), _pack_mask(present)])
+        elif kinds == {float}:
+            data = [value if type(value) is float else 0.0 for value in values]
+            columns[key] = (
+                "f",
+                [np.asarray(data, dtype="<f8").tobytes(), _pack_mask(present)],
+            )
+        else:
+            columns[key] = ("v", [values, _pack_mask(present)])
+    return columns
+
+
+def _decode_columns(
+    columns: dict[str, tuple[str, Any]], count: int, strings: np.ndarray
+) -> list[dict[str, Any]]:
+    full: dict[str, list] = {}
+    partial: list[tuple[str, list, np.ndarray]] = []
+    for key, (kind, data) in columns.items():
+        if kind == "s":
+            indexes = _unpack_ints(data)
+            values = strings[np.maximum(indexes, 0)].tolist()
+            mask = indexes != _MISSING_STR
+            mask = None if mask.all() else mask
+        else:
+            data, present = data
+            if kind == "i":
+                values = _unpack_ints(data, "<i8").tolist()
+            elif kind == "f":
+                values = np.frombuffer(data, dtype="<f8").tolist()
+            else:
+                values = data
+            mask = _unpack_mask(present)
+        if mask is None:
+            full[key] = values
+        else:
+            partial.append((key, values, mask))
+
+    # Build the dicts of complete columns in one pass, then fill in the others
+    if full:
+        keys = tuple(full)
+        rows = [dict(zip(keys, row)) for row in zip(*full.values())]
+    else:
+        rows = [{} for _ in range(count)]
+    for key, values, mask in partial:
+        for idx in np.flatnonzero(mask).tolist():
+            rows[idx][key] = values[idx]
+    return rows
+
+
+def encode_graph(graph: nx.Graph, compression: str = "none") -> bytes:
+    """Serialize a graph to the binary format
+
+    Args:
+        graph: Graph to serialize (node ids must be strings)
+        compression: "none", "zlib" or "zstd"
+
+    Returns:
+        bytes: Encoded graph
+    """
+    codec = _CODECS.get(compression.lower())
+    if codec is None:
+        raise ValueError(f"Unsupported graph compression: {compression}")
+
+    strings = _StringTable()
+    node_ids = list(graph.nodes())
+    node_index = {node: strings.intern(node) for node in node_ids}
+
+    sources = []
+    targets = []
+    edge_rows = []
+    for u, v, data in graph.edges(data=True):
+        sources.append(node_index[u])
+        targets.append(node_index[v])
+        edge_rows.append(data)
+
+    tables = {
+        "directed": graph.is_directed(),
+        "graph": dict(graph.graph),
+        "nodes": _pack_ints([node_index[node] for node in node_ids]),
+        "node_columns": _encode_columns(
+            [graph.nodes[node] for node in node_ids], strings
+        ),
+        "sources": _pack_ints(sources),
+        "targets": _pack_ints(targets),
+        "edge_columns": _encode_columns(edge_rows, strings),
+    }
+    # The string table is filled while encoding the columns, add it last
+    tables["strings"] = strings.strings
+
+    payload = encode_tables(tables)
+    return MAGIC + bytes([FORMAT_VERSION, codec]) + _compress(payload, codec)
+
+
+def decode_graph(data: bytes) -> nx.Graph:
+    """Deserialize a graph written by `encode_graph`"""
+    if data[:4] != MAGIC:
+        raise ValueError("Not a LightRAG binary graph file")
+    version, codec = data[4], data[5]
+    if version not in _READABLE_VERSIONS:
+        raise ValueError(f"Unsupported binary graph format version: {version}")
+
+    tables = decode_tables(_decompress(data[6:], codec))
+    # Building the graph allocates a few dicts per node and edge, none of which
+    # form reference cycles, so skip the collector passes they would trigger
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _build_graph(tables)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def _build_graph(tables: dict[str, Any]) -> nx.Graph:
+    strings = np.array(tables["strings"] or [""], dtype=object)
+
+    graph = nx.DiGraph() if tables["directed"] else nx.Graph()
+    graph.graph.update(tables["graph"])
+
+    node_ids = strings[_unpack_ints(tables["nodes"])].tolist()
+    node_rows = _decode_columns(tables["node_columns"], len(node_ids), strings)
+    graph.add_nodes_from(zip(node_ids, node_rows))
+
+    sources = strings[_unpack_ints(tables["sources"])].tolist()
+    targets = strings[_unpack_ints(tables["targets"])].tolist()
+    edge_rows = _decode_columns(tables["edge_columns"], len(sources), strings)
+    graph.add_edges_from(zip(sources, targets, edge_rows))
+    return graph
+
+
+def write_graph_binary(graph: nx.Graph, file_name: str, compression: str = "none"):
+    """Atomically write a graph to file_name in the binary format"""
+    data = encode_graph(graph, compression)
+    tmp_file = f"{file_name}.tmp"
+    with open(tmp_file, "wb") as f:
+        f.write(data)
+    os.replace(tmp_file, file_name)
+
+
+def read_graph_binary(file_name: str) -> nx.Graph:
+    """Read a graph written by `write_graph_binary`"""
+    with open(file_name, "rb") as f:
+        return decode_graph(f.read())
+
+
+def graphml_to_binary(graphml_file: str, binary_file: str, compression: str = "none"):
+    """Convert a GraphML file to the binary format"""
+    write_graph_binary(nx.read_graphml(graphml_file), binary_file, compression)
+
+
+def binary_to_graphml(binary_file: str, graphml_file: str):
+    """Convert a binary graph file back to GraphML"""
+    nx.write_graphml(read_graph_binary(binary_file), graphml_file)
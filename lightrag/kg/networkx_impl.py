@@ -3,15 +3,13 @@ from dataclasses import dataclass
 from typing import final
 
 from lightrag.types import KnowledgeGraph, KnowledgeGraphNode, KnowledgeGraphEdge
-from lightrag.utils import logger
+from lightrag.utils import logger, get_env_value
 from lightrag.base import BaseGraphStorage
-from lightrag.constants import GRAPH_FIELD_SEP
 import networkx as nx
-from .shared_storage import (
-    get_storage_lock,
-    get_update_flag,
-    set_all_update_flags,
-)
+from .networkx_binary import read_graph_binary, write_graph_binary
+from .label_index import LabelIndex, DegreeIndex
+from .file_graph_storage import FileGraphStorageMixin
+from .shared_storage import set_all_update_flags
 
 from dotenv import load_dotenv
 
@@ -20,22 +18,29 @@ from dotenv import load_dotenv
 # the OS environment variables take precedence over the .env file
 load_dotenv(dotenv_path=".env", override=False)
 
+GRAPH_BINARY_SUFFIX = ".nxb"
+
 
 @final
 @dataclass
-class NetworkXStorage(BaseGraphStorage):
+class NetworkXStorage(FileGraphStorageMixin, BaseGraphStorage):
     @staticmethod
     def load_nx_graph(file_name) -> nx.Graph:
         if os.path.exists(file_name):
+            if file_name.endswith(GRAPH_BINARY_SUFFIX):
+                return read_graph_binary(file_name)
             return nx.read_graphml(file_name)
         return None
 
     @staticmethod
-    def write_nx_graph(graph: nx.Graph, file_name, workspace="_"):
+    def write_nx_graph(graph: nx.Graph, file_name, workspace="_", compression="none"):
         logger.info(
             f"[{workspace}] Writing graph with {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges"
         )
-        nx.write_graphml(graph, file_name)
+        if file_name.endswith(GRAPH_BINARY_SUFFIX):
+            write_graph_binary(graph, file_name, compression)
+        else:
+            nx.write_graphml(graph, file_name)
 
     def __post_init__(self):
         working_dir = self.global_config["working_dir"]
@@ -53,46 +58,149 @@ class NetworkXStorage(BaseGraphStorage):
         self._graphml_xml_file = os.path.join(
             workspace_dir, f"graph_{self.namespace}.graphml"
         )
+        self._graph_binary_file = os.path.join(
+            workspace_dir, f"graph_{self.namespace}{GRAPH_BINARY_SUFFIX}"
+        )
+        # On-disk format: graphml (default) or binary (see networkx_binary.py)
+        graph_format = get_env_value("NETWORKX_GRAPH_FORMAT", "graphml").lower()
+        self._graph_compression = get_env_value("NETWORKX_GRAPH_COMPRESSION", "none")
+        self._graph_file = (
+            self._graph_binary_file
+            if graph_format == "binary"
+            else self._graphml_xml_file
+        )
         self._storage_lock = None
         self.storage_updated = None
         self._graph = None
+        # Inverted index: chunk id -> node ids / (sorted) edge keys referencing it
+        self._chunk_to_nodes: dict[str, set[str]] = {}
+        self._chunk_to_edges: dict[str, set[tuple[str, str]]] = {}
+        # Label search and degree ranking indexes for the WebUI
+        self._label_index = LabelIndex()
+        self._degree_index = DegreeIndex()
+        # Nodes and (sorted) edge keys changed since the last persist, written to
+        # the change log so other workers can replay them instead of reloading
+        self._change_log = None
+        self._dirty_nodes: set[str] = set()
+        self._dirty_edges: set[tuple[str, str]] = set()
 
         # Load initial graph
-        preloaded_graph = NetworkXStorage.load_nx_graph(self._graphml_xml_file)
+        preloaded_graph = NetworkXStorage.load_nx_graph(self._graph_file)
+        if (
+            preloaded_graph is None
+            and self._graph_file == self._graph_binary_file
+            and os.path.exists(self._graphml_xml_file)
+        ):
+            # Import the existing GraphML file once when switching to binary format
+            preloaded_graph = NetworkXStorage.load_nx_graph(self._graphml_xml_file)
+            NetworkXStorage.write_nx_graph(
+                preloaded_graph,
+                self._graph_binary_file,
+                self.workspace,
+                self._graph_compression,
+            )
+            logger.info(
+                f"[{self.workspace}] Imported {self._graphml_xml_file} into binary graph file {self._graph_binary_file}"
+            )
         if preloaded_graph is not None:
             logger.info(
-                f"[{self.workspace}] Loaded graph from {self._graphml_xml_file} with {preloaded_graph.number_of_nodes()} nodes, {preloaded_graph.number_of_edges()} edges"
+                f"[{self.workspace}] Loaded graph from {self._graph_file} with {preloaded_graph.number_of_nodes()} nodes, {preloaded_graph.number_of_edges()} edges"
             )
         else:
             logger.info(
-                f"[{self.workspace}] Created new empty graph fiel: {self._graphml_xml_file}"
+                f"[{self.workspace}] Created new empty graph fiel: {self._graph_file}"
             )
-        self._graph = preloaded_graph or nx.Graph()
-
-    async def initialize(self):
-        """Initialize storage data"""
-        # Get the update flag for cross-process update notification
-        self.storage_updated = await get_update_flag(self.final_namespace)
-        # Get the storage lock for use in other methods
-        self._storage_lock = get_storage_lock()
-
-    async def _get_graph(self):
-        """Check if the storage should be reloaded"""
-        # Acquire lock to prevent concurrent read and write
-        async with self._storage_lock:
-            # Check if data needs to be reloaded
-            if self.storage_updated.value:
-                logger.info(
-                    f"[{self.workspace}] Process {os.getpid()} reloading graph {self._graphml_xml_file} due to modifications by another process"
-                )
-                # Reload data
-                self._graph = (
-                    NetworkXStorage.load_nx_graph(self._graphml_xml_file) or nx.Graph()
-                )
-                # Reset update flag
-                self.storage_updated.value = False
+        self._swap_graph(preloaded_graph or nx.Graph())
+
+    def _load_graph_file(self) -> nx.Graph:
+        return NetworkXStorage.load_nx_graph(self._graph_file) or nx.Graph()
+
+    @staticmethod
+    def _get_node_data(graph: nx.Graph, node_id: str) -> dict | None:
+        return graph.nodes[node_id] if graph.has_node(node_id) else None
+
+    @staticmethod
+    def _get_edge_data(graph: nx.Graph, source: str, target: str) -> dict | None:
+        return graph.get_edge_data(source, target)
+
+    @staticmethod
+    def _put_node(
+        graph: nx.Graph, node_id: str, node_data: dict, replace: bool
+    ) -> None:
+        if replace and graph.has_node(node_id):
+            graph.nodes[node_id].clear()
+        graph.add_node(node_id, **node_data)
+
+    @staticmethod
+    def _put_edge(
+        graph: nx.Graph, source: str, target: str, edge_data: dict, replace: bool
+    ) -> None:
+        if replace and graph.has_edge(source, target):
+            graph.edges[source, target].clear()
+        graph.add_edge(source, target, **edge_data)
+
+    def _index_new_node(self, node_id: str) -> None:
+        self._label_index.add(str(node_id))
+        self._degree_index.add_node(node_id)
+
+    def _index_new_edge(self, source: str, target: str) -> None:
+        self._degree_index.adjust(source, 1)
+        self._degree_index.adjust(target, 1)
+
+    def _unindex_node(self, graph: nx.Graph, node_id: str) -> None:
+        """Remove a node and its incident edges from all indexes"""
+        self._unindex_chunks(
+            self._chunk_to_nodes, graph.nodes[node_id].get("source_id"), node_id
+        )
+        for source, target, edge_data in graph.edges(node_id, data=True):
+            self._unindex_chunks(
+                self._chunk_to_edges,
+                edge_data.get("source_id"),
+                self._edge_key(source, target),
+            )
+            if target != node_id:
+                self._degree_index.adjust(target, -1)
+        self._label_index.remove(str(node_id))
+        self._degree_index.remove_node(node_id)
+
+    def _build_indexes(self, graph: nx.Graph) -> dict:
+        """Chunk, label and degree indexes of graph"""
+        chunk_to_nodes: dict[str, set[str]] = {}
+        chunk_to_edges: dict[str, set[tuple[str, str]]] = {}
+        for node_id, node_data in graph.nodes(data=True):
+            self._index_chunks(chunk_to_nodes, node_data.get("source_id"), node_id)
+        for source, target, edge_data in graph.edges(data=True):
+            self._index_chunks(
+                chunk_to_edges,
+                edge_data.get("source_id"),
+                self._edge_key(source, target),
+            )
+        return {
+            "_label_index": LabelIndex(str(node) for node in graph.nodes()),
+            "_degree_index": DegreeIndex(graph.degree()),
+            "_chunk_to_nodes": chunk_to_nodes,
+            "_chunk_to_edges": chunk_to_edges,
+        }
+
+    def _remove_node(self, graph: nx.Graph, node_id: str) -> None:
+        self._unindex_node(graph, node_id)
+        graph.remove_node(node_id)
+
+    def _remove_edge(self, graph: nx.Graph, source: str, target: str) -> None:
+        self._unindex_chunks(
+            self._chunk_to_edges,
+            graph.edges[source, target].get("source_id"),
+            self._edge_key(source, target),
+        )
+        graph.remove_edge(source, target)
+        self._degree_index.adjust(source, -1)
+        self._degree_index.adjust(target, -1)
 
-            return self._graph
+    def _mark_node_deleted(self, graph: nx.Graph, node_id: str) -> None:
+        # Incident edges disappear with the node
+        self._dirty_nodes.add(node_id)
+        for source, target in graph.edges(node_id):
+            self._dirty_edges.add(self._edge_key(source, target))
 
     async def has_node(self, node_id: str) -> bool:
         graph = await self._get_graph()
@@ -136,7 +244,8 @@ class NetworkXStorage(BaseGraphStorage):
            KG-storage-log should be used to avoid data corruption
         """
         graph = await self._get_graph()
-        graph.add_node(node_id, **node_data)
+        self._set_node(graph, node_id, node_data)
+        self._dirty_nodes.add(node_id)
 
     async def upsert_edge(
         self, source_node_id: str, target_node_id: str, edge_data: dict[str, str]
@@ -148,7 +257,11 @@ class NetworkXStorage(BaseGraphStorage):
            KG-storage-log should be used to avoid data corruption
         """
         graph = await self._get_graph()
-        graph.add_edge(source_node_id, target_node_id, **edge_data)
+        for node_id in (source_node_id, target_node_id):
+            if not graph.has_node(node_id):
+                self._dirty_nodes.add(node_id)
+        self._set_edge(graph, source_node_id, target_node_id, edge_data)
+        self._dirty_edges.add(self._edge_key(source_node_id, target_node_id))
 
     async def delete_node(self, node_id: str) -> None:
         """
@@ -159,7 +272,8 @@ class NetworkXStorage(BaseGraphStorage):
         """
         graph = await self._get_graph()
         if graph.has_node(node_id):
-            graph.remove_node(node_id)
+            self._mark_node_deleted(graph, node_id)
+            self._remove_node(graph, node_id)
             logger.debug(f"[{self.workspace}] Node {node_id} deleted from the graph")
         else:
             logger.warning(
@@ -180,7 +294,8 @@ class NetworkXStorage(BaseGraphStorage):
         graph = await self._get_graph()
         for node in nodes:
             if graph.has_node(node):
-                graph.remove_node(node)
+                self._mark_node_deleted(graph, node)
+                self._remove_node(graph, node)
 
     async def remove_edges(self, edges: list[tuple[str, str]]):
         """Delete multiple edges
@@ -196,7 +311,8 @@ class NetworkXStorage(BaseGraphStorage):
         graph = await self._get_graph()
         for source, target in edges:
             if graph.has_edge(source, target):
-                graph.remove_edge(source, target)
+                self._dirty_edges.add(self._edge_key(source, target))
+                self._remove_edge(graph, source, target)
 
     async def get_all_labels(self) -> list[str]:
         """
@@ -222,14 +338,10 @@ class NetworkXStorage(BaseGraphStorage):
         Returns:
             List of labels sorted by degree (highest first)
         """
-        graph = await self._get_graph()
+        await self._get_graph()
 
-        # Get degrees of all nodes and sort by degree descending
-        degrees = dict(graph.degree())
-        sorted_nodes = sorted(degrees.items(), key=lambda x: x[1], reverse=True)
-
-        # Return top labels limited by the specified limit
-        popular_labels = [str(node) for node, _ in sorted_nodes[:limit]]
+        # Degree index keeps nodes bucketed by degree, no full sort needed
+        popular_labels = [str(node) for node, _ in self._degree_index.top(limit)]
 
         logger.debug(
             f"[{self.workspace}] Retrieved {len(popular_labels)} popular labels (limit: {limit})"
@@ -248,44 +360,8 @@ class NetworkXStorage(BaseGraphStorage):
         Returns:
             List of matching labels sorted by relevance
         """
-        graph = await self._get_graph()
-        query_lower = query.lower().strip()
-
-        if not query_lower:
-            return []
-
-        # Collect matching nodes with relevance scores
-        matches = []
-        for node in graph.nodes():
-            node_str = str(node)
-            node_lower = node_str.lower()
-
-            # Skip if no match
-            if query_lower not in node_lower:
-                continue
-
-            # Calculate relevance score
-            # Exact match gets highest score
-            if node_lower == query_lower:
-                score = 1000
-            # Prefix match gets high score
-            elif node_lower.startswith(query_lower):
-                score = 500
-            # Contains match gets base score, with bonus for shorter strings
-            else:
-                # Shorter strings with matches are more relevant
-                score = 100 - len(node_str)
-                # Bonus for word boundary matches
-                if f" {query_lower}" in node_lower or f"_{query_lower}" in node_lower:
-                    score += 50
-
-            matches.append((node_str, score))
-
-        # Sort by relevance score (desc) then alphabetically
-        matches.sort(key=lambda x: (-x[1], x[0]))
-
-        # Return top matches limited by the specified limit
-        search_results = [match[0] for match in matches[:limit]]
+        await self._get_graph()
+        search_results = self._label_index.search(query, limit)
 
         logger.debug(
             f"[{self.workspace}] Search query '{query}' returned {len(search_results)} results (limit: {limit})"
@@ -324,19 +400,15 @@ class NetworkXStorage(BaseGraphStorage):
 
         # Handle special case for "*" label
         if node_label == "*":
-            # Get degrees of all nodes
-            degrees = dict(graph.degree())
-            # Sort nodes by degree in descending order and take top max_nodes
-            sorted_nodes = sorted(degrees.items(), key=lambda x: x[1], reverse=True)
-
             # Check if graph is truncated
-            if len(sorted_nodes) > max_nodes:
+            if graph.number_of_nodes() > max_nodes:
                 result.is_truncated = True
                 logger.info(
-                    f"[{self.workspace}] Graph truncated: {len(sorted_nodes)} nodes found, limited to {max_nodes}"
+                    f"[{self.workspace}] Graph truncated: {graph.number_of_nodes()} nodes found, limited to {max_nodes}"
                 )
 
-            limited_nodes = [node for node, _ in sorted_nodes[:max_nodes]]
+            # Take top max_nodes nodes by degree from the degree index
+            limited_nodes = [node for node, _ in self._degree_index.top(max_nodes)]
             # Create subgraph with the highest degree nodes
             subgraph = graph.subgraph(limited_nodes)
         else:
@@ -471,30 +543,28 @@ class NetworkXStorage(BaseGraphStorage):
         return result
 
     async def get_nodes_by_chunk_ids(self, chunk_ids: list[str]) -> list[dict]:
-        chunk_ids_set = set(chunk_ids)
         graph = await self._get_graph()
+        node_ids = set()
+        for chunk_id in chunk_ids:
+            node_ids.update(self._chunk_to_nodes.get(chunk_id, ()))
         matching_nodes = []
-        for node_id, node_data in graph.nodes(data=True):
-            if "source_id" in node_data:
-                node_source_ids = set(node_data["source_id"].split(GRAPH_FIELD_SEP))
-                if not node_source_ids.isdisjoint(chunk_ids_set):
-                    node_data_with_id = node_data.copy()
-                    node_data_with_id["id"] = node_id
-                    matching_nodes.append(node_data_with_id)
+        for node_id in node_ids:
+            node_data_with_id = graph.nodes[node_id].copy()
+            node_data_with_id["id"] = node_id
+            matching_nodes.append(node_data_with_id)
         return matching_nodes
 
     async def get_edges_by_chunk_ids(self, chunk_ids: list[str]) -> list[dict]:
-        chunk_ids_set = set(chunk_ids)
         graph = await self._get_graph()
+        edge_keys = set()
+        for chunk_id in chunk_ids:
+            edge_keys.update(self._chunk_to_edges.get(chunk_id, ()))
         matching_edges = []
-        for u, v, edge_data in graph.edges(data=True):
-            if "source_id" in edge_data:
-                edge_source_ids = set(edge_data["source_id"].split(GRAPH_FIELD_SEP))
-                if not edge_source_ids.isdisjoint(chunk_ids_set):
-                    edge_data_with_nodes = edge_data.copy()
-                    edge_data_with_nodes["source"] = u
-                    edge_data_with_nodes["target"] = v
-                    matching_edges.append(edge_data_with_nodes)
+        for u, v in edge_keys:
+            edge_data_with_nodes = graph.edges[u, v].copy()
+            edge_data_with_nodes["source"] = u
+            edge_data_with_nodes["target"] = v
+            matching_edges.append(edge_data_with_nodes)
         return matching_edges
 
     async def get_all_nodes(self) -> list[dict]:
@@ -535,9 +605,7 @@ class NetworkXStorage(BaseGraphStorage):
                 logger.info(
                     f"[{self.workspace}] Graph was updated by another process, reloading..."
                 )
-                self._graph = (
-                    NetworkXStorage.load_nx_graph(self._graphml_xml_file) or nx.Graph()
-                )
+                self._reload_graph()
                 # Reset update flag
                 self.storage_updated.value = False
                 return False  # Return error
@@ -547,8 +615,12 @@ class NetworkXStorage(BaseGraphStorage):
             try:
                 # Save data to disk
                 NetworkXStorage.write_nx_graph(
-                    self._graph, self._graphml_xml_file, self.workspace
+                    self._graph,
+                    self._graph_file,
+                    self.workspace,
+                    self._graph_compression,
                 )
+                self._change_log.append(self._collect_changes())
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.final_namespace)
                 # Reset own update flag to avoid self-reloading
@@ -576,20 +648,25 @@ class NetworkXStorage(BaseGraphStorage):
         """
         try:
             async with self._storage_lock:
-                # delete _client_file_name
-                if os.path.exists(self._graphml_xml_file):
-                    os.remove(self._graphml_xml_file)
-                self._graph = nx.Graph()
+                # delete graph files of both formats so GraphML is not re-imported
+                for graph_file in (self._graphml_xml_file, self._graph_binary_file):
+                    if os.path.exists(graph_file):
+                        os.remove(graph_file)
+                self._swap_graph(nx.Graph())
+                self._dirty_nodes.clear()
+                self._dirty_edges.clear()
+                # Other processes must reload the (now empty) graph
+                self._change_log.reset()
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.final_namespace)
                 # Reset own update flag to avoid self-reloading
                 self.storage_updated.value = False
                 logger.info(
-                    f"[{self.workspace}] Process {os.getpid()} drop graph file:{self._graphml_xml_file}"
+                    f"[{self.workspace}] Process {os.getpid()} drop graph file:{self._graph_file}"
                 )
             return {"status": "success", "message": "data dropped"}
         except Exception as e:
             logger.error(
-                f"[{self.workspace}] Error dropping graph file:{self._graphml_xml_file}: {e}"
+                f"[{self.workspace}] Error dropping graph file:{self._graph_file}: {e}"
             )
             return {"status": "error", "message": str(e)}
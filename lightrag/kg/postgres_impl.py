@@ -2208,6 +2208,47 @@ class PGVectorStorage(BaseVectorStorage):
             )
             return {}
 
+    async def similarity_by_ids(
+        self, query_embedding: list[float], ids: list[str], top_k: int
+    ) -> list[tuple[str, float]] | None:
+        """Rank the given IDs by cosine similarity using pgvector
+
+        Args:
+            query_embedding: Query vector
+            ids: Candidate IDs to restrict the search to
+            top_k: Number of results to return
+
+        Returns:
+            List of (id, similarity) sorted by similarity descending, or None on error
+        """
+        if not ids or top_k <= 0:
+            return []
+
+        table_name = namespace_to_table_name(self.namespace)
+        if not table_name:
+            logger.error(
+                f"[{self.workspace}] Unknown namespace for vector lookup: {self.namespace}"
+            )
+            return None
+
+        embedding_string = ",".join(map(str, query_embedding))
+        ids_str = ",".join([f"'{id}'" for id in ids])
+        query = f"""SELECT id, 1 - (content_vector <=> '[{embedding_string}]'::vector) AS similarity
+                    FROM {table_name}
+                    WHERE workspace=$1 AND id IN ({ids_str})
+                    ORDER BY content_vector <=> '[{embedding_string}]'::vector
+                    LIMIT $2"""
+        params = {"workspace": self.workspace, "top_k": top_k}
+
+        try:
+            results = await self.db.query(query, list(params.values()), multirows=True)
+            return [(result["id"], float(result["similarity"])) for result in results]
+        except Exception as e:
+            logger.error(
+                f"[{self.workspace}] Error ranking vectors by IDs in {self.namespace}: {e}"
+            )
+            return None
+
     async def drop(self) -> dict[str, str]:
         """Drop the storage"""
         async with get_storage_lock():
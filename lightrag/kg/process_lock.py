@@ -0,0 +1,161 @@
+"""
+Cross-process locks built on fcntl byte-range locks.
+
+With several workers, shared_storage used to create every lock through
+`multiprocessing.Manager()`, so each acquire and release was an IPC round trip
+to the manager process. Here every lock is one byte of a lock file created by
+the master process before forking: acquiring it is a single `fcntl` system
+call, and the kernel drops the locks of a worker that dies.
+
+Keyed locks are hash-striped over a fixed number of byte ranges, so no shared
+registry has to be updated when a key is used for the first time. Two keys
+falling into the same stripe only share the cross-process lock; callers must
+acquire stripes in ascending order (see `ProcessLockFile.stripes_for`).
+
+fcntl locks are owned by the process, so a lock held by one coroutine is also
+"held" by every other coroutine of the same process. Stripes therefore count
+local holders and only touch the file lock on the first acquire and the last
+release; exclusion between coroutines of a process is left to the asyncio locks
+that UnifiedLock already takes first.
+"""
+
+import asyncio
+import errno
+import os
+import tempfile
+import zlib
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Polling interval bounds while another process holds a lock (seconds)
+_MIN_WAIT = 0.0005
+_MAX_WAIT = 0.02
+
+
+def process_locks_supported() -> bool:
+    """Whether fcntl byte-range locks are available on this platform"""
+    return fcntl is not None
+
+
+class ProcessLock:
+    """One byte-range lock of a ProcessLockFile
+
+    Provides `acquire`/`release`/`locked` like multiprocessing.Lock, plus
+    `acquire_async`, which polls instead of blocking the event loop.
+    """
+
+    def __init__(self, lock_file: "ProcessLockFile", offset: int, name: str):
+        self._lock_file = lock_file
+        self._offset = offset
+        self.name = name
+        # Number of local holders; the file lock is held while > 0
+        self._count = 0
+
+    def _try_lock(self) -> bool:
+        try:
+            fcntl.lockf(
+                self._lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB, 1, self._offset
+            )
+            return True
+        except OSError as e:
+            if e.errno in (errno.EACCES, errno.EAGAIN):
+                return False
+            raise
+
+    def acquire(self, blocking: bool = True) -> bool:
+        if self._count == 0:
+            if blocking:
+                fcntl.lockf(self._lock_file.fileno(), fcntl.LOCK_EX, 1, self._offset)
+            elif not self._try_lock():
+                return False
+        self._count += 1
+        return True
+
+    async def acquire_async(self) -> bool:
+        wait = _MIN_WAIT
+        while self._count == 0 and not self._try_lock():
+            await asyncio.sleep(wait)
+            wait = min(wait * 2, _MAX_WAIT)
+        self._count += 1
+        return True
+
+    def release(self) -> None:
+        if self._count <= 0:
+            raise RuntimeError(f"Release of unlocked process lock '{self.name}'")
+        self._count -= 1
+        if self._count == 0:
+            fcntl.lockf(self._lock_file.fileno(), fcntl.LOCK_UN, 1, self._offset)
+
+    def locked(self) -> bool:
+        if self._count > 0:
+            return True
+        if self._try_lock():
+            fcntl.lockf(self._lock_file.fileno(), fcntl.LOCK_UN, 1, self._offset)
+            return False
+        return True
+
+    def held(self) -> bool:
+        """Whether the current process holds the lock"""
+        return self._count > 0
+
+
+class ProcessLockFile:
+    """Named locks and hash-striped keyed locks in one lock file
+
+    Create it in the master process before forking workers; forked workers
+    inherit the open file and lock byte ranges of the same inode.
+
+    Args:
+        names: Names of the global locks, each gets its own byte
+        stripes: Number of byte ranges shared by all keyed locks
+    """
+
+    def __init__(self, names: List[str], stripes: int = 1024):
+        fd, self._path = tempfile.mkstemp(prefix="lightrag_locks_", suffix=".lock")
+        self._fd: Optional[int] = fd
+        self._owner_pid = os.getpid()
+        self._named: Dict[str, ProcessLock] = {
+            name: ProcessLock(self, offset, name) for offset, name in enumerate(names)
+        }
+        self._stripes = [
+            ProcessLock(self, len(names) + i, f"stripe:{i}") for i in range(stripes)
+        ]
+
+    def fileno(self) -> int:
+        if self._fd is None:
+            raise RuntimeError("Process lock file is closed")
+        return self._fd
+
+    def get(self, name: str) -> ProcessLock:
+        return self._named[name]
+
+    def stripe_index(self, key: str) -> int:
+        # crc32 is stable across processes, unlike hash() of str
+        return zlib.crc32(key.encode("utf-8")) % len(self._stripes)
+
+    def stripes_for(self, keys: List[str]) -> List[ProcessLock]:
+        """Distinct stripes of keys in the order they must be acquired"""
+        return [self._stripes[i] for i in sorted({self.stripe_index(k) for k in keys})]
+
+    def held_stripes(self) -> int:
+        return sum(1 for stripe in self._stripes if stripe.held())
+
+    @property
+    def stripe_count(self) -> int:
+        return len(self._stripes)
+
+    def close(self) -> None:
+        """Close the file; the process that created it also deletes it"""
+        if self._fd is None:
+            return
+        os.close(self._fd)
+        self._fd = None
+        if os.getpid() == self._owner_pid:
+            try:
+                os.remove(self._path)
+            except OSError:
+                pass
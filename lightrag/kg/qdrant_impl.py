@@ -463,6 +463,44 @@ class QdrantVectorDBStorage(BaseVectorStorage):
             )
             return {}
 
+    async def similarity_by_ids(
+        self, query_embedding: list[float], ids: list[str], top_k: int
+    ) -> list[tuple[str, float]] | None:
+        """Rank the given IDs by cosine similarity with a Qdrant search restricted to the IDs
+
+        Args:
+            query_embedding: Query vector
+            ids: Candidate IDs to restrict the search to
+            top_k: Number of results to return
+
+        Returns:
+            List of (id, similarity) sorted by similarity descending, or None on error
+        """
+        if not ids or top_k <= 0:
+            return []
+
+        try:
+            qdrant_ids = [compute_mdhash_id_for_qdrant(id) for id in ids]
+            results = self._client.search(
+                collection_name=self.final_namespace,
+                query_vector=query_embedding,
+                query_filter=models.Filter(
+                    must=[models.HasIdCondition(has_id=qdrant_ids)]
+                ),
+                limit=top_k,
+                with_payload=["id"],
+            )
+            return [
+                (point.payload.get("id"), float(point.score))
+                for point in results
+                if point.payload and point.payload.get("id")
+            ]
+        except Exception as e:
+            logger.error(
+                f"[{self.workspace}] Error ranking vectors by IDs in {self.namespace}: {e}"
+            )
+            return None
+
     async def drop(self) -> dict[str, str]:
         """Drop all vector data from storage and clean up resources
 
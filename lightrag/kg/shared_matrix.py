@@ -0,0 +1,107 @@
+"""
+Vector matrices shared by all workers through memory-mapped files.
+
+Each worker of a multi-worker server used to hold a private copy of every
+vector matrix. With shared matrices the persisting worker publishes the matrix
+as a new generation file (`<storage file>.matrix.<generation>.npy`, plus the
+row ids in `.ids`) and points `<storage file>.matrix` at it. Workers map the
+current generation copy-on-write, so the pages live once in the OS page cache
+no matter how many workers there are. The sharing only lasts while a worker
+does not write: NanoVectorDB rebuilds the whole matrix on every upsert or
+delete (including replayed changes), so a worker that writes holds a private
+copy of the whole matrix until its rows match a published generation again,
+after its own persist or once it has caught up with another worker's.
+
+Older generations are deleted after a publish. Workers still mapping them keep
+a valid mapping on POSIX systems; where the file cannot be deleted while mapped
+it is cleaned up by a later publish.
+"""
+
+import glob
+import json
+import os
+
+import numpy as np
+
+from lightrag.utils import logger
+
+
+class SharedMatrixFile:
+    """Generation-versioned float32 matrix file next to a storage file
+
+    All methods must be called while holding the storage lock of the namespace.
+    """
+
+    def __init__(self, storage_file: str):
+        self._pointer_file = f"{storage_file}.matrix"
+
+    def _generation_file(self, generation: int, suffix: str) -> str:
+        return f"{self._pointer_file}.{generation}{suffix}"
+
+    def current_generation(self) -> int:
+        try:
+            with open(self._pointer_file, "r", encoding="utf-8") as f:
+                return int(f.read().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def publish(self, matrix: np.ndarray, ids: list[str]) -> int:
+        """Write matrix (row i belongs to ids[i]) as a new generation
+
+        Returns:
+            The new generation number
+        """
+        generation = self.current_generation() + 1
+        np.save(
+            self._generation_file(generation, ".npy"),
+            np.ascontiguousarray(matrix, dtype=np.float32),
+        )
+        with open(
+            self._generation_file(generation, ".ids"), "w", encoding="utf-8"
+        ) as f:
+            json.dump(list(ids), f, ensure_ascii=False)
+
+        tmp_file = f"{self._pointer_file}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            f.write(str(generation))
+        os.replace(tmp_file, self._pointer_file)
+
+        self._remove_generations(keep=generation)
+        return generation
+
+    def open(self) -> tuple[list[str], np.ndarray] | None:
+        """Map the current generation copy-on-write
+
+        Returns:
+            (ids, matrix), or None if no generation was published or it is empty
+        """
+        generation = self.current_generation()
+        if generation == 0:
+            return None
+        try:
+            with open(self._generation_file(generation, ".ids"), encoding="utf-8") as f:
+                ids = json.load(f)
+            if not ids:
+                return None
+            matrix = np.load(self._generation_file(generation, ".npy"), mmap_mode="c")
+        except (OSError, ValueError, EOFError) as e:
+            logger.warning(f"Failed to map shared matrix {self._pointer_file}: {e}")
+            return None
+        return ids, matrix
+
+    def _remove_generations(self, keep: int | None = None) -> None:
+        for file_name in glob.glob(f"{glob.escape(self._pointer_file)}.*"):
+            generation = file_name[len(self._pointer_file) + 1 :].split(".", 1)[0]
+            if not generation.isdigit() or int(generation) == keep:
+                continue
+            try:
+                os.remove(file_name)
+            except OSError:
+                # Still mapped on platforms that forbid deleting mapped files
+                pass
+
+    def clear(self) -> None:
+        """Remove all generations and the pointer file"""
+        self._remove_generations()
+        if os.path.exists(self._pointer_file):
+            os.remove(self._pointer_file)
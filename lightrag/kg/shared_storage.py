@@ -9,6 +9,7 @@ import logging
 from typing import Any, Dict, List, Optional, Union, TypeVar, Generic
 
 from lightrag.exceptions import PipelineNotInitializedError
+from lightrag.kg.process_lock import ProcessLockFile, process_locks_supported
 
 
 # Define a direct print function for critical logs that must be visible in all processes
@@ -56,6 +57,13 @@ _is_multiprocess = None
 _workers = None
 _manager = None
 
+# fcntl based cross-process locks, replacing Manager locks where supported
+_process_locks: Optional[ProcessLockFile] = None
+# Use fcntl process locks in multiprocess mode when the platform supports them
+USE_PROCESS_LOCKS = True
+# Number of byte-range stripes shared by all multiprocess keyed locks (Default 1024)
+PROCESS_LOCK_STRIPES = 1024
+
 # Global singleton data for multi-process keyed locks
 _lock_registry: Optional[Dict[str, mp.synchronize.Lock]] = None
 _lock_registry_count: Optional[Dict[str, int]] = None
@@ -79,6 +87,18 @@ _shared_dicts: Optional[Dict[str, Any]] = None
 _init_flags: Optional[Dict[str, bool]] = None  # namespace -> initialized
 _update_flags: Optional[Dict[str, bool]] = None  # namespace -> updated
 
+# pipeline event log shared across processes (seq-numbered ring buffer, the
+# event with sequence number seq is kept in slot seq % PIPELINE_EVENT_BUFFER_SIZE)
+_pipeline_events: Optional[List[Optional[Dict[str, Any]]]] = None
+_pipeline_event_seq: Optional[Any] = None  # Value-like object holding last seq
+# Serializes publishers of the event log only, so publishing never waits for
+# the internal lock
+_pipeline_event_lock: Optional[LockType] = None
+# Max events kept in the pipeline event log (Default 1000)
+PIPELINE_EVENT_BUFFER_SIZE = 1000
+# Per-process notifier to wake local subscribers immediately on publish
+_pipeline_event_notifier: Optional[asyncio.Event] = None
+
 # locks for mutex access
 _storage_lock: Optional[LockType] = None
 _internal_lock: Optional[LockType] = None
@@ -148,6 +168,9 @@ class UnifiedLock(Generic[T]):
             # Then acquire the main lock
             if self._is_async:
                 await self._lock.acquire()
+            elif hasattr(self._lock, "acquire_async"):
+                # Process lock that can wait without blocking the event loop
+                await self._lock.acquire_async()
             else:
                 self._lock.acquire()
 
@@ -156,8 +179,9 @@ class UnifiedLock(Generic[T]):
                 enable_output=self._enable_logging,
             )
             return self
-        except Exception as e:
-            # If main lock acquisition fails, release the async lock if it was acquired
+        except BaseException as e:
+            # If main lock acquisition fails (or is cancelled while waiting),
+            # release the async lock if it was acquired
             if (
                 not self._is_async
                 and self._async_lock is not None
@@ -410,7 +434,8 @@ def _get_or_create_shared_raw_mp_lock(
     factory_name: str, key: str
 ) -> Optional[mp.synchronize.Lock]:
     """Return the *singleton* manager.Lock() proxy for keyed lock, creating if needed."""
-    if not _is_multiprocess:
+    if not _is_multiprocess or _process_locks is not None:
+        # Keyed locks use the stripes of _process_locks, see _KeyedLockContext
         return None
 
     with _registry_guard:
@@ -437,7 +462,7 @@ def _get_or_create_shared_raw_mp_lock(
 
 def _release_shared_raw_mp_lock(factory_name: str, key: str):
     """Release the *singleton* manager.Lock() proxy for *key*."""
-    if not _is_multiprocess:
+    if not _is_multiprocess or _process_locks is not None:
         return
 
     global _earliest_mp_cleanup_time, _last_mp_cleanup_time
@@ -757,7 +782,10 @@ class KeyedUnifiedLock:
 
         try:
             # Count multiprocess locks
-            if _is_multiprocess and _lock_registry_count is not None:
+            if _is_multiprocess and _process_locks is not None:
+                # Stripes are preallocated, report those held by this process
+                status["total_mp_locks"] = _process_locks.held_stripes()
+            elif _is_multiprocess and _lock_registry_count is not None:
                 if _registry_guard is not None:
                     with _registry_guard:
                         status["total_mp_locks"] = len(_lock_registry_count)
@@ -798,6 +826,7 @@ class _KeyedLockContext:
             else parent._default_enable_logging
         )
         self._ul: Optional[List["UnifiedLock"]] = None  # set in __aenter__
+        self._stripes: List[Any] = []  # process lock stripes held, set in __aenter__
 
     # ----- enter -----
     async def __aenter__(self):
@@ -813,12 +842,31 @@ class _KeyedLockContext:
             await lock.__aenter__()
             inc_debug_n_locks_acquired()
             self._ul.append(lock)
+
+        # With process locks, the per-key locks above are local only and the
+        # keys are guarded across processes by their stripes. Stripes are taken
+        # after all local locks and in ascending order, so two contexts can
+        # never wait for each other's stripes.
+        if _is_multiprocess and _process_locks is not None:
+            try:
+                for stripe in _process_locks.stripes_for(
+                    [_get_combined_key(self._namespace, key) for key in self._keys]
+                ):
+                    await stripe.acquire_async()
+                    self._stripes.append(stripe)
+            except BaseException:
+                await self.__aexit__(None, None, None)
+                raise
         return self
 
     # ----- exit -----
     async def __aexit__(self, exc_type, exc, tb):
+        for stripe in reversed(self._stripes):
+            stripe.release()
+        self._stripes = []
+
         # The UnifiedLock takes care of proper release order
-        for ul, key in zip(reversed(self._ul), reversed(self._keys)):
+        for ul, key in zip(reversed(self._ul), reversed(self._keys[: len(self._ul)])):
             await ul.__aexit__(exc_type, exc, tb)
             self._parent._release_lock_for_key(self._namespace, key)
             dec_debug_n_locks_acquired()
@@ -952,6 +1000,13 @@ def get_keyed_lock_status() -> Dict[str, Any]:
     return status
 
 
+class _LocalValue:
+    """Single-process stand-in for multiprocessing.Manager().Value"""
+
+    def __init__(self, initial_value=None):
+        self.value = initial_value
+
+
 def initialize_share_data(workers: int = 1):
     """
     Initialize shared storage data for single or multi-process mode.
@@ -964,7 +1019,8 @@ def initialize_share_data(workers: int = 1):
 
     The function determines whether to use cross-process shared variables for data storage
     based on the number of workers. If workers=1, it uses thread locks and local dictionaries.
-    If workers>1, it uses process locks and shared dictionaries managed by multiprocessing.Manager.
+    If workers>1, it uses shared dictionaries managed by multiprocessing.Manager, and fcntl
+    byte-range process locks (Manager locks on platforms without fcntl).
 
     Args:
         workers (int): Number of worker processes. If 1, single-process mode is used.
@@ -974,6 +1030,7 @@ def initialize_share_data(workers: int = 1):
         _manager, \
         _workers, \
         _is_multiprocess, \
+        _process_locks, \
         _storage_lock, \
         _lock_registry, \
         _lock_registry_count, \
@@ -990,7 +1047,10 @@ def initialize_share_data(workers: int = 1):
         _async_locks, \
         _storage_keyed_lock, \
         _earliest_mp_cleanup_time, \
-        _last_mp_cleanup_time
+        _last_mp_cleanup_time, \
+        _pipeline_events, \
+        _pipeline_event_seq, \
+        _pipeline_event_lock
 
     # Check if already initialized
     if _initialized:
@@ -1004,18 +1064,42 @@ def initialize_share_data(workers: int = 1):
     if workers > 1:
         _is_multiprocess = True
         _manager = Manager()
-        _lock_registry = _manager.dict()
-        _lock_registry_count = _manager.dict()
-        _lock_cleanup_data = _manager.dict()
-        _registry_guard = _manager.RLock()
-        _internal_lock = _manager.Lock()
-        _storage_lock = _manager.Lock()
-        _pipeline_status_lock = _manager.Lock()
-        _graph_db_lock = _manager.Lock()
-        _data_init_lock = _manager.Lock()
+        if USE_PROCESS_LOCKS and process_locks_supported():
+            # Locks are fcntl byte ranges of a file inherited by the workers,
+            # acquiring one does not need a round trip to the Manager process
+            _process_locks = ProcessLockFile(
+                [
+                    "internal_lock",
+                    "storage_lock",
+                    "pipeline_status_lock",
+                    "graph_db_lock",
+                    "data_init_lock",
+                    "pipeline_event_lock",
+                ],
+                stripes=PROCESS_LOCK_STRIPES,
+            )
+            _internal_lock = _process_locks.get("internal_lock")
+            _storage_lock = _process_locks.get("storage_lock")
+            _pipeline_status_lock = _process_locks.get("pipeline_status_lock")
+            _graph_db_lock = _process_locks.get("graph_db_lock")
+            _data_init_lock = _process_locks.get("data_init_lock")
+            _pipeline_event_lock = _process_locks.get("pipeline_event_lock")
+        else:
+            _lock_registry = _manager.dict()
+            _lock_registry_count = _manager.dict()
+            _lock_cleanup_data = _manager.dict()
+            _registry_guard = _manager.RLock()
+            _internal_lock = _manager.Lock()
+            _storage_lock = _manager.Lock()
+            _pipeline_status_lock = _manager.Lock()
+            _graph_db_lock = _manager.Lock()
+            _data_init_lock = _manager.Lock()
+            _pipeline_event_lock = _manager.Lock()
         _shared_dicts = _manager.dict()
         _init_flags = _manager.dict()
         _update_flags = _manager.dict()
+        _pipeline_events = _manager.list([None] * PIPELINE_EVENT_BUFFER_SIZE)
+        _pipeline_event_seq = _manager.Value("i", 0)
 
         _storage_keyed_lock = KeyedUnifiedLock()
 
@@ -1026,6 +1110,7 @@ def initialize_share_data(workers: int = 1):
             "pipeline_status_lock": asyncio.Lock(),
             "graph_db_lock": asyncio.Lock(),
             "data_init_lock": asyncio.Lock(),
+            "pipeline_event_lock": asyncio.Lock(),
         }
 
         direct_log(
@@ -1038,9 +1123,12 @@ def initialize_share_data(workers: int = 1):
         _pipeline_status_lock = asyncio.Lock()
         _graph_db_lock = asyncio.Lock()
         _data_init_lock = asyncio.Lock()
+        _pipeline_event_lock = asyncio.Lock()
         _shared_dicts = {}
         _init_flags = {}
         _update_flags = {}
+        _pipeline_events = [None] * PIPELINE_EVENT_BUFFER_SIZE
+        _pipeline_event_seq = _LocalValue(0)
         _async_locks = None  # No need for async locks in single process mode
 
         _storage_keyed_lock = KeyedUnifiedLock()
@@ -1085,6 +1173,110 @@ async def initialize_pipeline_status():
         direct_log(f"Process {os.getpid()} Pipeline namespace initialized")
 
 
+def _get_pipeline_event_lock() -> UnifiedLock:
+    """Return the lock serializing publishers of the pipeline event log"""
+    async_lock = _async_locks.get("pipeline_event_lock") if _is_multiprocess else None
+    return UnifiedLock(
+        lock=_pipeline_event_lock,
+        is_async=not _is_multiprocess,
+        name="pipeline_event_lock",
+        async_lock=async_lock,
+    )
+
+
+def _get_pipeline_event_notifier() -> asyncio.Event:
+    """Return the per-process event used to wake local pipeline event subscribers"""
+    global _pipeline_event_notifier
+    if _pipeline_event_notifier is None:
+        _pipeline_event_notifier = asyncio.Event()
+    return _pipeline_event_notifier
+
+
+async def publish_pipeline_event(event_type: str, data: Dict[str, Any]) -> int:
+    """
+    Append an event to the pipeline event log and wake local subscribers.
+
+    The log is a bounded ring buffer shared by all workers, so subscribers in other
+    processes pick the event up on their next check of the sequence number.
+    Publishing only takes the event log lock and writes one ring slot, it does
+    not wait for the internal lock.
+
+    Args:
+        event_type: Event type (e.g. "pipeline", "doc_status", "track_completed")
+        data: JSON-serializable event payload
+
+    Returns:
+        int: Sequence number assigned to the event, 0 if Shared-Data is not initialized
+    """
+    if _pipeline_events is None or _pipeline_event_seq is None:
+        return 0
+
+    async with _get_pipeline_event_lock():
+        seq = _pipeline_event_seq.value + 1
+        _pipeline_events[seq % PIPELINE_EVENT_BUFFER_SIZE] = {
+            "seq": seq,
+            "type": event_type,
+            "time": time.time(),
+            "data": data,
+        }
+        _pipeline_event_seq.value = seq
+
+    notifier = _get_pipeline_event_notifier()
+    notifier.set()
+    notifier.clear()
+    return seq
+
+
+def get_pipeline_event_seq() -> int:
+    """Return the sequence number of the latest published pipeline event"""
+    if _pipeline_event_seq is None:
+        return 0
+    return _pipeline_event_seq.value
+
+
+async def get_pipeline_events(after_seq: int) -> List[Dict[str, Any]]:
+    """
+    Get pipeline events published after `after_seq`, oldest first.
+
+    No lock is taken: checking the sequence number costs a single shared value
+    read when nothing changed, and the ring is copied in one read otherwise.
+    Publishers fill slots in sequence order, so the copy holds every event up
+    to the newest one it contains.
+    """
+    if _pipeline_events is None or get_pipeline_event_seq() <= after_seq:
+        return []
+
+    events = list(_pipeline_events)
+    return sorted(
+        (event for event in events if event is not None and event["seq"] > after_seq),
+        key=lambda event: event["seq"],
+    )
+
+
+async def wait_for_pipeline_event(after_seq: int, timeout: float) -> bool:
+    """
+    Wait until an event newer than `after_seq` is published or timeout expires.
+
+    Events published by the current process wake the waiter immediately; events
+    published by other workers are noticed when the timeout expires.
+
+    Returns:
+        bool: True if a newer event is available
+    """
+    if get_pipeline_event_seq() > after_seq:
+        return True
+    try:
+        await asyncio.wait_for(_get_pipeline_event_notifier().wait(), timeout=timeout)
+    except asyncio.TimeoutError:
+        pass
+    return get_pipeline_event_seq() > after_seq
+
+
+def is_multiprocess() -> bool:
+    """Whether shared data is shared between multiple worker processes"""
+    return bool(_is_multiprocess)
+
+
 async def get_update_flag(namespace: str):
     """
     Create a namespace's update flag for a workers.
@@ -1241,6 +1433,7 @@ def finalize_share_data():
     global \
         _manager, \
         _is_multiprocess, \
+        _process_locks, \
         _storage_lock, \
         _internal_lock, \
         _pipeline_status_lock, \
@@ -1250,7 +1443,11 @@ def finalize_share_data():
         _init_flags, \
         _initialized, \
         _update_flags, \
-        _async_locks
+        _async_locks, \
+        _pipeline_events, \
+        _pipeline_event_seq, \
+        _pipeline_event_lock, \
+        _pipeline_event_notifier
 
     # Check if already initialized
     if not _initialized:
@@ -1303,8 +1500,12 @@ def finalize_share_data():
                 f"Process {os.getpid()} Error shutting down Manager: {e}", level="ERROR"
             )
 
+    if _process_locks is not None:
+        _process_locks.close()
+
     # Reset global variables
     _manager = None
+    _process_locks = None
     _initialized = None
     _is_multiprocess = None
     _shared_dicts = None
@@ -1316,5 +1517,9 @@ def finalize_share_data():
     _data_init_lock = None
     _update_flags = None
     _async_locks = None
+    _pipeline_events = None
+    _pipeline_event_seq = None
+    _pipeline_event_lock = None
+    _pipeline_event_notifier = None
 
     direct_log(f"Process {os.getpid()} storage data finalization complete")
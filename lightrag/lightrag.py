@@ -22,7 +22,13 @@ from typing import (
     Dict,
 )
 from lightrag.constants import (
+    QUERY_CALL_PRIORITY,
     DEFAULT_MAX_GLEANING,
+    DEFAULT_ENTITY_EXTRACT_PACK_SIZE,
+    DEFAULT_GLEANING_POLICY,
+    DEFAULT_GLEANING_MIN_YIELD,
+    DEFAULT_EMBEDDING_BATCH_LINGER,
+    DEFAULT_VDB_UPSERT_BATCH_SIZE,
     DEFAULT_FORCE_LLM_SUMMARY_ON_MERGE,
     DEFAULT_TOP_K,
     DEFAULT_CHUNK_TOP_K,
@@ -38,15 +44,21 @@ from lightrag.constants import (
     DEFAULT_SUMMARY_LENGTH_RECOMMENDED,
     DEFAULT_MAX_ASYNC,
     DEFAULT_MAX_PARALLEL_INSERT,
+    DEFAULT_HEDGE_PERCENTILE,
+    DEFAULT_HEDGE_BUDGET,
     DEFAULT_MAX_GRAPH_NODES,
     DEFAULT_ENTITY_TYPES,
     DEFAULT_SUMMARY_LANGUAGE,
     DEFAULT_LLM_TIMEOUT,
     DEFAULT_EMBEDDING_TIMEOUT,
+    DEFAULT_STREAMING_CHUNK_THRESHOLD,
+    DEFAULT_STREAMING_CHUNK_BATCH_SIZE,
+    DATA_SCHEMA_VERSION,
 )
 from lightrag.utils import get_env_value
 
 from lightrag.kg import (
+    SHARED_DATA_STORAGES,
     STORAGES,
     verify_storage_implementation,
 )
@@ -57,6 +69,7 @@ from lightrag.kg.shared_storage import (
     get_pipeline_status_lock,
     get_graph_db_lock,
     get_data_init_lock,
+    publish_pipeline_event,
 )
 
 from .base import (
@@ -75,7 +88,10 @@ from .base import (
 from .namespace import NameSpace
 from .operate import (
     chunking_by_token_size,
+    chunking_by_token_size_streaming,
+    iter_text_segments,
     extract_entities,
+    GleaningPolicy,
     merge_nodes_and_edges,
     kg_query,
     naive_query,
@@ -90,13 +106,20 @@ from .utils import (
     compute_mdhash_id,
     lazy_external_import,
     priority_limit_async_func_call,
+    TokenBucketRateLimiter,
+    HedgePolicy,
+    split_priority_pools,
+    micro_batch_async_func_call,
     get_content_summary,
     sanitize_text_for_encoding,
     check_storage_env_vars,
     generate_track_id,
+    load_json,
+    write_json,
     logger,
 )
 from .types import KnowledgeGraph
+from .llm.client_registry import hold_shared_clients, release_shared_clients
 from dotenv import load_dotenv
 
 # use the .env that is inside the current folder
@@ -195,6 +218,26 @@ class LightRAG:
     )
     """Maximum number of entity extraction attempts for ambiguous content."""
 
+    entity_extract_pack_size: int = field(
+        default=get_env_value(
+            "ENTITY_EXTRACT_PACK_SIZE", DEFAULT_ENTITY_EXTRACT_PACK_SIZE, int
+        )
+    )
+    """Maximum number of small chunks extracted in one LLM request, as long as they
+    fit in chunk_token_size together (1 disables packing)."""
+
+    gleaning_policy: str = field(
+        default=get_env_value("GLEANING_POLICY", DEFAULT_GLEANING_POLICY, str)
+    )
+    """When to run the gleaning pass: 'always', or 'adaptive' to skip it for chunk
+    shapes where it rarely adds or improves records."""
+
+    gleaning_min_yield: float = field(
+        default=get_env_value("GLEANING_MIN_YIELD", DEFAULT_GLEANING_MIN_YIELD, float)
+    )
+    """Minimum share of productive gleaning calls for the adaptive policy to keep
+    gleaning a chunk shape."""
+
     force_llm_summary_on_merge: int = field(
         default=get_env_value(
             "FORCE_LLM_SUMMARY_ON_MERGE", DEFAULT_FORCE_LLM_SUMMARY_ON_MERGE, int
@@ -252,6 +295,23 @@ class LightRAG:
     Defaults to `chunking_by_token_size` if not specified.
     """
 
+    streaming_chunk_threshold: int = field(
+        default=get_env_value(
+            "STREAMING_CHUNK_THRESHOLD", DEFAULT_STREAMING_CHUNK_THRESHOLD, int
+        )
+    )
+    """Documents longer than this many characters are chunked incrementally with
+    `chunking_by_token_size_streaming` and written in batches of `streaming_chunk_batch_size`.
+    Only applies to the default chunking function without split_by_character; 0 disables it."""
+
+    streaming_chunk_batch_size: int = field(
+        default=get_env_value(
+            "STREAMING_CHUNK_BATCH_SIZE", DEFAULT_STREAMING_CHUNK_BATCH_SIZE, int
+        )
+    )
+    """Number of chunks upserted to chunks_vdb and text_chunks per batch when streaming,
+    and read back per entity extraction batch."""
+
     # Embedding
     # ---
 
@@ -261,10 +321,36 @@ class LightRAG:
     embedding_batch_num: int = field(default=int(os.getenv("EMBEDDING_BATCH_NUM", 10)))
     """Batch size for embedding computations."""
 
+    embedding_batch_linger: float = field(
+        default=get_env_value(
+            "EMBEDDING_BATCH_LINGER", DEFAULT_EMBEDDING_BATCH_LINGER, float
+        )
+    )
+    """Seconds small concurrent embedding calls wait to be coalesced into batches of
+    embedding_batch_num texts (0 disables coalescing)."""
+
+    vdb_upsert_batch_size: int = field(
+        default=get_env_value(
+            "VDB_UPSERT_BATCH_SIZE", DEFAULT_VDB_UPSERT_BATCH_SIZE, int
+        )
+    )
+    """Entity/relation vectors written per upsert when a merge phase flushes them."""
+
     embedding_func_max_async: int = field(
         default=int(os.getenv("EMBEDDING_FUNC_MAX_ASYNC", 8))
     )
-    """Maximum number of concurrent embedding function calls."""
+    """Maximum number of concurrent embedding function calls (initial value in adaptive mode)."""
+
+    embedding_func_max_async_limit: int = field(
+        default=get_env_value("EMBEDDING_FUNC_MAX_ASYNC_LIMIT", 0, int)
+    )
+    """Upper bound of the adaptive embedding concurrency (0: 4 * embedding_func_max_async)."""
+
+    embedding_rpm: int = field(default=get_env_value("EMBEDDING_RPM", 0, int))
+    """Embedding requests per minute allowed by the provider (0: unlimited)."""
+
+    embedding_tpm: int = field(default=get_env_value("EMBEDDING_TPM", 0, int))
+    """Embedding tokens per minute allowed by the provider (0: unlimited)."""
 
     embedding_cache_config: dict[str, Any] = field(
         default_factory=lambda: {
@@ -312,7 +398,53 @@ class LightRAG:
     llm_model_max_async: int = field(
         default=int(os.getenv("MAX_ASYNC", DEFAULT_MAX_ASYNC))
     )
-    """Maximum number of concurrent LLM calls."""
+    """Maximum number of concurrent LLM calls (initial value in adaptive mode)."""
+
+    llm_model_max_async_limit: int = field(
+        default=get_env_value("MAX_ASYNC_LIMIT", 0, int)
+    )
+    """Upper bound of the adaptive LLM concurrency (0: 4 * llm_model_max_async)."""
+
+    llm_query_max_async: int = field(
+        default=get_env_value("LLM_QUERY_MAX_ASYNC", 0, int)
+    )
+    """Concurrent LLM calls reserved for queries in a pool of their own, on top of
+    llm_model_max_async used by ingestion (0: queries share the ingestion pool)."""
+
+    query_llm_model_func: Callable[..., object] | None = field(default=None)
+    """Optional LLM function for the query pool, e.g. bound to other endpoints
+    (defaults to llm_model_func). Only used when llm_query_max_async > 0."""
+
+    query_max_queue: int = field(default=get_env_value("QUERY_MAX_QUEUE", 0, int))
+    """Queued query LLM calls above which the API server rejects new queries with
+    HTTP 429 (0: no admission control)."""
+
+    llm_rpm: int = field(default=get_env_value("LLM_RPM", 0, int))
+    """LLM requests per minute allowed by the provider (0: unlimited)."""
+
+    llm_tpm: int = field(default=get_env_value("LLM_TPM", 0, int))
+    """LLM tokens per minute allowed by the provider (0: unlimited)."""
+
+    adaptive_concurrency: bool = field(
+        default=get_env_value("ADAPTIVE_CONCURRENCY", False, bool)
+    )
+    """Adapt LLM and embedding concurrency to the provider: grow while calls are fast
+    and healthy, halve on rate limit or timeout errors."""
+
+    hedge_query_calls: bool = field(
+        default=get_env_value("HEDGE_QUERY_CALLS", False, bool)
+    )
+    """Send a duplicate of slow query-priority LLM and embedding calls and use the first response."""
+
+    hedge_percentile: float = field(
+        default=get_env_value("HEDGE_PERCENTILE", DEFAULT_HEDGE_PERCENTILE, float)
+    )
+    """Latency percentile of query calls after which a duplicate is sent."""
+
+    hedge_budget: float = field(
+        default=get_env_value("HEDGE_BUDGET", DEFAULT_HEDGE_BUDGET, float)
+    )
+    """Maximum fraction of query calls that may be duplicated."""
 
     llm_model_kwargs: dict[str, Any] = field(default_factory=dict)
     """Additional keyword arguments passed to the LLM model function."""
@@ -470,8 +602,33 @@ class LightRAG:
             self.embedding_func_max_async,
             llm_timeout=self.default_embedding_timeout,
             queue_name="Embedding func",
+            adaptive=self.adaptive_concurrency,
+            max_adaptive_size=self.embedding_func_max_async_limit or None,
+            rate_limiter=self._create_rate_limiter(
+                self.embedding_rpm, self.embedding_tpm
+            ),
+            token_estimator=self._estimate_embedding_tokens,
+            hedge_policy=self._create_hedge_policy(),
+        )(self.embedding_func)
+        # Coalesced batches take a single embedding limiter slot
+        self.embedding_func = micro_batch_async_func_call(
+            self.embedding_batch_num, linger=self.embedding_batch_linger
         )(self.embedding_func)
 
+        # Gleaning statistics are shared by all documents of this instance
+        if self.gleaning_policy not in ("always", "adaptive"):
+            raise ValueError(
+                f"gleaning_policy must be 'always' or 'adaptive', got '{self.gleaning_policy}'"
+            )
+        self._gleaning_policy = (
+            GleaningPolicy(
+                chunk_token_size=self.chunk_token_size,
+                min_yield=self.gleaning_min_yield,
+            )
+            if self.gleaning_policy == "adaptive"
+            else None
+        )
+
         # Initialize all storages
         self.key_string_value_json_storage_cls: type[BaseKVStorage] = (
             self._get_storage_class(self.kv_storage)
@@ -562,11 +719,19 @@ class LightRAG:
         # Directly use llm_response_cache, don't create a new object
         hashing_kv = self.llm_response_cache
 
+        # Both LLM pools draw from the same provider rate limit
+        llm_rate_limiter = self._create_rate_limiter(self.llm_rpm, self.llm_tpm)
+
         # Get timeout from LLM model kwargs for dynamic timeout calculation
-        self.llm_model_func = priority_limit_async_func_call(
+        llm_model_func = priority_limit_async_func_call(
             self.llm_model_max_async,
             llm_timeout=self.default_llm_timeout,
             queue_name="LLM func",
+            adaptive=self.adaptive_concurrency,
+            max_adaptive_size=self.llm_model_max_async_limit or None,
+            rate_limiter=llm_rate_limiter,
+            token_estimator=self._estimate_llm_tokens,
+            hedge_policy=self._create_hedge_policy(),
         )(
             partial(
                 self.llm_model_func,  # type: ignore
@@ -575,45 +740,138 @@ class LightRAG:
             )
         )
 
+        if self.llm_query_max_async > 0:
+            # Queries get capacity of their own, ingestion only borrows it when idle
+            query_llm_model_func = priority_limit_async_func_call(
+                self.llm_query_max_async,
+                llm_timeout=self.default_llm_timeout,
+                queue_name="LLM query func",
+                adaptive=self.adaptive_concurrency,
+                rate_limiter=llm_rate_limiter,
+                token_estimator=self._estimate_llm_tokens,
+                hedge_policy=self._create_hedge_policy(),
+            )(
+                partial(
+                    self.query_llm_model_func or self.llm_model_func,  # type: ignore
+                    hashing_kv=hashing_kv,
+                    **self.llm_model_kwargs,
+                )
+            )
+            llm_model_func = split_priority_pools(
+                query_llm_model_func,
+                llm_model_func,
+                query_priority=QUERY_CALL_PRIORITY,
+            )
+
+        self.llm_model_func = llm_model_func
+
         self._storages_status = StoragesStatus.CREATED
 
+    @staticmethod
+    def _create_rate_limiter(rpm: int, tpm: int) -> TokenBucketRateLimiter | None:
+        if rpm <= 0 and tpm <= 0:
+            return None
+        return TokenBucketRateLimiter(rpm=rpm, tpm=tpm)
+
+    def _create_hedge_policy(self) -> HedgePolicy | None:
+        if not self.hedge_query_calls:
+            return None
+        return HedgePolicy(percentile=self.hedge_percentile, budget=self.hedge_budget)
+
+    def _estimate_llm_tokens(self, args: tuple, kwargs: dict) -> int:
+        """Prompt tokens plus the completion budget of an LLM call, for TPM limiting"""
+        texts = list(args[:1])
+        if kwargs.get("prompt"):
+            texts.append(kwargs["prompt"])
+        if kwargs.get("system_prompt"):
+            texts.append(kwargs["system_prompt"])
+        for message in kwargs.get("history_messages") or []:
+            texts.append(message.get("content") or "")
+        tokens = sum(
+            len(self.tokenizer.encode(text)) for text in texts if isinstance(text, str)
+        )
+        max_tokens = kwargs.get("max_tokens") or self.llm_model_kwargs.get("max_tokens")
+        return tokens + (max_tokens or 0)
+
+    def query_queue_depth(self) -> int:
+        """Number of query-priority LLM calls waiting for a slot"""
+        if hasattr(self.llm_model_func, "queued_calls"):
+            return self.llm_model_func.queued_calls()
+        stats = self.llm_model_func.get_stats()
+        return sum(
+            n
+            for p, n in stats["queued_by_priority"].items()
+            if p <= QUERY_CALL_PRIORITY
+        )
+
+    def _estimate_embedding_tokens(self, args: tuple, kwargs: dict) -> int:
+        texts = args[0] if args else kwargs.get("texts") or []
+        return sum(len(self.tokenizer.encode(text)) for text in texts)
+
+    def _named_storages(self) -> list[tuple[str, Any]]:
+        return [
+            ("full_docs", self.full_docs),
+            ("text_chunks", self.text_chunks),
+            ("full_entities", self.full_entities),
+            ("full_relations", self.full_relations),
+            ("entities_vdb", self.entities_vdb),
+            ("relationships_vdb", self.relationships_vdb),
+            ("chunks_vdb", self.chunks_vdb),
+            ("chunk_entity_relation_graph", self.chunk_entity_relation_graph),
+            ("llm_response_cache", self.llm_response_cache),
+            ("doc_status", self.doc_status),
+        ]
+
     async def initialize_storages(self):
-        """Storage initialization must be called one by one to prevent deadlock"""
+        """Initialize all storages and log how long each one took
+
+        Storages kept in shared storage (JSON, NetworkX, NanoVectorDB, Faiss)
+        must be initialized one by one to prevent deadlock, and so are the
+        storages of one database backend, which share its client. Only storages
+        of different backends (e.g. Postgres KV and Neo4j graph) initialize
+        concurrently.
+        """
         if self._storages_status == StoragesStatus.CREATED:
-            for storage in (
-                self.full_docs,
-                self.text_chunks,
-                self.full_entities,
-                self.full_relations,
-                self.entities_vdb,
-                self.relationships_vdb,
-                self.chunks_vdb,
-                self.chunk_entity_relation_graph,
-                self.llm_response_cache,
-                self.doc_status,
-            ):
-                if storage:
-                    # logger.debug(f"Initializing storage: {storage}")
+            start_time = time.perf_counter()
+            timings: dict[str, float] = {}
+
+            groups: dict[str, list[tuple[str, Any]]] = {}
+            for name, storage in self._named_storages():
+                if not storage:
+                    continue
+                storage_cls = type(storage)
+                if storage_cls.__name__ in SHARED_DATA_STORAGES:
+                    group = "shared_storage"
+                else:
+                    group = storage_cls.__module__
+                groups.setdefault(group, []).append((name, storage))
+
+            async def initialize_group(storages: list[tuple[str, Any]]) -> None:
+                for name, storage in storages:
+                    storage_start = time.perf_counter()
                     await storage.initialize()
+                    timings[name] = time.perf_counter() - storage_start
+
+            await asyncio.gather(
+                *(initialize_group(storages) for storages in groups.values())
+            )
 
             self._storages_status = StoragesStatus.INITIALIZED
-            logger.debug("All storage types initialized")
+            hold_shared_clients()
+            breakdown = ", ".join(
+                f"{name} {seconds:.2f}s"
+                for name, seconds in sorted(
+                    timings.items(), key=lambda item: item[1], reverse=True
+                )
+            )
+            logger.info(
+                f"Storages initialized in {time.perf_counter() - start_time:.2f}s ({breakdown})"
+            )
 
     async def finalize_storages(self):
         """Asynchronously finalize the storages with improved error handling"""
         if self._storages_status == StoragesStatus.INITIALIZED:
-            storages = [
-                ("full_docs", self.full_docs),
-                ("text_chunks", self.text_chunks),
-                ("full_entities", self.full_entities),
-                ("full_relations", self.full_relations),
-                ("entities_vdb", self.entities_vdb),
-                ("relationships_vdb", self.relationships_vdb),
-                ("chunks_vdb", self.chunks_vdb),
-                ("chunk_entity_relation_graph", self.chunk_entity_relation_graph),
-                ("llm_response_cache", self.llm_response_cache),
-                ("doc_status", self.doc_status),
-            ]
+            storages = self._named_storages()
 
             # Finalize each storage individually to ensure one failure doesn't prevent others from closing
             successful_finalizations = []
@@ -645,68 +903,124 @@ class LightRAG:
 
             self._storages_status = StoragesStatus.FINALIZED
 
+            # Close pooled HTTP connections of LLM/embedding/rerank bindings
+            # once no other instance uses them
+            await release_shared_clients()
+
+    # Metadata file of the workspace holding its data schema version. It is kept
+    # out of the LLM cache, which can be cleared at any time, and names the
+    # storages the checks ran against, so switching backends runs them again.
+    _SCHEMA_VERSION_FILE = "schema_version.json"
+
+    def _schema_version_file(self) -> str:
+        workspace_dir = (
+            os.path.join(self.working_dir, self.workspace)
+            if self.workspace
+            else self.working_dir
+        )
+        return os.path.join(workspace_dir, self._SCHEMA_VERSION_FILE)
+
+    def _schema_storages(self) -> dict[str, str]:
+        return {
+            "kv_storage": self.kv_storage,
+            "graph_storage": self.graph_storage,
+            "doc_status_storage": self.doc_status_storage,
+        }
+
+    async def _get_schema_version(self) -> int:
+        """Data schema version of the workspace, 0 if no migration was recorded"""
+        try:
+            record = load_json(self._schema_version_file())
+            if not record or record.get("storages") != self._schema_storages():
+                return 0
+            return int(record["version"])
+        except Exception as e:
+            logger.warning(f"Invalid schema version file, checking migrations: {e}")
+            return 0
+
+    async def _set_schema_version(self, version: int) -> None:
+        file_name = self._schema_version_file()
+        tmp_file = f"{file_name}.tmp"
+        try:
+            os.makedirs(os.path.dirname(file_name), exist_ok=True)
+            write_json(
+                {"version": version, "storages": self._schema_storages()}, tmp_file
+            )
+            os.replace(tmp_file, file_name)
+        except Exception as e:
+            logger.warning(f"Failed to record schema version: {e}")
+
     async def check_and_migrate_data(self):
-        """Check if data migration is needed and perform migration if necessary"""
-        async with get_data_init_lock(enable_logging=True):
-            try:
-                # Check if migration is needed:
-                # 1. chunk_entity_relation_graph has entities and relations (count > 0)
-                # 2. full_entities and full_relations are empty
+        """Check if data migration is needed and perform migration if necessary
 
-                # Get all entity labels from graph
-                all_entity_labels = (
-                    await self.chunk_entity_relation_graph.get_all_labels()
+        Once the checks completed, the workspace schema version is recorded so
+        later starts skip them without scanning the graph and document status.
+        """
+        start_time = time.perf_counter()
+        async with get_data_init_lock(enable_logging=True):
+            if await self._get_schema_version() >= DATA_SCHEMA_VERSION:
+                logger.debug(
+                    f"Data schema is up to date (version {DATA_SCHEMA_VERSION}), skipping migration check"
+                )
+                return
+            if await self._migrate_to_full_entities_relations():
+                await self._set_schema_version(DATA_SCHEMA_VERSION)
+                logger.info(
+                    f"Data migration check completed in {time.perf_counter() - start_time:.2f}s"
                 )
 
-                if not all_entity_labels:
-                    logger.debug("No entities found in graph, skipping migration check")
-                    return
+    async def _migrate_to_full_entities_relations(self) -> bool:
+        """Fill full_entities/full_relations of workspaces created before they existed
 
-                # Check if full_entities and full_relations are empty
-                # Get all processed documents to check their entity/relation data
-                try:
-                    processed_docs = await self.doc_status.get_docs_by_status(
-                        DocStatus.PROCESSED
-                    )
+        Returns:
+            bool: True if the workspace no longer needs this migration
+        """
+        try:
+            # Check if migration is needed:
+            # 1. chunk_entity_relation_graph has entities and relations (count > 0)
+            # 2. full_entities and full_relations are empty
 
-                    if not processed_docs:
-                        logger.debug("No processed documents found, skipping migration")
-                        return
+            # Get all entity labels from graph
+            all_entity_labels = await self.chunk_entity_relation_graph.get_all_labels()
 
-                    # Check first few documents to see if they have full_entities/full_relations data
-                    migration_needed = True
-                    checked_count = 0
-                    max_check = min(5, len(processed_docs))  # Check up to 5 documents
+            if not all_entity_labels:
+                logger.debug("No entities found in graph, skipping migration check")
+                return True
 
-                    for doc_id in list(processed_docs.keys())[:max_check]:
-                        checked_count += 1
-                        entity_data = await self.full_entities.get_by_id(doc_id)
-                        relation_data = await self.full_relations.get_by_id(doc_id)
+            # Check if full_entities and full_relations are empty
+            # Get all processed documents to check their entity/relation data
+            processed_docs = await self.doc_status.get_docs_by_status(
+                DocStatus.PROCESSED
+            )
 
-                        if entity_data or relation_data:
-                            migration_needed = False
-                            break
+            if not processed_docs:
+                logger.debug("No processed documents found, skipping migration")
+                return True
 
-                    if not migration_needed:
-                        logger.debug(
-                            "Full entities/relations data already exists, no migration needed"
-                        )
-                        return
+            # Check first few documents to see if they have full_entities/full_relations data
+            max_check = min(5, len(processed_docs))  # Check up to 5 documents
+            for doc_id in list(processed_docs.keys())[:max_check]:
+                entity_data = await self.full_entities.get_by_id(doc_id)
+                relation_data = await self.full_relations.get_by_id(doc_id)
 
-                    logger.info(
-                        f"Data migration needed: found {len(all_entity_labels)} entities in graph but no full_entities/full_relations data"
+                if entity_data or relation_data:
+                    logger.debug(
+                        "Full entities/relations data already exists, no migration needed"
                     )
+                    return True
 
-                    # Perform migration
-                    await self._migrate_entity_relation_data(processed_docs)
+            logger.info(
+                f"Data migration needed: found {len(all_entity_labels)} entities in graph but no full_entities/full_relations data"
+            )
 
-                except Exception as e:
-                    logger.error(f"Error during migration check: {e}")
-                    # Don't raise the error, just log it to avoid breaking initialization
+            # Perform migration
+            await self._migrate_entity_relation_data(processed_docs)
+            return True
 
-            except Exception as e:
-                logger.error(f"Error in data migration check: {e}")
-                # Don't raise the error to avoid breaking initialization
+        except Exception as e:
+            logger.error(f"Error in data migration check: {e}")
+            # Don't raise the error to avoid breaking initialization
+            return False
 
     async def _migrate_entity_relation_data(self, processed_docs: dict):
         """Migrate existing entity and relation data to full_entities and full_relations storage"""
@@ -1147,6 +1461,10 @@ class LightRAG:
         # Store document status (without content)
         await self.doc_status.upsert(new_docs)
         logger.debug(f"Stored {len(new_docs)} new unique documents")
+        await publish_pipeline_event(
+            "docs_enqueued",
+            {"track_id": track_id, "doc_ids": list(new_docs.keys())},
+        )
 
         return track_id
 
@@ -1402,6 +1720,9 @@ class LightRAG:
                 )
                 # Cleaning history_messages without breaking it as a shared list object
                 del pipeline_status["history_messages"][:]
+                await publish_pipeline_event(
+                    "pipeline", {"busy": True, "job_name": "Default Job"}
+                )
             else:
                 # Another process is busy, just set request flag and return
                 pipeline_status["request_pending"] = True
@@ -1513,6 +1834,15 @@ class LightRAG:
                                         pipeline_status["history_messages"][-5000:]
                                     )
 
+                            await publish_pipeline_event(
+                                "pipeline",
+                                {
+                                    "cur_batch": current_file_number,
+                                    "batchs": total_files,
+                                    "latest_message": log_message,
+                                },
+                            )
+
                             # Get document content from full_docs
                             content_data = await self.full_docs.get_by_id(doc_id)
                             if not content_data:
@@ -1522,24 +1852,39 @@ class LightRAG:
                             content = content_data["content"]
 
                             # Generate chunks from document
-                            chunks: dict[str, Any] = {
-                                compute_mdhash_id(dp["content"], prefix="chunk-"): {
-                                    **dp,
-                                    "full_doc_id": doc_id,
-                                    "file_path": file_path,  # Add file path to each chunk
-                                    "llm_cache_list": [],  # Initialize empty LLM cache list for each chunk
-                                }
-                                for dp in self.chunking_func(
-                                    self.tokenizer,
-                                    content,
-                                    split_by_character,
-                                    split_by_character_only,
-                                    self.chunk_overlap_token_size,
-                                    self.chunk_token_size,
+                            chunks_streamed = self._should_stream_chunks(
+                                content, split_by_character
+                            )
+                            if chunks_streamed:
+                                # Large document: chunks are written to chunks_vdb and
+                                # text_chunks batch by batch while chunking, and only
+                                # their ids are kept
+                                chunks = None
+                                chunk_ids = await self._stream_chunks_to_storage(
+                                    content, doc_id, file_path
                                 )
-                            }
+                            else:
+                                chunks: dict[str, Any] = {
+                                    compute_mdhash_id(dp["content"], prefix="chunk-"): {
+                                        **dp,
+                                        "full_doc_id": doc_id,
+                                        "file_path": file_path,  # Add file path to each chunk
+                                        "llm_cache_list": [],  # Initialize empty LLM cache list for each chunk
+                                    }
+                                    for dp in self.chunking_func(
+                                        self.tokenizer,
+                                        content,
+                                        split_by_character,
+                                        split_by_character_only,
+                                        self.chunk_overlap_token_size,
+                                        self.chunk_token_size,
+                                    )
+                                }
+                                chunk_ids = list(chunks.keys())
+                            # Release the document text before entity extraction
+                            del content, content_data
 
-                            if not chunks:
+                            if not chunk_ids:
                                 logger.warning("No document chunks to process")
 
                             # Record processing start time
@@ -1552,10 +1897,8 @@ class LightRAG:
                                     {
                                         doc_id: {
                                             "status": DocStatus.PROCESSING,
-                                            "chunks_count": len(chunks),
-                                            "chunks_list": list(
-                                                chunks.keys()
-                                            ),  # Save chunks list
+                                            "chunks_count": len(chunk_ids),
+                                            "chunks_list": chunk_ids,  # Save chunks list
                                             "content_summary": status_doc.content_summary,
                                             "content_length": status_doc.content_length,
                                             "created_at": status_doc.created_at,
@@ -1571,30 +1914,40 @@ class LightRAG:
                                     }
                                 )
                             )
-                            chunks_vdb_task = asyncio.create_task(
-                                self.chunks_vdb.upsert(chunks)
-                            )
-                            text_chunks_task = asyncio.create_task(
-                                self.text_chunks.upsert(chunks)
-                            )
-
                             # First stage tasks (parallel execution)
-                            first_stage_tasks = [
-                                doc_status_task,
-                                chunks_vdb_task,
-                                text_chunks_task,
-                            ]
+                            first_stage_tasks = [doc_status_task]
+                            if not chunks_streamed:
+                                chunks_vdb_task = asyncio.create_task(
+                                    self.chunks_vdb.upsert(chunks)
+                                )
+                                text_chunks_task = asyncio.create_task(
+                                    self.text_chunks.upsert(chunks)
+                                )
+                                first_stage_tasks += [chunks_vdb_task, text_chunks_task]
                             entity_relation_task = None
 
                             # Execute first stage tasks
                             await asyncio.gather(*first_stage_tasks)
+                            await self._publish_doc_status_event(
+                                doc_id,
+                                DocStatus.PROCESSING,
+                                file_path,
+                                status_doc.track_id,
+                            )
 
                             # Stage 2: Process entity relation graph (after text_chunks are saved)
-                            entity_relation_task = asyncio.create_task(
-                                self._process_extract_entities(
-                                    chunks, pipeline_status, pipeline_status_lock
+                            if chunks_streamed:
+                                entity_relation_task = asyncio.create_task(
+                                    self._extract_streamed_chunks(
+                                        chunk_ids, pipeline_status, pipeline_status_lock
+                                    )
+                                )
+                            else:
+                                entity_relation_task = asyncio.create_task(
+                                    self._process_extract_entities(
+                                        chunks, pipeline_status, pipeline_status_lock
+                                    )
                                 )
-                            )
                             await entity_relation_task
                             file_extraction_stage_ok = True
 
@@ -1646,6 +1999,13 @@ class LightRAG:
                                     }
                                 }
                             )
+                            await self._publish_doc_status_event(
+                                doc_id,
+                                DocStatus.FAILED,
+                                file_path,
+                                status_doc.track_id,
+                                error_msg=str(e),
+                            )
 
                         # Concurrency is controlled by keyed lock for individual entities and relationships
                         if file_extraction_stage_ok:
@@ -1676,8 +2036,8 @@ class LightRAG:
                                     {
                                         doc_id: {
                                             "status": DocStatus.PROCESSED,
-                                            "chunks_count": len(chunks),
-                                            "chunks_list": list(chunks.keys()),
+                                            "chunks_count": len(chunk_ids),
+                                            "chunks_list": chunk_ids,
                                             "content_summary": status_doc.content_summary,
                                             "content_length": status_doc.content_length,
                                             "created_at": status_doc.created_at,
@@ -1694,6 +2054,13 @@ class LightRAG:
                                     }
                                 )
 
+                                await self._publish_doc_status_event(
+                                    doc_id,
+                                    DocStatus.PROCESSED,
+                                    file_path,
+                                    status_doc.track_id,
+                                )
+
                                 # Call _insert_done after processing each file
                                 await self._insert_done()
 
@@ -1745,6 +2112,13 @@ class LightRAG:
                                         }
                                     }
                                 )
+                                await self._publish_doc_status_event(
+                                    doc_id,
+                                    DocStatus.FAILED,
+                                    file_path,
+                                    status_doc.track_id,
+                                    error_msg=str(e),
+                                )
 
                 # Create processing tasks for all documents
                 doc_tasks = []
@@ -1764,6 +2138,11 @@ class LightRAG:
                 # Wait for all document processing to complete
                 await asyncio.gather(*doc_tasks)
 
+                # Notify subscribers about tracks whose documents are all finished
+                await self._publish_completed_tracks(
+                    {status_doc.track_id for status_doc in to_process_docs.values()}
+                )
+
                 # Check if there's a pending request to process more documents (with lock)
                 has_pending_request = False
                 async with pipeline_status_lock:
@@ -1800,6 +2179,146 @@ class LightRAG:
                 pipeline_status["busy"] = False
                 pipeline_status["latest_message"] = log_message
                 pipeline_status["history_messages"].append(log_message)
+            await publish_pipeline_event(
+                "pipeline", {"busy": False, "latest_message": log_message}
+            )
+
+    def _should_stream_chunks(
+        self, content: str, split_by_character: str | None
+    ) -> bool:
+        """Whether a document is large enough to be chunked by the streaming chunker"""
+        return (
+            self.streaming_chunk_threshold > 0
+            and len(content) > self.streaming_chunk_threshold
+            and split_by_character is None
+            and self.chunking_func is chunking_by_token_size
+        )
+
+    async def _stream_chunks_to_storage(
+        self, content: str, doc_id: str, file_path: str
+    ) -> list[str]:
+        """Chunk a large document incrementally and upsert chunks in bounded batches
+
+        The document is never tokenized as a whole: segments are fed to the
+        streaming chunker and every `streaming_chunk_batch_size` chunks are written
+        to chunks_vdb and text_chunks before chunking continues. Chunks are not kept
+        once written, `_extract_streamed_chunks` reads them back batch by batch.
+
+        Returns:
+            list[str]: Ids of the document chunks in document order
+        """
+        chunk_ids: dict[str, None] = {}
+        batch: dict[str, Any] = {}
+        batch_size = max(1, self.streaming_chunk_batch_size)
+
+        async def flush_batch():
+            await asyncio.gather(
+                self.chunks_vdb.upsert(batch), self.text_chunks.upsert(batch)
+            )
+
+        for dp in chunking_by_token_size_streaming(
+            self.tokenizer,
+            iter_text_segments(content),
+            self.chunk_overlap_token_size,
+            self.chunk_token_size,
+        ):
+            chunk_id = compute_mdhash_id(dp["content"], prefix="chunk-")
+            chunk = {
+                **dp,
+                "full_doc_id": doc_id,
+                "file_path": file_path,
+                "llm_cache_list": [],
+            }
+            chunk_ids[chunk_id] = None
+            batch[chunk_id] = chunk
+            if len(batch) >= batch_size:
+                await flush_batch()
+                batch = {}
+
+        if batch:
+            await flush_batch()
+
+        logger.info(
+            f"Streamed {len(chunk_ids)} chunks of {len(content)} chars document {doc_id}"
+        )
+        return list(chunk_ids)
+
+    async def _extract_streamed_chunks(
+        self, chunk_ids: list[str], pipeline_status=None, pipeline_status_lock=None
+    ) -> list:
+        """Extract entities from streamed chunks, reading them back from text_chunks
+
+        Only `streaming_chunk_batch_size` chunks are held at a time, so memory does
+        not grow with the size of the document beyond the extraction results.
+        """
+        chunk_results = []
+        batch_size = max(1, self.streaming_chunk_batch_size)
+        for start in range(0, len(chunk_ids), batch_size):
+            batch_ids = chunk_ids[start : start + batch_size]
+            records = await self.text_chunks.get_by_ids(batch_ids)
+            batch = {
+                chunk_id: record
+                for chunk_id, record in zip(batch_ids, records)
+                if record is not None
+            }
+            if len(batch) < len(batch_ids):
+                raise Exception(
+                    f"{len(batch_ids) - len(batch)} streamed chunks not found in text_chunks"
+                )
+            chunk_results.extend(
+                await self._process_extract_entities(
+                    batch, pipeline_status, pipeline_status_lock
+                )
+            )
+        return chunk_results
+
+    async def _publish_doc_status_event(
+        self,
+        doc_id: str,
+        status: DocStatus,
+        file_path: str,
+        track_id: str | None,
+        error_msg: str | None = None,
+    ) -> None:
+        """Notify pipeline event subscribers about a document status transition"""
+        await publish_pipeline_event(
+            "doc_status",
+            {
+                "doc_id": doc_id,
+                "status": status.value,
+                "file_path": file_path,
+                "track_id": track_id,
+                "error_msg": error_msg,
+            },
+        )
+
+    async def _publish_completed_tracks(self, track_ids: set[str | None]) -> None:
+        """Publish a track_completed event for each track with no unfinished documents"""
+        for track_id in track_ids:
+            if not track_id:
+                continue
+            try:
+                track_docs = await self.doc_status.get_docs_by_track_id(track_id)
+            except Exception as e:
+                logger.warning(f"Failed to check completion of track {track_id}: {e}")
+                continue
+            status_counts: dict[str, int] = {}
+            for doc in track_docs.values():
+                status = (
+                    doc.status.value
+                    if isinstance(doc.status, DocStatus)
+                    else str(doc.status)
+                )
+                status_counts[status] = status_counts.get(status, 0) + 1
+            if not status_counts or any(
+                status in status_counts
+                for status in (DocStatus.PENDING.value, DocStatus.PROCESSING.value)
+            ):
+                continue
+            await publish_pipeline_event(
+                "track_completed",
+                {"track_id": track_id, "status_counts": status_counts},
+            )
 
     async def _process_extract_entities(
         self, chunk: dict[str, Any], pipeline_status=None, pipeline_status_lock=None
@@ -1812,6 +2331,7 @@ class LightRAG:
                 pipeline_status_lock=pipeline_status_lock,
                 llm_response_cache=self.llm_response_cache,
                 text_chunks_storage=self.text_chunks,
+                gleaning_policy=self._gleaning_policy,
             )
             return chunk_results
         except Exception as e:
@@ -34,6 +34,9 @@ from tenacity import (
 )
 from lightrag.utils import (
     safe_unicode_decode,
+    report_retried_overload,
+    report_token_usage,
+    get_env_value,
     logger,
 )
 from lightrag.api import __api_version__
@@ -46,6 +49,27 @@ class InvalidResponseError(Exception):
     pass
 
 
+def _get_token_counts(usage: Any) -> dict[str, int]:
+    """Token counts of an Anthropic usage object
+
+    Anthropic reports prompt tokens read from and written to the prompt cache
+    separately from `input_tokens`; they are added back into prompt_tokens.
+    """
+    cached_tokens = getattr(usage, "cache_read_input_tokens", 0) or 0
+    prompt_tokens = (
+        (getattr(usage, "input_tokens", 0) or 0)
+        + cached_tokens
+        + (getattr(usage, "cache_creation_input_tokens", 0) or 0)
+    )
+    completion_tokens = getattr(usage, "output_tokens", 0) or 0
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "cached_tokens": cached_tokens,
+    }
+
+
 # Core Anthropic completion function with retry
 @retry(
     stop=stop_after_attempt(3),
@@ -53,6 +77,7 @@ class InvalidResponseError(Exception):
     retry=retry_if_exception_type(
         (RateLimitError, APIConnectionError, APITimeoutError, InvalidResponseError)
     ),
+    before_sleep=report_retried_overload,
 )
 async def anthropic_complete_if_cache(
     model: str,
@@ -62,6 +87,7 @@ async def anthropic_complete_if_cache(
     enable_cot: bool = False,
     base_url: str | None = None,
     api_key: str | None = None,
+    token_tracker: Any | None = None,
     **kwargs: Any,
 ) -> Union[str, AsyncIterator[str]]:
     if history_messages is None:
@@ -99,9 +125,20 @@ async def anthropic_complete_if_cache(
         )
     )
 
+    # The system prompt is the stable prefix of extraction calls, mark it as a
+    # prompt cache breakpoint so later calls read it from Anthropic's cache
+    if system_prompt and get_env_value("ANTHROPIC_PROMPT_CACHE", True, bool):
+        kwargs["system"] = [
+            {
+                "type": "text",
+                "text": system_prompt,
+                "cache_control": {"type": "ephemeral"},
+            }
+        ]
+    elif system_prompt:
+        kwargs["system"] = system_prompt
+
     messages: list[dict[str, Any]] = []
-    if system_prompt:
-        messages.append({"role": "system", "content": system_prompt})
     messages.extend(history_messages)
     messages.append({"role": "user", "content": prompt})
 
@@ -131,14 +168,20 @@ async def anthropic_complete_if_cache(
         raise
 
     async def stream_response():
+        token_counts = {}
         try:
             async for event in response:
-                content = (
-                    event.delta.text
-                    if hasattr(event, "delta") and event.delta.text
-                    else None
-                )
-                if content is None:
+                event_type = getattr(event, "type", None)
+                if event_type == "message_start":
+                    token_counts = _get_token_counts(event.message.usage)
+                elif event_type == "message_delta" and token_counts:
+                    output_tokens = getattr(event.usage, "output_tokens", 0) or 0
+                    token_counts["completion_tokens"] = output_tokens
+                    token_counts["total_tokens"] = (
+                        token_counts["prompt_tokens"] + output_tokens
+                    )
+                content = getattr(getattr(event, "delta", None), "text", None)
+                if not content:
                     continue
                 if r"\u" in content:
                     content = safe_unicode_decode(content.encode("utf-8"))
@@ -147,6 +190,11 @@ async def anthropic_complete_if_cache(
             logger.error(f"Error in stream response: {str(e)}")
             raise
 
+        if token_counts:
+            report_token_usage(token_counts)
+            if token_tracker:
+                token_tracker.add_usage(token_counts)
+
     return stream_response()
 
 
@@ -238,6 +286,7 @@ async def claude_3_haiku_complete(
     retry=retry_if_exception_type(
         (RateLimitError, APIConnectionError, APITimeoutError)
     ),
+    before_sleep=report_retried_overload,
 )
 async def anthropic_embed(
     texts: list[str],
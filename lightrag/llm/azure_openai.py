@@ -22,8 +22,10 @@ from tenacity import (
 )
 
 from lightrag.utils import (
+    stop_if_binding_retries_disabled,
     wrap_embedding_func_with_attrs,
     safe_unicode_decode,
+    report_retried_overload,
     logger,
 )
 
@@ -31,11 +33,12 @@ import numpy as np
 
 
 @retry(
-    stop=stop_after_attempt(3),
+    stop=stop_after_attempt(3) | stop_if_binding_retries_disabled,
     wait=wait_exponential(multiplier=1, min=4, max=10),
     retry=retry_if_exception_type(
         (RateLimitError, APIConnectionError, APIConnectionError)
     ),
+    before_sleep=report_retried_overload,
 )
 async def azure_openai_complete_if_cache(
     model,
@@ -130,11 +133,12 @@ async def azure_openai_complete(
 
 @wrap_embedding_func_with_attrs(embedding_dim=1536)
 @retry(
-    stop=stop_after_attempt(3),
+    stop=stop_after_attempt(3) | stop_if_binding_retries_disabled,
     wait=wait_exponential(multiplier=1, min=4, max=10),
     retry=retry_if_exception_type(
         (RateLimitError, APIConnectionError, APITimeoutError)
     ),
+    before_sleep=report_retried_overload,
 )
 async def azure_openai_embed(
     texts: list[str],
@@ -0,0 +1,154 @@
+"""
+Shared HTTP client registry for LLM, embedding and rerank bindings.
+
+Bindings used to create a new client for every call, paying a TCP (and TLS)
+handshake per extraction chunk. Clients registered here are kept per
+(binding, endpoint, credentials) and per event loop, so connections are reused
+with keep-alive. Every LightRAG instance holds the registry from
+`initialize_storages` to `finalize_storages`, and the clients are closed when
+the last holder releases it, so finalizing one instance does not close clients
+still used by another.
+
+Pool sizes are read from the environment:
+    LLM_HTTP_MAX_CONNECTIONS: Max concurrent connections per client (default 100)
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: Max idle keep-alive connections per client (default 20)
+    LLM_HTTP_KEEPALIVE_EXPIRY: Seconds an idle connection is kept open (default 30)
+    LLM_HTTP2: Enable HTTP/2 for httpx based clients when `h2` is installed (default true)
+"""
+
+import asyncio
+import inspect
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+from lightrag.utils import get_env_value, logger
+
+
+@dataclass
+class _SharedClient:
+    client: Any
+    loop: asyncio.AbstractEventLoop
+    closer: Optional[Callable[[Any], Awaitable[None]]]
+
+
+_shared_clients: dict[tuple, _SharedClient] = {}
+_holders = 0
+
+
+def get_http_pool_settings() -> dict[str, Any]:
+    """Return connection pool settings for shared clients"""
+    return {
+        "max_connections": get_env_value("LLM_HTTP_MAX_CONNECTIONS", 100, int),
+        "max_keepalive_connections": get_env_value(
+            "LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS", 20, int
+        ),
+        "keepalive_expiry": get_env_value("LLM_HTTP_KEEPALIVE_EXPIRY", 30.0, float),
+        "http2": get_env_value("LLM_HTTP2", True, bool),
+    }
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401 # type: ignore
+
+        return True
+    except ImportError:
+        return False
+
+
+def get_httpx_client_kwargs() -> dict[str, Any]:
+    """Keyword arguments for creating a pooled `httpx.AsyncClient`"""
+    import httpx
+
+    settings = get_http_pool_settings()
+    return {
+        "limits": httpx.Limits(
+            max_connections=settings["max_connections"],
+            max_keepalive_connections=settings["max_keepalive_connections"],
+            keepalive_expiry=settings["keepalive_expiry"],
+        ),
+        "http2": settings["http2"] and _http2_available(),
+    }
+
+
+def get_shared_client(
+    binding: str,
+    key: tuple,
+    factory: Callable[[], Any],
+    closer: Optional[Callable[[Any], Awaitable[None]]] = None,
+) -> Any:
+    """Return the shared client for binding and key, creating it with factory on first use
+
+    Clients are bound to the running event loop, so a client created on another
+    loop is never handed out.
+
+    Args:
+        binding: Binding name, e.g. "openai", "ollama" or "rerank"
+        key: Hashable identity of the client, e.g. (base_url, api_key)
+        factory: Callable creating a new client
+        closer: Coroutine function closing the client, defaults to its aclose()/close()
+
+    Returns:
+        The shared client instance
+    """
+    loop = asyncio.get_running_loop()
+    full_key = (binding, id(loop), *key)
+    entry = _shared_clients.get(full_key)
+    if entry is None or entry.loop is not loop:
+        entry = _SharedClient(client=factory(), loop=loop, closer=closer)
+        _shared_clients[full_key] = entry
+        logger.debug(f"Created shared {binding} client ({len(_shared_clients)} total)")
+    return entry.client
+
+
+async def _close_client(entry: _SharedClient) -> None:
+    if entry.closer is not None:
+        await entry.closer(entry.client)
+        return
+    for method_name in ("aclose", "close"):
+        method = getattr(entry.client, method_name, None)
+        if callable(method):
+            result = method()
+            if inspect.isawaitable(result):
+                await result
+            return
+
+
+def hold_shared_clients() -> None:
+    """Register one more holder (e.g. a LightRAG instance) of the shared clients"""
+    global _holders
+    _holders += 1
+
+
+async def release_shared_clients() -> None:
+    """Release one holder, closing the shared clients once no holder is left"""
+    global _holders
+    _holders = max(_holders - 1, 0)
+    if _holders == 0:
+        await close_shared_clients()
+
+
+async def close_shared_clients() -> None:
+    """Close all shared clients created on the running event loop
+
+    Clients belonging to other (possibly closed) loops are dropped without closing.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    entries = list(_shared_clients.values())
+    _shared_clients.clear()
+    closed = 0
+    for entry in entries:
+        if entry.loop is not loop:
+            continue
+        try:
+            await _close_client(entry)
+            closed += 1
+        except Exception as e:
+            logger.warning(f"Failed to close shared HTTP client: {e}")
+
+    if closed:
+        logger.info(f"Closed {closed} shared HTTP clients")
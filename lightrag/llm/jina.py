@@ -16,7 +16,11 @@ from tenacity import (
     wait_exponential,
     retry_if_exception_type,
 )
-from lightrag.utils import wrap_embedding_func_with_attrs, logger
+from lightrag.utils import (
+    wrap_embedding_func_with_attrs,
+    stop_if_binding_retries_disabled,
+    logger,
+)
 
 
 async def fetch_data(url, headers, data):
@@ -60,7 +64,7 @@ async def fetch_data(url, headers, data):
 
 @wrap_embedding_func_with_attrs(embedding_dim=2048)
 @retry(
-    stop=stop_after_attempt(3),
+    stop=stop_after_attempt(3) | stop_if_binding_retries_disabled,
     wait=wait_exponential(multiplier=1, min=4, max=60),
     retry=(
         retry_if_exception_type(aiohttp.ClientError)
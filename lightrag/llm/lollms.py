@@ -17,6 +17,8 @@ from tenacity import (
     retry_if_exception_type,
 )
 
+from lightrag.utils import stop_if_binding_retries_disabled
+
 from lightrag.exceptions import (
     APIConnectionError,
     RateLimitError,
@@ -28,7 +30,7 @@ import numpy as np
 
 
 @retry(
-    stop=stop_after_attempt(3),
+    stop=stop_after_attempt(3) | stop_if_binding_retries_disabled,
     wait=wait_exponential(multiplier=1, min=4, max=10),
     retry=retry_if_exception_type(
         (RateLimitError, APIConnectionError, APITimeoutError)
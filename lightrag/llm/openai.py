@@ -26,13 +26,21 @@ from tenacity import (
     retry_if_exception_type,
 )
 from lightrag.utils import (
+    stop_if_binding_retries_disabled,
     wrap_embedding_func_with_attrs,
     safe_unicode_decode,
+    report_retried_overload,
+    report_token_usage,
+    compute_mdhash_id,
+    get_env_value,
     logger,
 )
 from lightrag.types import GPTKeywordExtractionFormat
 from lightrag.api import __api_version__
+from lightrag.llm.client_registry import get_shared_client, get_httpx_client_kwargs
 
+import httpx
+import json
 import numpy as np
 import base64
 from typing import Any, Union
@@ -96,8 +104,57 @@ def create_openai_async_client(
     return AsyncOpenAI(**merged_configs)
 
 
+def get_shared_openai_async_client(
+    api_key: str | None = None,
+    base_url: str | None = None,
+    client_configs: dict[str, Any] = None,
+) -> AsyncOpenAI:
+    """Get a pooled AsyncOpenAI client shared by all calls with the same configuration.
+
+    The client keeps its connections alive between calls and is closed when the
+    last LightRAG instance is finalized (see `release_shared_clients`). Callers
+    must not close it.
+
+    Args:
+        api_key: OpenAI API key. If None, uses the OPENAI_API_KEY environment variable.
+        base_url: Base URL for the OpenAI API. If None, uses the default OpenAI API URL.
+        client_configs: Additional configuration options for the AsyncOpenAI client.
+
+    Returns:
+        A shared AsyncOpenAI client instance.
+    """
+    if client_configs is None:
+        client_configs = {}
+    key = (
+        base_url or os.environ.get("OPENAI_API_BASE", "https://api.openai.com/v1"),
+        api_key or os.environ.get("OPENAI_API_KEY"),
+        json.dumps(client_configs, sort_keys=True, default=str),
+    )
+
+    def factory() -> AsyncOpenAI:
+        configs = dict(client_configs)
+        if "http_client" not in configs:
+            configs["http_client"] = httpx.AsyncClient(**get_httpx_client_kwargs())
+        return create_openai_async_client(
+            api_key=api_key, base_url=base_url, client_configs=configs
+        )
+
+    return get_shared_client("openai", key, factory)
+
+
+def _get_token_counts(usage: Any) -> dict[str, int]:
+    """Token counts of an OpenAI usage object, including prompt cache hits"""
+    prompt_details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", 0),
+        "completion_tokens": getattr(usage, "completion_tokens", 0),
+        "total_tokens": getattr(usage, "total_tokens", 0),
+        "cached_tokens": getattr(prompt_details, "cached_tokens", 0) or 0,
+    }
+
+
 @retry(
-    stop=stop_after_attempt(3),
+    stop=stop_after_attempt(3) | stop_if_binding_retries_disabled,
     wait=wait_exponential(multiplier=1, min=4, max=10),
     retry=(
         retry_if_exception_type(RateLimitError)
@@ -105,6 +162,7 @@ def create_openai_async_client(
         | retry_if_exception_type(APITimeoutError)
         | retry_if_exception_type(InvalidResponseError)
     ),
+    before_sleep=report_retried_overload,
 )
 async def openai_complete_if_cache(
     model: str,
@@ -176,8 +234,8 @@ async def openai_complete_if_cache(
     # Extract client configuration options
     client_configs = kwargs.pop("openai_client_configs", {})
 
-    # Create the OpenAI client
-    openai_async_client = create_openai_async_client(
+    # Get the shared OpenAI client (connections are reused across calls)
+    openai_async_client = get_shared_openai_async_client(
         api_key=api_key,
         base_url=base_url,
         client_configs=client_configs,
@@ -201,6 +259,15 @@ async def openai_complete_if_cache(
 
     messages = kwargs.pop("messages", messages)
 
+    # Calls sharing a system prompt (e.g. all extraction calls) share a long
+    # prompt prefix; a common prompt_cache_key routes them to the same cache
+    if system_prompt and get_env_value("OPENAI_PROMPT_CACHE_KEY", False, bool):
+        extra_body = dict(kwargs.get("extra_body") or {})
+        extra_body.setdefault(
+            "prompt_cache_key", compute_mdhash_id(system_prompt, prefix="lightrag-")
+        )
+        kwargs["extra_body"] = extra_body
+
     try:
         # Don't use async with context manager, use client directly
         if "response_format" in kwargs:
@@ -213,21 +280,17 @@ async def openai_complete_if_cache(
             )
     except APIConnectionError as e:
         logger.error(f"OpenAI API Connection Error: {e}")
-        await openai_async_client.close()  # Ensure client is closed
         raise
     except RateLimitError as e:
         logger.error(f"OpenAI API Rate Limit Error: {e}")
-        await openai_async_client.close()  # Ensure client is closed
         raise
     except APITimeoutError as e:
         logger.error(f"OpenAI API Timeout Error: {e}")
-        await openai_async_client.close()  # Ensure client is closed
         raise
     except Exception as e:
         logger.error(
             f"OpenAI API Call Failed,\nModel: {model},\nParams: {kwargs}, Got: {e}"
         )
-        await openai_async_client.close()  # Ensure client is closed
         raise
 
     if hasattr(response, "__aiter__"):
@@ -323,17 +386,15 @@ async def openai_complete_if_cache(
                     cot_active = False
 
                 # After streaming is complete, track token usage
-                if token_tracker and final_chunk_usage:
+                if final_chunk_usage:
                     # Use actual usage from the API
-                    token_counts = {
-                        "prompt_tokens": getattr(final_chunk_usage, "prompt_tokens", 0),
-                        "completion_tokens": getattr(
-                            final_chunk_usage, "completion_tokens", 0
-                        ),
-                        "total_tokens": getattr(final_chunk_usage, "total_tokens", 0),
-                    }
-                    token_tracker.add_usage(token_counts)
-                    logger.debug(f"Streaming token usage (from API): {token_counts}")
+                    token_counts = _get_token_counts(final_chunk_usage)
+                    report_token_usage(token_counts)
+                    if token_tracker:
+                        token_tracker.add_usage(token_counts)
+                        logger.debug(
+                            f"Streaming token usage (from API): {token_counts}"
+                        )
                 elif token_tracker:
                     logger.debug("No usage information available in streaming response")
             except Exception as e:
@@ -361,8 +422,6 @@ async def openai_complete_if_cache(
                         logger.warning(
                             f"Failed to close stream response: {close_error}"
                         )
-                # Ensure client is closed in case of exception
-                await openai_async_client.close()
                 raise
             finally:
                 # Final safety check for unclosed COT tags
@@ -389,93 +448,70 @@ async def openai_complete_if_cache(
                             f"Failed to close stream response in finally block: {close_error}"
                         )
 
-                # This prevents resource leaks since the caller doesn't handle closing
-                try:
-                    await openai_async_client.close()
-                    logger.debug(
-                        "Successfully closed OpenAI client for streaming response"
-                    )
-                except Exception as client_close_error:
-                    logger.warning(
-                        f"Failed to close OpenAI client in streaming finally block: {client_close_error}"
-                    )
-
         return inner()
 
     else:
-        try:
-            if (
-                not response
-                or not response.choices
-                or not hasattr(response.choices[0], "message")
-            ):
-                logger.error("Invalid response from OpenAI API")
-                await openai_async_client.close()  # Ensure client is closed
-                raise InvalidResponseError("Invalid response from OpenAI API")
-
-            message = response.choices[0].message
-            content = getattr(message, "content", None)
-            reasoning_content = getattr(message, "reasoning_content", None)
-
-            # Handle COT logic for non-streaming responses (only if enabled)
-            final_content = ""
-
-            if enable_cot:
-                # Check if we should include reasoning content
-                should_include_reasoning = False
-                if reasoning_content and reasoning_content.strip():
-                    if not content or content.strip() == "":
-                        # Case 1: Only reasoning content, should include COT
-                        should_include_reasoning = True
-                        final_content = (
-                            content or ""
-                        )  # Use empty string if content is None
-                    else:
-                        # Case 3: Both content and reasoning_content present, ignore reasoning
-                        should_include_reasoning = False
-                        final_content = content
+        if (
+            not response
+            or not response.choices
+            or not hasattr(response.choices[0], "message")
+        ):
+            logger.error("Invalid response from OpenAI API")
+            raise InvalidResponseError("Invalid response from OpenAI API")
+
+        message = response.choices[0].message
+        content = getattr(message, "content", None)
+        reasoning_content = getattr(message, "reasoning_content", None)
+
+        # Handle COT logic for non-streaming responses (only if enabled)
+        final_content = ""
+
+        if enable_cot:
+            # Check if we should include reasoning content
+            should_include_reasoning = False
+            if reasoning_content and reasoning_content.strip():
+                if not content or content.strip() == "":
+                    # Case 1: Only reasoning content, should include COT
+                    should_include_reasoning = True
+                    final_content = content or ""  # Use empty string if content is None
                 else:
-                    # No reasoning content, use regular content
-                    final_content = content or ""
-
-                # Apply COT wrapping if needed
-                if should_include_reasoning:
-                    if r"\u" in reasoning_content:
-                        reasoning_content = safe_unicode_decode(
-                            reasoning_content.encode("utf-8")
-                        )
-                    final_content = f"<think>{reasoning_content}</think>{final_content}"
+                    # Case 3: Both content and reasoning_content present, ignore reasoning
+                    should_include_reasoning = False
+                    final_content = content
             else:
-                # COT disabled, only use regular content
+                # No reasoning content, use regular content
                 final_content = content or ""
 
-            # Validate final content
-            if not final_content or final_content.strip() == "":
-                logger.error("Received empty content from OpenAI API")
-                await openai_async_client.close()  # Ensure client is closed
-                raise InvalidResponseError("Received empty content from OpenAI API")
-
-            # Apply Unicode decoding to final content if needed
-            if r"\u" in final_content:
-                final_content = safe_unicode_decode(final_content.encode("utf-8"))
-
-            if token_tracker and hasattr(response, "usage"):
-                token_counts = {
-                    "prompt_tokens": getattr(response.usage, "prompt_tokens", 0),
-                    "completion_tokens": getattr(
-                        response.usage, "completion_tokens", 0
-                    ),
-                    "total_tokens": getattr(response.usage, "total_tokens", 0),
-                }
+            # Apply COT wrapping if needed
+            if should_include_reasoning:
+                if r"\u" in reasoning_content:
+                    reasoning_content = safe_unicode_decode(
+                        reasoning_content.encode("utf-8")
+                    )
+                final_content = f"<think>{reasoning_content}</think>{final_content}"
+        else:
+            # COT disabled, only use regular content
+            final_content = content or ""
+
+        # Validate final content
+        if not final_content or final_content.strip() == "":
+            logger.error("Received empty content from OpenAI API")
+            raise InvalidResponseError("Received empty content from OpenAI API")
+
+        # Apply Unicode decoding to final content if needed
+        if r"\u" in final_content:
+            final_content = safe_unicode_decode(final_content.encode("utf-8"))
+
+        if getattr(response, "usage", None):
+            token_counts = _get_token_counts(response.usage)
+            report_token_usage(token_counts)
+            if token_tracker:
                 token_tracker.add_usage(token_counts)
 
-            logger.debug(f"Response content len: {len(final_content)}")
-            verbose_debug(f"Response: {response}")
+        logger.debug(f"Response content len: {len(final_content)}")
+        verbose_debug(f"Response: {response}")
 
-            return final_content
-        finally:
-            # Ensure client is closed in all cases for non-streaming responses
-            await openai_async_client.close()
+        return final_content
 
 
 async def openai_complete(
@@ -571,13 +607,14 @@ async def nvidia_openai_complete(
 
 @wrap_embedding_func_with_attrs(embedding_dim=1536)
 @retry(
-    stop=stop_after_attempt(3),
+    stop=stop_after_attempt(3) | stop_if_binding_retries_disabled,
     wait=wait_exponential(multiplier=1, min=4, max=60),
     retry=(
         retry_if_exception_type(RateLimitError)
         | retry_if_exception_type(APIConnectionError)
         | retry_if_exception_type(APITimeoutError)
     ),
+    before_sleep=report_retried_overload,
 )
 async def openai_embed(
     texts: list[str],
@@ -605,20 +642,23 @@ async def openai_embed(
         RateLimitError: If the OpenAI API rate limit is exceeded.
         APITimeoutError: If the OpenAI API request times out.
     """
-    # Create the OpenAI client
-    openai_async_client = create_openai_async_client(
+    # Get the shared OpenAI client (connections are reused across calls)
+    openai_async_client = get_shared_openai_async_client(
         api_key=api_key, base_url=base_url, client_configs=client_configs
     )
 
-    async with openai_async_client:
-        response = await openai_async_client.embeddings.create(
-            model=model, input=texts, encoding_format="base64"
-        )
-        return np.array(
-            [
-                np.array(dp.embedding, dtype=np.float32)
-                if isinstance(dp.embedding, list)
-                else np.frombuffer(base64.b64decode(dp.embedding), dtype=np.float32)
-                for dp in response.data
-            ]
+    response = await openai_async_client.embeddings.create(
+        model=model, input=texts, encoding_format="base64"
+    )
+    if getattr(response, "usage", None):
+        report_token_usage(
+            {"total_tokens": getattr(response.usage, "total_tokens", 0) or 0}
         )
+    return np.array(
+        [
+            np.array(dp.embedding, dtype=np.float32)
+            if isinstance(dp.embedding, list)
+            else np.frombuffer(base64.b64decode(dp.embedding), dtype=np.float32)
+            for dp in response.data
+        ]
+    )
@@ -0,0 +1,255 @@
+"""
+Load balancing and failover over identical LLM or embedding endpoints.
+
+A binding function such as `openai_complete_if_cache` talks to the single
+`base_url` (or `host`) it is given. `EndpointRouter` wraps it so that each call
+is sent to one replica from a weighted list, chosen by least outstanding
+requests or by latency EWMA. Replicas failing with connection, timeout or
+server errors are ejected for a while and the call is retried on another one.
+Bindings do not retry (see `binding_retries_disabled`) except on the last
+replica tried, so a failing replica does not hold a call for the backoff of
+the binding.
+
+Endpoints are configured as a comma separated list, with an optional weight
+after `|`:
+
+    LLM_BINDING_HOST=http://gpu1:8000/v1|2,http://gpu2:8000/v1,http://gpu3:8000/v1
+
+Settings read from the environment:
+    ENDPOINT_ROUTING: least_outstanding (default) or latency
+    ENDPOINT_EJECT_FAILURES: Consecutive failures before a replica is ejected (default 3)
+    ENDPOINT_EJECT_SECONDS: How long an ejected replica is skipped (default 30)
+"""
+
+import asyncio
+import random
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any, Awaitable, Callable, Optional
+
+from lightrag.constants import (
+    DEFAULT_ENDPOINT_EJECT_FAILURES,
+    DEFAULT_ENDPOINT_EJECT_SECONDS,
+    DEFAULT_ENDPOINT_ROUTING,
+)
+from tenacity import RetryError
+
+from lightrag.utils import (
+    binding_retries_disabled,
+    get_env_value,
+    is_overload_error,
+    logger,
+)
+
+ROUTING_STRATEGIES = ("least_outstanding", "latency")
+
+
+@dataclass
+class Endpoint:
+    url: str
+    weight: float = 1.0
+    outstanding: int = 0
+    latency_ewma: Optional[float] = None
+    consecutive_failures: int = 0
+    ejected_until: float = 0.0
+    total_requests: int = 0
+    total_failures: int = 0
+
+    def available(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+
+def parse_endpoints(spec: str) -> list[Endpoint]:
+    """Parse `url[|weight],url[|weight],...` into endpoints"""
+    endpoints = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        url, _, weight = item.partition("|")
+        try:
+            endpoint_weight = float(weight) if weight else 1.0
+        except ValueError:
+            raise ValueError(f"Invalid endpoint weight in '{item}'")
+        if endpoint_weight <= 0:
+            raise ValueError(f"Endpoint weight must be positive in '{item}'")
+        endpoints.append(Endpoint(url=url.strip(), weight=endpoint_weight))
+    if not endpoints:
+        raise ValueError(f"No endpoint found in '{spec}'")
+    return endpoints
+
+
+def is_multi_endpoint(spec: Optional[str]) -> bool:
+    """Whether a host setting lists several endpoints or weights"""
+    return bool(spec) and ("," in spec or "|" in spec)
+
+
+def is_failover_error(error: BaseException) -> bool:
+    """Whether an error is caused by the endpoint rather than by the request"""
+    if is_overload_error(error) or isinstance(error, OSError):
+        return True
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(error, "response", None), "status_code", None)
+    if isinstance(status_code, int):
+        return status_code >= 500
+    return "Connect" in type(error).__name__
+
+
+class EndpointRouter:
+    """Routes calls over replicas and fails over to another replica on errors
+
+    Args:
+        endpoints: Replicas to route to
+        strategy: "least_outstanding" picks the replica with the fewest calls in
+            flight per unit of weight, "latency" additionally scales that by
+            the latency EWMA of the replica
+        eject_failures: Consecutive failover errors that eject a replica
+        eject_seconds: How long an ejected replica receives no calls
+        max_attempts: Replicas tried per call (defaults to all of them)
+    """
+
+    def __init__(
+        self,
+        endpoints: list[Endpoint],
+        strategy: str = DEFAULT_ENDPOINT_ROUTING,
+        eject_failures: int = DEFAULT_ENDPOINT_EJECT_FAILURES,
+        eject_seconds: float = DEFAULT_ENDPOINT_EJECT_SECONDS,
+        max_attempts: Optional[int] = None,
+        name: str = "endpoints",
+    ):
+        if not endpoints:
+            raise ValueError("EndpointRouter requires at least one endpoint")
+        if strategy not in ROUTING_STRATEGIES:
+            raise ValueError(
+                f"Unknown routing strategy '{strategy}', expected one of {ROUTING_STRATEGIES}"
+            )
+        self.endpoints = endpoints
+        self.strategy = strategy
+        self.eject_failures = max(1, eject_failures)
+        self.eject_seconds = eject_seconds
+        self.max_attempts = max_attempts or len(endpoints)
+        self.name = name
+
+    @classmethod
+    def from_spec(cls, spec: str, name: str = "endpoints") -> "EndpointRouter":
+        """Create a router from an endpoint list and the ENDPOINT_* environment settings"""
+        return cls(
+            parse_endpoints(spec),
+            strategy=get_env_value("ENDPOINT_ROUTING", DEFAULT_ENDPOINT_ROUTING),
+            eject_failures=get_env_value(
+                "ENDPOINT_EJECT_FAILURES", DEFAULT_ENDPOINT_EJECT_FAILURES, int
+            ),
+            eject_seconds=get_env_value(
+                "ENDPOINT_EJECT_SECONDS", DEFAULT_ENDPOINT_EJECT_SECONDS, float
+            ),
+            name=name,
+        )
+
+    def _score(self, endpoint: Endpoint, default_latency: float) -> float:
+        load = (endpoint.outstanding + 1) / endpoint.weight
+        if self.strategy == "latency":
+            load *= endpoint.latency_ewma or default_latency
+        return load
+
+    def pick(self, exclude: Optional[set] = None) -> Endpoint:
+        """Choose the replica for the next call, skipping `exclude` when possible"""
+        exclude = exclude or set()
+        now = time.monotonic()
+        pool = [e for e in self.endpoints if e.url not in exclude] or self.endpoints
+        healthy = [e for e in pool if e.available(now)]
+        if not healthy:
+            # Every replica is ejected: probe the one coming back first
+            return min(pool, key=lambda e: e.ejected_until)
+        # Replicas without measurements count as fast as the fastest one
+        measured = [e.latency_ewma for e in healthy if e.latency_ewma]
+        default_latency = min(measured) if measured else 1.0
+        scores = [self._score(e, default_latency) for e in healthy]
+        best = min(scores)
+        return random.choice([e for e, s in zip(healthy, scores) if s == best])
+
+    def _record_success(self, endpoint: Endpoint, latency: float) -> None:
+        endpoint.consecutive_failures = 0
+        if endpoint.latency_ewma is None:
+            endpoint.latency_ewma = latency
+        else:
+            endpoint.latency_ewma += (latency - endpoint.latency_ewma) * 0.2
+
+    def _record_failure(self, endpoint: Endpoint, error: BaseException) -> None:
+        endpoint.total_failures += 1
+        endpoint.consecutive_failures += 1
+        if endpoint.consecutive_failures >= self.eject_failures:
+            endpoint.ejected_until = time.monotonic() + self.eject_seconds
+            endpoint.consecutive_failures = 0
+            logger.warning(
+                f"{self.name}: Ejecting {endpoint.url} for {self.eject_seconds}s after error: {error}"
+            )
+
+    async def call(self, func: Callable[[Endpoint], Awaitable[Any]]) -> Any:
+        """Run `func(endpoint)` on a replica, failing over to others on endpoint errors"""
+        tried: set = set()
+        while True:
+            endpoint = self.pick(tried)
+            tried.add(endpoint.url)
+            last_attempt = len(tried) >= min(self.max_attempts, len(self.endpoints))
+            endpoint.outstanding += 1
+            endpoint.total_requests += 1
+            start = time.monotonic()
+            try:
+                with nullcontext() if last_attempt else binding_retries_disabled():
+                    result = await func(endpoint)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Bindings wrap the error of their final attempt in RetryError
+                error = e
+                if isinstance(e, RetryError) and e.last_attempt.failed:
+                    error = e.last_attempt.exception()
+                if not is_failover_error(error):
+                    raise
+                self._record_failure(endpoint, error)
+                if last_attempt:
+                    raise
+                logger.info(
+                    f"{self.name}: {endpoint.url} failed ({type(error).__name__}), retrying on another endpoint"
+                )
+                continue
+            finally:
+                endpoint.outstanding -= 1
+            self._record_success(endpoint, time.monotonic() - start)
+            return result
+
+    def wrap(self, func: Callable[..., Awaitable[Any]], url_param: str = "base_url"):
+        """Wrap a binding function so its `url_param` argument is set by the router"""
+
+        @wraps(func)
+        async def routed(*args, **kwargs):
+            async def call_endpoint(endpoint: Endpoint):
+                return await func(*args, **{**kwargs, url_param: endpoint.url})
+
+            return await self.call(call_endpoint)
+
+        routed.router = self
+        return routed
+
+    def get_stats(self) -> dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "strategy": self.strategy,
+            "endpoints": [
+                {
+                    "url": e.url,
+                    "weight": e.weight,
+                    "outstanding": e.outstanding,
+                    "latency_ewma": round(e.latency_ewma, 3)
+                    if e.latency_ewma is not None
+                    else None,
+                    "ejected": not e.available(now),
+                    "requests": e.total_requests,
+                    "failures": e.total_failures,
+                }
+                for e in self.endpoints
+            ],
+        }
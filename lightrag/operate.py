@@ -4,7 +4,9 @@ from functools import partial
 import asyncio
 import json
 import json_repair
-from typing import Any, AsyncIterator, overload, Literal
+import random
+import re
+from typing import Any, AsyncIterator, Iterable, Iterator, overload, Literal
 from collections import Counter, defaultdict
 
 from .utils import (
@@ -20,6 +22,8 @@ from .utils import (
     handle_cache,
     save_to_cache,
     CacheData,
+    generate_cache_key,
+    sanitize_text_for_encoding,
     use_llm_func_with_cache,
     update_chunk_cache_list,
     remove_think_tags,
@@ -42,6 +46,7 @@ from .base import (
 from .prompt import PROMPTS
 from .constants import (
     GRAPH_FIELD_SEP,
+    DEFAULT_VDB_UPSERT_BATCH_SIZE,
     DEFAULT_MAX_ENTITY_TOKENS,
     DEFAULT_MAX_RELATION_TOKENS,
     DEFAULT_MAX_TOTAL_TOKENS,
@@ -115,6 +120,69 @@ def chunking_by_token_size(
     return results
 
 
+def iter_text_segments(content: str, segment_size: int = 65536) -> Iterator[str]:
+    """Yield consecutive slices of content of about segment_size characters
+
+    Slices are cut after a newline where possible so that tokenizing each slice
+    separately gives nearly the same tokens as tokenizing the whole text.
+    """
+    start = 0
+    length = len(content)
+    while start < length:
+        end = min(start + segment_size, length)
+        if end < length:
+            newline = content.rfind("\n", start, end)
+            if newline > start:
+                end = newline + 1
+        yield content[start:end]
+        start = end
+
+
+def chunking_by_token_size_streaming(
+    tokenizer: Tokenizer,
+    segments: Iterable[str],
+    overlap_token_size: int = 128,
+    max_token_size: int = 1024,
+) -> Iterator[dict[str, Any]]:
+    """Split a stream of text segments into overlapping token windows
+
+    Produces the same kind of chunks as `chunking_by_token_size` without a
+    split character, but only keeps one window of tokens in memory, so the
+    input can be a generator of paragraphs or pages of an arbitrarily large
+    document.
+
+    Raises:
+        ValueError: If overlap_token_size is not smaller than max_token_size
+    """
+    step = max_token_size - overlap_token_size
+    if step <= 0:
+        raise ValueError(
+            f"overlap_token_size ({overlap_token_size}) must be smaller than max_token_size ({max_token_size})"
+        )
+    buffer: list[int] = []
+    index = 0
+    for segment in segments:
+        if not segment:
+            continue
+        buffer.extend(tokenizer.encode(segment))
+        while len(buffer) >= max_token_size:
+            yield {
+                "tokens": max_token_size,
+                "content": tokenizer.decode(buffer[:max_token_size]).strip(),
+                "chunk_order_index": index,
+            }
+            index += 1
+            buffer = buffer[step:]
+
+    # Emit the tail unless it only consists of the overlap of the last window
+    if buffer and (index == 0 or len(buffer) > overlap_token_size):
+        yield {
+            "tokens": len(buffer),
+            "content": tokenizer.decode(buffer).strip(),
+            "chunk_order_index": index,
+        }
+
+
 async def _handle_entity_relation_summary(
     description_type: str,
     entity_or_relation_name: str,
@@ -1573,6 +1641,126 @@ async def _merge_edges_then_upsert(
     return edge_data
 
 
+def _entity_vdb_record(entity_data: dict) -> tuple[str, dict]:
+    """Vector database id and record of a merged entity"""
+    entity_name = entity_data["entity_name"]
+    return compute_mdhash_id(entity_name, prefix="ent-"), {
+        "entity_name": entity_name,
+        "entity_type": entity_data["entity_type"],
+        "content": f"{entity_name}\n{entity_data['description']}",
+        "source_id": entity_data["source_id"],
+        "file_path": entity_data.get("file_path", "unknown_source"),
+    }
+
+
+def _relation_vdb_record(edge_data: dict) -> tuple[str, dict]:
+    """Vector database id and record of a merged relation"""
+    src_id, tgt_id = edge_data["src_id"], edge_data["tgt_id"]
+    return compute_mdhash_id(src_id + tgt_id, prefix="rel-"), {
+        "src_id": src_id,
+        "tgt_id": tgt_id,
+        "keywords": edge_data["keywords"],
+        "content": f"{src_id}\t{tgt_id}\n{edge_data['keywords']}\n{edge_data['description']}",
+        "source_id": edge_data["source_id"],
+        "file_path": edge_data.get("file_path", "unknown_source"),
+        "weight": edge_data.get("weight", 1.0),
+    }
+
+
+async def _flush_vdb_upserts(
+    vdb: BaseVectorStorage,
+    records: dict[str, dict],
+    reload_records,
+    lock_namespace: str,
+    operation_name: str,
+    doc_id: str,
+    batch_size: int = DEFAULT_VDB_UPSERT_BATCH_SIZE,
+) -> int:
+    """Write buffered vector records of one merge phase as batched upserts
+
+    The graph locks are released before the flush, so another document may have
+    merged the same entities or relations since they were buffered. Each batch
+    rebuilds its records from the graph and writes those that differ from the
+    stored ones without holding any lock, since the upsert embeds the content.
+    The written records are then compared with the graph again: a record merged
+    by another document in the meantime is rebuilt and rewritten under the graph
+    keyed lock of that record only, so the last vector written always matches
+    the graph.
+
+    A record is written (and embedded) whenever one of its stored fields
+    differs, so source_id and file_path never go stale. Records equal to the
+    stored ones are not written and keep their created_at.
+
+    Args:
+        vdb: Vector storage to write to
+        records: Buffered records by vector id
+        reload_records: Async callable rebuilding the current records of the given ones from the graph
+        lock_namespace: Namespace of the graph keyed locks
+        operation_name: Operation name for logging
+        doc_id: Document the records belong to, reported on failure
+        batch_size: Records written per upsert
+
+    Returns:
+        int: Number of records written
+    """
+    if vdb is None or not records:
+        return 0
+
+    compared_fields = set(vdb.meta_fields) | {"content"}
+
+    async def changed_records(batch: dict[str, dict]) -> dict[str, dict]:
+        current = await reload_records(batch)
+        stored = {
+            record["id"]: record
+            for record in await vdb.get_by_ids(list(current))
+            if record and record.get("id")
+        }
+        return {
+            vdb_id: record
+            for vdb_id, record in current.items()
+            if vdb_id not in stored
+            or any(
+                stored[vdb_id].get(field) != record.get(field)
+                for field in compared_fields
+                if field in record
+            )
+        }
+
+    async def write(changed: dict[str, dict]) -> None:
+        await safe_vdb_operation_with_exception(
+            operation=lambda: vdb.upsert(changed),
+            operation_name=operation_name,
+            entity_name=f"{len(changed)} records of {doc_id}",
+            max_retries=3,
+            retry_delay=0.1,
+        )
+
+    written = 0
+    items = list(records.items())
+    for start in range(0, len(items), batch_size):
+        changed = await changed_records(dict(items[start : start + batch_size]))
+        if not changed:
+            continue
+        await write(changed)
+        written += len(changed)
+
+        # Normally empty: records another document merged while this batch was
+        # being embedded, whose vector may have been overwritten by a stale one
+        for vdb_id, record in (await changed_records(changed)).items():
+            lock_keys = (
+                [record["entity_name"]]
+                if "entity_name" in record
+                else sorted({record["src_id"], record["tgt_id"]})
+            )
+            async with get_storage_keyed_lock(
+                lock_keys, namespace=lock_namespace, enable_logging=False
+            ):
+                stale = await changed_records({vdb_id: record})
+                if stale:
+                    await write(stale)
+    return written
+
+
 async def merge_nodes_and_edges(
     chunk_results: list,
     knowledge_graph_inst: BaseGraphStorage,
@@ -1596,6 +1784,9 @@ async def merge_nodes_and_edges(
     2. Phase 2: Process all relationships concurrently (may add missing entities)
     3. Phase 3: Update full_entities and full_relations storage with final results
 
+    Entity and relation vectors are buffered while the graph locks are held and
+    written as batched upserts at the end of phases 1 and 2.
+
     Args:
         chunk_results: List of tuples (maybe_nodes, maybe_edges) containing extracted entities and relationships
         knowledge_graph_inst: Knowledge graph storage
@@ -1640,6 +1831,62 @@ async def merge_nodes_and_edges(
     graph_max_async = global_config.get("llm_model_max_async", 4) * 2
     semaphore = asyncio.Semaphore(graph_max_async)
 
+    workspace = global_config.get("workspace", "")
+    graph_lock_namespace = f"{workspace}:GraphDB" if workspace else "GraphDB"
+
+    # Write-behind buffers of the vector records, flushed at the end of each phase
+    entity_vdb_buffer: dict[str, dict] = {}
+    relationships_vdb_buffer: dict[str, dict] = {}
+
+    async def _reload_entity_records(records: dict[str, dict]) -> dict[str, dict]:
+        nodes = await knowledge_graph_inst.get_nodes_batch(
+            [record["entity_name"] for record in records.values()]
+        )
+        return dict(
+            _entity_vdb_record({**node, "entity_name": entity_name})
+            for entity_name, node in nodes.items()
+        )
+
+    async def _reload_relation_records(records: dict[str, dict]) -> dict[str, dict]:
+        edges = await knowledge_graph_inst.get_edges_batch(
+            [
+                {"src": record["src_id"], "tgt": record["tgt_id"]}
+                for record in records.values()
+            ]
+        )
+        return dict(
+            _relation_vdb_record({**edge, "src_id": src_id, "tgt_id": tgt_id})
+            for (src_id, tgt_id), edge in edges.items()
+        )
+
+    async def _flush_vdb_buffer(vdb, buffer, reload_records, operation_name):
+        """Flush a write-behind buffer, failing the document if the writes fail"""
+        if vdb is None or not buffer:
+            return
+        try:
+            written = await _flush_vdb_upserts(
+                vdb,
+                buffer,
+                reload_records,
+                graph_lock_namespace,
+                operation_name,
+                doc_id,
+                batch_size=global_config.get(
+                    "vdb_upsert_batch_size", DEFAULT_VDB_UPSERT_BATCH_SIZE
+                ),
+            )
+        except Exception as e:
+            error_msg = f"Critical error in {operation_name} for {doc_id}: {e}"
+            logger.error(error_msg)
+            async with pipeline_status_lock:
+                pipeline_status["latest_message"] = error_msg
+                pipeline_status["history_messages"].append(error_msg)
+            raise create_prefixed_exception(e, f"{doc_id}") from e
+        logger.info(
+            f"{operation_name}: {written} vectors written, {len(buffer) - written} unchanged skipped for {doc_id}"
+        )
+        buffer.clear()
+
     # ===== Phase 1: Process all entities concurrently =====
     log_message = f"Phase 1: Processing {total_entities_count} entities from {doc_id} (async: {graph_max_async})"
     logger.info(log_message)
@@ -1666,30 +1913,10 @@ async def merge_nodes_and_edges(
                         llm_response_cache,
                     )
 
-                    # Vector database operation (equally critical, must succeed)
+                    # Vector database writes are flushed in batches after the phase
                     if entity_vdb is not None and entity_data:
-                        data_for_vdb = {
-                            compute_mdhash_id(
-                                entity_data["entity_name"], prefix="ent-"
-                            ): {
-                                "entity_name": entity_data["entity_name"],
-                                "entity_type": entity_data["entity_type"],
-                                "content": f"{entity_data['entity_name']}\n{entity_data['description']}",
-                                "source_id": entity_data["source_id"],
-                                "file_path": entity_data.get(
-                                    "file_path", "unknown_source"
-                                ),
-                            }
-                        }
-
-                        # Use safe operation wrapper - VDB failure must throw exception
-                        await safe_vdb_operation_with_exception(
-                            operation=lambda: entity_vdb.upsert(data_for_vdb),
-                            operation_name="entity_upsert",
-                            entity_name=entity_name,
-                            max_retries=3,
-                            retry_delay=0.1,
-                        )
+                        vdb_id, vdb_record = _entity_vdb_record(entity_data)
+                        entity_vdb_buffer[vdb_id] = vdb_record
 
                     return entity_data
 
@@ -1763,6 +1990,10 @@ async def merge_nodes_and_edges(
         # If all tasks completed successfully, collect results
         processed_entities = [task.result() for task in entity_tasks]
 
+    await _flush_vdb_buffer(
+        entity_vdb, entity_vdb_buffer, _reload_entity_records, "entity_upsert"
+    )
+
     # ===== Phase 2: Process all relationships concurrently =====
     log_message = f"Phase 2: Processing {total_relations_count} relations from {doc_id} (async: {graph_max_async})"
     logger.info(log_message)
@@ -1800,61 +2031,14 @@ async def merge_nodes_and_edges(
                     if edge_data is None:
                         return None, []
 
-                    # Vector database operation (equally critical, must succeed)
+                    # Vector database writes are flushed in batches after the phase
                     if relationships_vdb is not None:
-                        data_for_vdb = {
-                            compute_mdhash_id(
-                                edge_data["src_id"] + edge_data["tgt_id"], prefix="rel-"
-                            ): {
-                                "src_id": edge_data["src_id"],
-                                "tgt_id": edge_data["tgt_id"],
-                                "keywords": edge_data["keywords"],
-                                "content": f"{edge_data['src_id']}\t{edge_data['tgt_id']}\n{edge_data['keywords']}\n{edge_data['description']}",
-                                "source_id": edge_data["source_id"],
-                                "file_path": edge_data.get(
-                                    "file_path", "unknown_source"
-                                ),
-                                "weight": edge_data.get("weight", 1.0),
-                            }
-                        }
-
-                        # Use safe operation wrapper - VDB failure must throw exception
-                        await safe_vdb_operation_with_exception(
-                            operation=lambda: relationships_vdb.upsert(data_for_vdb),
-                            operation_name="relationship_upsert",
-                            entity_name=f"{edge_data['src_id']}-{edge_data['tgt_id']}",
-                            max_retries=3,
-                            retry_delay=0.1,
-                        )
-
-                    # Update added_entities to entity vector database using safe operation wrapper
-                    if added_entities and entity_vdb is not None:
+                        vdb_id, vdb_record = _relation_vdb_record(edge_data)
+                        relationships_vdb_buffer[vdb_id] = vdb_record
+                    if entity_vdb is not None:
                         for entity_data in added_entities:
-                            entity_vdb_id = compute_mdhash_id(
-                                entity_data["entity_name"], prefix="ent-"
-                            )
-                            entity_content = f"{entity_data['entity_name']}\n{entity_data['description']}"
-
-                            vdb_data = {
-                                entity_vdb_id: {
-                                    "content": entity_content,
-                                    "entity_name": entity_data["entity_name"],
-                                    "source_id": entity_data["source_id"],
-                                    "entity_type": entity_data["entity_type"],
-                                    "file_path": entity_data.get(
-                                        "file_path", "unknown_source"
-                                    ),
-                                }
-                            }
-
-                            # Use safe operation wrapper - VDB failure must throw exception
-                            await safe_vdb_operation_with_exception(
-                                operation=lambda data=vdb_data: entity_vdb.upsert(data),
-                                operation_name="added_entity_upsert",
-                                entity_name=entity_data["entity_name"],
-                                max_retries=3,
-                                retry_delay=0.1,
-                            )
+                            vdb_id, vdb_record = _entity_vdb_record(entity_data)
+                            entity_vdb_buffer[vdb_id] = vdb_record
 
                     return edge_data, added_entities
 
@@ -1932,6 +2116,16 @@ async def merge_nodes_and_edges(
                 processed_edges.append(edge_data)
             all_added_entities.extend(added_entities)
 
+    await _flush_vdb_buffer(
+        relationships_vdb,
+        relationships_vdb_buffer,
+        _reload_relation_records,
+        "relationship_upsert",
+    )
+    await _flush_vdb_buffer(
+        entity_vdb, entity_vdb_buffer, _reload_entity_records, "added_entity_upsert"
+    )
+
     # ===== Phase 3: Update full_entities and full_relations storage =====
     if full_entities_storage and full_relations_storage and doc_id:
         try:
@@ -2004,6 +2198,146 @@ async def merge_nodes_and_edges(
         pipeline_status["history_messages"].append(log_message)
 
 
+def _merge_gleaning_result(
+    maybe_nodes: dict, maybe_edges: dict, glean_nodes: dict, glean_edges: dict
+) -> int:
+    """Merge gleaning records into the initial ones, keeping the longer description
+
+    Returns:
+        int: Number of records the gleaning pass added or improved
+    """
+    changed = 0
+    for entity_name, glean_entities in glean_nodes.items():
+        if entity_name in maybe_nodes:
+            # Compare description lengths and keep the better one
+            original_desc_len = len(
+                maybe_nodes[entity_name][0].get("description", "") or ""
+            )
+            glean_desc_len = len(glean_entities[0].get("description", "") or "")
+
+            if glean_desc_len > original_desc_len:
+                maybe_nodes[entity_name] = list(glean_entities)
+                changed += 1
+            # Otherwise keep original version
+        else:
+            # New entity from gleaning stage
+            maybe_nodes[entity_name] = list(glean_entities)
+            changed += 1
+
+    for edge_key, glean_edge_list in glean_edges.items():
+        if edge_key in maybe_edges:
+            # Compare description lengths and keep the better one
+            original_desc_len = len(
+                maybe_edges[edge_key][0].get("description", "") or ""
+            )
+            glean_desc_len = len(glean_edge_list[0].get("description", "") or "")
+
+            if glean_desc_len > original_desc_len:
+                maybe_edges[edge_key] = list(glean_edge_list)
+                changed += 1
+            # Otherwise keep original version
+        else:
+            # New edge from gleaning stage
+            maybe_edges[edge_key] = list(glean_edge_list)
+            changed += 1
+    return changed
+
+
+class GleaningPolicy:
+    """Decides per chunk whether the gleaning pass of entity extraction pays off
+
+    Chunks are bucketed by their length (quarters of chunk_token_size) and the
+    record density of the first pass. For every bucket the policy learns how
+    often gleaning added or improved records in this corpus, and skips the
+    gleaning call where that yield is below min_yield. A first pass without
+    completion delimiter (truncated output) is always gleaned, and a small share
+    of skipped chunks is still gleaned to keep the statistics current.
+
+    Args:
+        chunk_token_size: Chunk size of the corpus, used for length buckets
+        min_yield: Minimum estimated share of productive gleaning calls
+        warmup: Number of gleaning calls observed before any is skipped
+        explore: Probability of gleaning a chunk the policy would skip
+    """
+
+    def __init__(
+        self,
+        chunk_token_size: int = 1200,
+        min_yield: float = 0.2,
+        warmup: int = 20,
+        explore: float = 0.1,
+    ):
+        self.chunk_token_size = max(chunk_token_size, 1)
+        self.min_yield = min_yield
+        self.warmup = warmup
+        self.explore = explore
+        # bucket -> [gleaning calls, productive gleaning calls]
+        self._stats: dict[tuple[int, int], list[int]] = defaultdict(lambda: [0, 0])
+        self.observed = 0
+
+    def _bucket(self, tokens: int, record_count: int) -> tuple[int, int]:
+        length = min(int(4 * tokens / self.chunk_token_size), 3)
+        density = record_count * 100 / max(tokens, 1)  # records per 100 tokens
+        return length, 0 if density < 1 else 1 if density < 3 else 2
+
+    def estimated_yield(self, tokens: int, record_count: int) -> float:
+        calls, productive = self._stats[self._bucket(tokens, record_count)]
+        # Uniform prior: buckets without observations start at 0.5
+        return (productive + 1) / (calls + 2)
+
+    def should_glean(self, tokens: int, record_count: int, truncated: bool) -> bool:
+        if truncated or self.observed < self.warmup:
+            return True
+        if self.estimated_yield(tokens, record_count) >= self.min_yield:
+            return True
+        return random.random() < self.explore
+
+    def record(self, tokens: int, record_count: int, productive: bool) -> None:
+        """Record the outcome of a gleaning call"""
+        stats = self._stats[self._bucket(tokens, record_count)]
+        stats[0] += 1
+        stats[1] += int(productive)
+        self.observed += 1
+
+
+def _pack_chunks(
+    ordered_chunks: list[tuple[str, TextChunkSchema]], pack_size: int, max_tokens: int
+) -> list[list[tuple[str, TextChunkSchema]]]:
+    """Group consecutive chunks into packs of at most pack_size chunks and max_tokens tokens"""
+    packs: list[list[tuple[str, TextChunkSchema]]] = []
+    pack_tokens = 0
+    for chunk in ordered_chunks:
+        tokens = chunk[1].get("tokens", max_tokens)
+        if packs and len(packs[-1]) < pack_size and pack_tokens + tokens <= max_tokens:
+            packs[-1].append(chunk)
+            pack_tokens += tokens
+        else:
+            packs.append([chunk])
+            pack_tokens = tokens
+    return packs
+
+
+def _split_packed_result(
+    result: str, section_count: int, section_delimiter: str
+) -> dict[int, str]:
+    """Split the output of a packed extraction into the records of each section"""
+    section_pattern = re.compile(
+        rf"^\s*{re.escape(section_delimiter)}\s*(\d+)\s*$", re.IGNORECASE
+    )
+    sections: dict[int, list[str]] = {}
+    current = None
+    for line in result.splitlines():
+        match = section_pattern.match(line)
+        if match:
+            number = int(match.group(1))
+            current = number if 1 <= number <= section_count else None
+            if current is not None:
+                sections.setdefault(current, [])
+        elif current is not None:
+            sections[current].append(line)
+    return {number: "\n".join(lines) for number, lines in sections.items()}
+
+
 async def extract_entities(
     chunks: dict[str, TextChunkSchema],
     global_config: dict[str, str],
@@ -2011,6 +2345,7 @@ async def extract_entities(
     pipeline_status_lock=None,
     llm_response_cache: BaseKVStorage | None = None,
     text_chunks_storage: BaseKVStorage | None = None,
+    gleaning_policy: GleaningPolicy | None = None,
 ) -> list:
     use_llm_func: callable = global_config["llm_model_func"]
     entity_extract_max_gleaning = global_config["entity_extract_max_gleaning"]
@@ -2040,9 +2375,32 @@ async def extract_entities(
         examples=examples,
         language=language,
     )
+    # Identical for all chunks, so providers can serve it from their prompt cache
+    entity_extraction_system_prompt = PROMPTS["entity_extraction_system_prompt"].format(
+        **context_base
+    )
 
     processed_chunks = 0
     total_chunks = len(ordered_chunks)
+    gleaning_calls = 0
+    gleaning_skipped = 0
+
+    def _should_glean(first_pass: list[tuple[int, int]], truncated: bool) -> bool:
+        """Ask the gleaning policy whether one gleaning call is worth making
+
+        Args:
+            first_pass: (tokens, record count) of every chunk the call covers
+            truncated: Whether the first pass output lacks the completion delimiter
+        """
+        nonlocal gleaning_calls, gleaning_skipped
+        if gleaning_policy is None or any(
+            gleaning_policy.should_glean(tokens, record_count, truncated)
+            for tokens, record_count in first_pass
+        ):
+            gleaning_calls += 1
+            return True
+        gleaning_skipped += 1
+        return False
 
     async def _process_single_content(chunk_key_dp: tuple[str, TextChunkSchema]):
         """Process a single chunk
@@ -2052,7 +2410,6 @@ async def extract_entities(
         Returns:
             tuple: (maybe_nodes, maybe_edges) containing extracted entities and relationships
         """
-        nonlocal processed_chunks
         chunk_key = chunk_key_dp[0]
         chunk_dp = chunk_key_dp[1]
         content = chunk_dp["content"]
@@ -2063,9 +2420,6 @@ async def extract_entities(
         cache_keys_collector = []
 
         # Get initial extraction
-        entity_extraction_system_prompt = PROMPTS[
-            "entity_extraction_system_prompt"
-        ].format(**{**context_base, "input_text": content})
         entity_extraction_user_prompt = PROMPTS["entity_extraction_user_prompt"].format(
             **{**context_base, "input_text": content}
         )
@@ -2098,7 +2452,13 @@ async def extract_entities(
         )
 
         # Process additional gleaning results only 1 time when entity_extract_max_gleaning is greater than zero.
-        if entity_extract_max_gleaning > 0:
+        record_count = len(maybe_nodes) + len(maybe_edges)
+        truncated = (
+            context_base["completion_delimiter"].lower() not in final_result.lower()
+        )
+        if entity_extract_max_gleaning > 0 and _should_glean(
+            [(chunk_dp.get("tokens", 0), record_count)], truncated
+        ):
             glean_result, timestamp = await use_llm_func_with_cache(
                 entity_continue_extraction_user_prompt,
                 use_llm_func,
@@ -2120,37 +2480,23 @@ async def extract_entities(
                 completion_delimiter=context_base["completion_delimiter"],
             )
 
-            # Merge results - compare description lengths to choose better version
-            for entity_name, glean_entities in glean_nodes.items():
-                if entity_name in maybe_nodes:
-                    # Compare description lengths and keep the better one
-                    original_desc_len = len(
-                        maybe_nodes[entity_name][0].get("description", "") or ""
-                    )
-                    glean_desc_len = len(glean_entities[0].get("description", "") or "")
-
-                    if glean_desc_len > original_desc_len:
-                        maybe_nodes[entity_name] = list(glean_entities)
-                    # Otherwise keep original version
-                else:
-                    # New entity from gleaning stage
-                    maybe_nodes[entity_name] = list(glean_entities)
-
-            for edge_key, glean_edges in glean_edges.items():
-                if edge_key in maybe_edges:
-                    # Compare description lengths and keep the better one
-                    original_desc_len = len(
-                        maybe_edges[edge_key][0].get("description", "") or ""
-                    )
-                    glean_desc_len = len(glean_edges[0].get("description", "") or "")
+            changed = _merge_gleaning_result(
+                maybe_nodes, maybe_edges, glean_nodes, glean_edges
+            )
+            if gleaning_policy is not None:
+                gleaning_policy.record(
+                    chunk_dp.get("tokens", 0), record_count, changed > 0
+                )
 
-                    if glean_desc_len > original_desc_len:
-                        maybe_edges[edge_key] = list(glean_edges)
-                    # Otherwise keep original version
-                else:
-                    # New edge from gleaning stage
-                    maybe_edges[edge_key] = list(glean_edges)
+        return await _finish_chunk(
+            chunk_key, maybe_nodes, maybe_edges, cache_keys_collector
+        )
 
+    async def _finish_chunk(
+        chunk_key: str, maybe_nodes: dict, maybe_edges: dict, cache_keys_collector: list
+    ):
+        """Record the cache keys of a chunk and report its extraction progress"""
+        nonlocal processed_chunks
         # Batch update chunk's llm_cache_list with all collected cache keys
         if cache_keys_collector and text_chunks_storage:
             await update_chunk_cache_list(
@@ -2173,22 +2519,243 @@ async def extract_entities(
         # Return the extracted nodes and edges for centralized processing
         return maybe_nodes, maybe_edges
 
+    async def _process_packed_contents(pack: list[tuple[str, TextChunkSchema]]):
+        """Extract several small chunks with one LLM request (and one gleaning request)
+
+        Records are routed back to their chunk by the section lines of the output.
+        Cache entries are still written per chunk: the initial extraction of a chunk
+        uses the same cache key as extracting it on its own, so deletion, rebuild
+        and later unpacked runs find them.
+
+        Returns:
+            list: (maybe_nodes, maybe_edges) of every chunk of the pack
+        """
+        safe_system_prompt = sanitize_text_for_encoding(entity_extraction_system_prompt)
+        cache_enabled = (
+            llm_response_cache is not None
+            and llm_response_cache.global_config.get(
+                "enable_llm_cache_for_entity_extract"
+            )
+        )
+        results = []
+        pending = []
+        for chunk_key, chunk_dp in pack:
+            user_prompt = PROMPTS["entity_extraction_user_prompt"].format(
+                **{**context_base, "input_text": chunk_dp["content"]}
+            )
+            cache_prompt = "\n".join(
+                [sanitize_text_for_encoding(user_prompt), safe_system_prompt]
+            )
+            cache_hashes = [compute_args_hash(cache_prompt)]
+            if entity_extract_max_gleaning > 0:
+                cache_hashes.append(compute_args_hash(cache_prompt, "packed_gleaning"))
+
+            # The gleaning entry is optional, the policy may have skipped gleaning
+            cached_results = []
+            for args_hash in cache_hashes:
+                cached = await handle_cache(
+                    llm_response_cache,
+                    args_hash,
+                    cache_prompt,
+                    "default",
+                    cache_type="extract",
+                )
+                if cached is None:
+                    break
+                cached_results.append(cached)
+
+            if not cached_results:
+                pending.append((chunk_key, chunk_dp, cache_prompt, cache_hashes))
+                continue
+
+            file_path = chunk_dp.get("file_path", "unknown_source")
+            maybe_nodes, maybe_edges = {}, {}
+            for i, (cached_text, timestamp) in enumerate(cached_results):
+                nodes, edges = await _process_extraction_result(
+                    cached_text,
+                    chunk_key,
+                    timestamp,
+                    file_path,
+                    tuple_delimiter=context_base["tuple_delimiter"],
+                    completion_delimiter=context_base["completion_delimiter"],
+                )
+                if i == 0:
+                    maybe_nodes, maybe_edges = nodes, edges
+                else:
+                    _merge_gleaning_result(maybe_nodes, maybe_edges, nodes, edges)
+            cache_keys = [
+                generate_cache_key("default", "extract", args_hash)
+                for args_hash in cache_hashes[: len(cached_results)]
+            ]
+            results.append(
+                await _finish_chunk(chunk_key, maybe_nodes, maybe_edges, cache_keys)
+            )
+
+        if len(pending) == 1:
+            chunk_key, chunk_dp = pending[0][:2]
+            results.append(await _process_single_content((chunk_key, chunk_dp)))
+            return results
+        if not pending:
+            return results
+
+        section_delimiter = PROMPTS["DEFAULT_SECTION_DELIMITER"]
+        input_sections = "\n".join(
+            PROMPTS["entity_extraction_packed_section"].format(
+                section_delimiter=section_delimiter,
+                section_number=i + 1,
+                input_text=chunk_dp["content"],
+            )
+            for i, (_, chunk_dp, _, _) in enumerate(pending)
+        )
+        packed_context = {
+            **context_base,
+            "section_count": len(pending),
+            "section_delimiter": section_delimiter,
+            "input_sections": input_sections,
+        }
+        packed_user_prompt = PROMPTS["entity_extraction_packed_user_prompt"].format(
+            **packed_context
+        )
+        final_result, timestamp = await use_llm_func_with_cache(
+            packed_user_prompt,
+            use_llm_func,
+            system_prompt=entity_extraction_system_prompt,
+        )
+        sections = _split_packed_result(final_result, len(pending), section_delimiter)
+        truncated = (
+            context_base["completion_delimiter"].lower() not in final_result.lower()
+        )
+
+        # First pass results of every chunk, None for sections the model skipped
+        first_pass = []
+        for number, (chunk_key, chunk_dp, _, _) in enumerate(pending, start=1):
+            if number not in sections:
+                first_pass.append(None)
+                continue
+            chunk_result = f"{sections[number]}\n{context_base['completion_delimiter']}"
+            nodes, edges = await _process_extraction_result(
+                chunk_result,
+                chunk_key,
+                timestamp,
+                chunk_dp.get("file_path", "unknown_source"),
+                tuple_delimiter=context_base["tuple_delimiter"],
+                completion_delimiter=context_base["completion_delimiter"],
+            )
+            first_pass.append((chunk_result, nodes, edges))
+
+        # The pack is gleaned with one call if any of its chunks needs it
+        glean_sections = None
+        extracted = [
+            (chunk_dp.get("tokens", 0), len(result[1]) + len(result[2]))
+            for (_, chunk_dp, _, _), result in zip(pending, first_pass)
+            if result is not None
+        ]
+        if (
+            entity_extract_max_gleaning > 0
+            and extracted
+            and _should_glean(extracted, truncated)
+        ):
+            glean_result, _ = await use_llm_func_with_cache(
+                PROMPTS["entity_continue_extraction_packed_user_prompt"].format(
+                    **packed_context
+                ),
+                use_llm_func,
+                system_prompt=entity_extraction_system_prompt,
+                history_messages=pack_user_ass_to_openai_messages(
+                    packed_user_prompt, final_result
+                ),
+            )
+            glean_sections = _split_packed_result(
+                glean_result, len(pending), section_delimiter
+            )
+
+        for number, (
+            (chunk_key, chunk_dp, cache_prompt, cache_hashes),
+            result,
+        ) in enumerate(zip(pending, first_pass), start=1):
+            if result is None:
+                # The model skipped the section, extract the chunk on its own
+                logger.warning(
+                    f"{chunk_key}: Section missing in packed extraction result, extracting chunk separately"
+                )
+                results.append(await _process_single_content((chunk_key, chunk_dp)))
+                continue
+
+            chunk_results_text = [result[0]]
+            maybe_nodes, maybe_edges = result[1], result[2]
+            if glean_sections is not None:
+                glean_text = f"{glean_sections.get(number, '')}\n{context_base['completion_delimiter']}"
+                glean_nodes, glean_edges = await _process_extraction_result(
+                    glean_text,
+                    chunk_key,
+                    timestamp,
+                    chunk_dp.get("file_path", "unknown_source"),
+                    tuple_delimiter=context_base["tuple_delimiter"],
+                    completion_delimiter=context_base["completion_delimiter"],
+                )
+                record_count = len(maybe_nodes) + len(maybe_edges)
+                changed = _merge_gleaning_result(
+                    maybe_nodes, maybe_edges, glean_nodes, glean_edges
+                )
+                if gleaning_policy is not None:
+                    gleaning_policy.record(
+                        chunk_dp.get("tokens", 0), record_count, changed > 0
+                    )
+                chunk_results_text.append(glean_text)
+
+            cache_keys = []
+            if cache_enabled:
+                for chunk_result, args_hash in zip(chunk_results_text, cache_hashes):
+                    await save_to_cache(
+                        llm_response_cache,
+                        CacheData(
+                            args_hash=args_hash,
+                            content=chunk_result,
+                            prompt=cache_prompt,
+                            cache_type="extract",
+                            chunk_id=chunk_key,
+                        ),
+                    )
+                    cache_keys.append(
+                        generate_cache_key("default", "extract", args_hash)
+                    )
+
+            results.append(
+                await _finish_chunk(chunk_key, maybe_nodes, maybe_edges, cache_keys)
+            )
+        return results
+
     # Get max async tasks limit from global_config
     chunk_max_async = global_config.get("llm_model_max_async", 4)
     semaphore = asyncio.Semaphore(chunk_max_async)
 
-    async def _process_with_semaphore(chunk):
+    async def _process_with_semaphore(pack: list[tuple[str, TextChunkSchema]]):
         async with semaphore:
             try:
-                return await _process_single_content(chunk)
+                if len(pack) == 1:
+                    return [await _process_single_content(pack[0])]
+                return await _process_packed_contents(pack)
             except Exception as e:
-                chunk_id = chunk[0]  # Extract chunk_id from chunk[0]
+                chunk_id = pack[0][0]  # Extract chunk_id of the first chunk
                 prefixed_exception = create_prefixed_exception(e, chunk_id)
                 raise prefixed_exception from e
 
+    # Small chunks are packed into shared extraction requests when enabled
+    pack_size = global_config.get("entity_extract_pack_size", 1)
+    if pack_size > 1:
+        packs = _pack_chunks(
+            ordered_chunks, pack_size, global_config.get("chunk_token_size", 1200)
+        )
+        if len(packs) < len(ordered_chunks):
+            logger.info(
+                f"Packed {len(ordered_chunks)} chunks into {len(packs)} extraction requests"
+            )
+    else:
+        packs = [[chunk] for chunk in ordered_chunks]
+
     tasks = []
-    for c in ordered_chunks:
-        task = asyncio.create_task(_process_with_semaphore(c))
+    for pack in packs:
+        task = asyncio.create_task(_process_with_semaphore(pack))
         tasks.append(task)
 
     # Wait for tasks to complete or for the first exception to occur
@@ -2206,7 +2773,7 @@ async def extract_entities(
                 if first_exception is None:
                     first_exception = exception
             else:
-                chunk_results.append(task.result())
+                chunk_results.extend(task.result())
         except Exception as e:
             if first_exception is None:
                 first_exception = e
@@ -2228,6 +2795,14 @@ async def extract_entities(
         prefixed_exception = create_prefixed_exception(first_exception, progress_prefix)
         raise prefixed_exception from first_exception
 
+    if gleaning_skipped:
+        status_message = f"Gleaning skipped for {gleaning_skipped} of {gleaning_calls + gleaning_skipped} extraction requests ({gleaning_skipped} LLM calls saved)"
+        logger.info(status_message)
+        if pipeline_status is not None and pipeline_status_lock is not None:
+            async with pipeline_status_lock:
+                pipeline_status["latest_message"] = status_message
+                pipeline_status["history_messages"].append(status_message)
+
     # If all tasks completed successfully, chunk_results already contains the results
     # Return the chunk_results for later processing in merge_nodes_and_edges
     return chunk_results
@@ -7,6 +7,7 @@ PROMPTS: dict[str, Any] = {}
 # All delimiters must be formatted as "<|UPPER_CASE_STRING|>"
 PROMPTS["DEFAULT_TUPLE_DELIMITER"] = "<|#|>"
 PROMPTS["DEFAULT_COMPLETION_DELIMITER"] = "<|COMPLETE|>"
+PROMPTS["DEFAULT_SECTION_DELIMITER"] = "<|SECTION|>"
 
 PROMPTS["entity_extraction_system_prompt"] = """---Role---
 You are a Knowledge Graph Specialist responsible for extracting entities and relationships from the input text.
@@ -58,16 +59,11 @@ You are a Knowledge Graph Specialist responsible for extracting entities and rel
 
 ---Examples---
 {examples}
-
----Real Data to be Processed---
-<Input>
-Entity_types: [{entity_types}]
-Text:
-```
-{input_text}
-```
 """
 
+# The system prompt and the instructions of the user prompt do not depend on
+# the chunk, the input text comes last so that extraction prompts share a
+# byte-identical prefix for provider prompt caching
 PROMPTS["entity_extraction_user_prompt"] = """---Task---
 Extract entities and relationships from the input text to be processed.
 
@@ -77,6 +73,14 @@ Extract entities and relationships from the input text to be processed.
 3.  **Completion Signal:** Output `{completion_delimiter}` as the final line after all relevant entities and relationships have been extracted and presented.
 4.  **Oputput Language:** Ensure the output language is {language}. Proper nouns (e.g., personal names, place names, organization names) must be kept in their original language and not translated.
 
+---Real Data to be Processed---
+<Input>
+Entity_types: [{entity_types}]
+Text:
+```
+{input_text}
+```
+
 <Output>
 """
 
@@ -98,6 +102,50 @@ Based on the last extraction task, identify and extract any **missed or incorrec
 <Output>
 """
 
+# Used when several small chunks are extracted in one request, each chunk is a
+# numbered section and the records are routed back to it by the section lines
+PROMPTS["entity_extraction_packed_user_prompt"] = """---Task---
+Extract entities and relationships from each of the {section_count} numbered text sections to be processed. The sections are unrelated texts: extract each section independently.
+
+---Instructions---
+1.  **Sections:** Each section of the input starts with a line `{section_delimiter}N`, where N is the section number. For each section, output the line `{section_delimiter}N` followed by the entities and relationships extracted from that section only. Output all sections in order, including sections without any entity.
+2.  **Strict Adherence to Format:** Strictly adhere to all format requirements for entity and relationship lists, including output order, field delimiters, and proper noun handling, as specified in the system prompt.
+3.  **Output Content Only:** Output *only* the section lines and the extracted lists of entities and relationships. Do not include any introductory or concluding remarks, explanations, or additional text.
+4.  **Completion Signal:** Output `{completion_delimiter}` as the final line after all sections have been processed.
+5.  **Oputput Language:** Ensure the output language is {language}. Proper nouns (e.g., personal names, place names, organization names) must be kept in their original language and not translated.
+
+---Real Data to be Processed---
+<Input>
+Entity_types: [{entity_types}]
+{input_sections}
+
+<Output>
+"""
+
+PROMPTS["entity_extraction_packed_section"] = """{section_delimiter}{section_number}
+Text:
+```
+{input_text}
+```
+"""
+
+PROMPTS["entity_continue_extraction_packed_user_prompt"] = """---Task---
+Based on the last extraction task, identify and extract any **missed or incorrectly formatted** entities and relationships from the numbered text sections.
+
+---Instructions---
+1.  **Sections:** Output the line `{section_delimiter}N` before the entities and relationships of section N. Skip sections without missed or incorrect records.
+2.  **Strict Adherence to System Format:** Strictly adhere to all format requirements for entity and relationship lists, including output order, field delimiters, and proper noun handling, as specified in the system instructions.
+3.  **Focus on Corrections/Additions:**
+    *   **Do NOT** re-output entities and relationships that were **correctly and fully** extracted in the last task.
+    *   If an entity or relationship was **missed** in the last task, extract and output it now according to the system format.
+    *   If an entity or relationship was **truncated, had missing fields, or was otherwise incorrectly formatted** in the last task, re-output the *corrected and complete* version in the specified format.
+4.  **Output Content Only:** Output *only* the section lines and the extracted lists of entities and relationships. Do not include any introductory or concluding remarks, explanations, or additional text.
+5.  **Completion Signal:** Output `{completion_delimiter}` as the final line after all relevant missing or corrected entities and relationships have been extracted and presented.
+6.  **Oputput Language:** Ensure the output language is {language}. Proper nouns (e.g., personal names, place names, organization names) must be kept in their original language and not translated.
+
+<Output>
+"""
+
 PROMPTS["entity_extraction_examples"] = [
     """<Input Text>
 ```
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark the multiprocess locks of shared_storage under contention.
+
+Forks worker processes that hammer the global storage lock and keyed locks the
+way the merge phase does, once with Manager locks and once with fcntl process
+locks, and reports acquisitions per second.
+
+Usage:
+    python -m lightrag.tools.lock_benchmark
+    python -m lightrag.tools.lock_benchmark --workers 8 --tasks 16 --ops 2000 --keys 500
+"""
+
+import argparse
+import asyncio
+import multiprocessing as mp
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from lightrag.kg import shared_storage
+from lightrag.kg.process_lock import process_locks_supported
+
+
+async def _run_tasks(worker: int, tasks: int, ops: int, keys: int) -> None:
+    async def task(task_id: int) -> None:
+        rng = random.Random(worker * 1000 + task_id)
+        for i in range(ops):
+            if i % 10 == 0:
+                async with shared_storage.get_storage_lock():
+                    pass
+            else:
+                # Entity merges lock one key, relation merges lock two
+                batch = [f"entity-{k}" for k in rng.sample(range(keys), 1 + i % 2)]
+                async with shared_storage.get_storage_keyed_lock(
+                    batch, namespace="GraphDB"
+                ):
+                    pass
+
+    await asyncio.gather(*(task(t) for t in range(tasks)))
+
+
+def _worker(worker: int, tasks: int, ops: int, keys: int) -> None:
+    asyncio.run(_run_tasks(worker, tasks, ops, keys))
+
+
+def run_benchmark(
+    use_process_locks: bool, workers: int, tasks: int, ops: int, keys: int
+) -> float:
+    """Run one round and return lock acquisitions per second"""
+    shared_storage.USE_PROCESS_LOCKS = use_process_locks
+    shared_storage.initialize_share_data(workers)
+    try:
+        ctx = mp.get_context("fork")
+        processes = [
+            ctx.Process(target=_worker, args=(w, tasks, ops, keys))
+            for w in range(workers)
+        ]
+        start = time.perf_counter()
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - start
+        failed = [p.exitcode for p in processes if p.exitcode != 0]
+        if failed:
+            raise RuntimeError(f"{len(failed)} benchmark workers failed")
+    finally:
+        shared_storage.finalize_share_data()
+    return workers * tasks * ops / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark shared_storage locks across worker processes"
+    )
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--tasks", type=int, default=8, help="Coroutines per worker")
+    parser.add_argument("--ops", type=int, default=1000, help="Acquisitions per task")
+    parser.add_argument("--keys", type=int, default=200, help="Distinct lock keys")
+    args = parser.parse_args()
+
+    backends = [("manager", False)]
+    if process_locks_supported():
+        backends.append(("fcntl", True))
+
+    print(
+        f"{args.workers} workers x {args.tasks} tasks x {args.ops} ops, {args.keys} keys"
+    )
+    for name, use_process_locks in backends:
+        rate = run_benchmark(
+            use_process_locks, args.workers, args.tasks, args.ops, args.keys
+        )
+        print(f"  {name:8s} {rate:12.0f} acquisitions/s")
+
+
+if __name__ == "__main__":
+    main()
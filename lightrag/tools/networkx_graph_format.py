@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Convert NetworkXStorage graph files between GraphML and the binary format,
+and benchmark loading both formats.
+
+Usage:
+    python -m lightrag.tools.networkx_graph_format import graph_chunk_entity_relation.graphml
+    python -m lightrag.tools.networkx_graph_format export graph_chunk_entity_relation.nxb
+    python -m lightrag.tools.networkx_graph_format benchmark --nodes 100000
+    python -m lightrag.tools.networkx_graph_format benchmark --graphml existing.graphml
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import networkx as nx
+
+from lightrag.constants import GRAPH_FIELD_SEP
+from lightrag.kg.networkx_binary import (
+    binary_to_graphml,
+    graphml_to_binary,
+    read_graph_binary,
+    write_graph_binary,
+)
+
+
+def build_sample_graph(num_nodes: int, avg_degree: int = 4) -> nx.Graph:
+    """Build a random graph shaped like a LightRAG knowledge graph"""
+    rng = random.Random(42)
+    entity_types = ["person", "organization", "location", "event", "concept"]
+    graph = nx.Graph()
+    for i in range(num_nodes):
+        graph.add_node(
+            f"Entity {i}",
+            entity_id=f"Entity {i}",
+            entity_type=rng.choice(entity_types),
+            description=f"Description of entity {i} " * 5,
+            source_id=GRAPH_FIELD_SEP.join(
+                f"chunk-{rng.randrange(num_nodes)}" for _ in range(2)
+            ),
+            file_path=f"document_{i % 100}.txt",
+            created_at=1700000000 + i,
+        )
+    for _ in range(num_nodes * avg_degree // 2):
+        u = rng.randrange(num_nodes)
+        v = rng.randrange(num_nodes)
+        if u == v:
+            continue
+        graph.add_edge(
+            f"Entity {u}",
+            f"Entity {v}",
+            weight=float(rng.randint(1, 10)),
+            description=f"Relation between {u} and {v}",
+            keywords="related",
+            source_id=f"chunk-{rng.randrange(num_nodes)}",
+            file_path=f"document_{u % 100}.txt",
+            created_at=1700000000,
+        )
+    return graph
+
+
+def _time_it(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark(graphml_file: str | None, num_nodes: int, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if graphml_file is None:
+            graphml_file = os.path.join(tmp_dir, "sample.graphml")
+            print(f"Building sample graph with {num_nodes} nodes...")
+            nx.write_graphml(build_sample_graph(num_nodes), graphml_file)
+
+        graph = nx.read_graphml(graphml_file)
+        print(
+            f"Graph: {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges"
+        )
+        graphml_time = _time_it(lambda: nx.read_graphml(graphml_file), repeat)
+        print(
+            f"graphml      size {os.path.getsize(graphml_file):>12,} B  load {graphml_time:8.3f}s"
+        )
+
+        for compression in ("none", "zlib", "zstd"):
+            binary_file = os.path.join(tmp_dir, f"graph_{compression}.nxb")
+            try:
+                write_graph_binary(graph, binary_file, compression)
+            except Exception as e:
+                print(f"binary/{compression:<5} skipped: {e}")
+                continue
+            loaded = read_graph_binary(binary_file)
+            if not nx.utils.graphs_equal(graph, loaded):
+                print(f"binary/{compression:<5} round trip mismatch!")
+            binary_time = _time_it(lambda: read_graph_binary(binary_file), repeat)
+            print(
+                f"binary/{compression:<5} size {os.path.getsize(binary_file):>12,} B  load {binary_time:8.3f}s  speedup {graphml_time / binary_time:6.1f}x"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="NetworkXStorage graph file conversion and benchmark"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="Convert GraphML to binary")
+    import_parser.add_argument("graphml_file")
+    import_parser.add_argument("binary_file", nargs="?")
+    import_parser.add_argument(
+        "--compression", default="none", choices=["none", "zlib", "zstd"]
+    )
+
+    export_parser = subparsers.add_parser("export", help="Convert binary to GraphML")
+    export_parser.add_argument("binary_file")
+    export_parser.add_argument("graphml_file", nargs="?")
+
+    bench_parser = subparsers.add_parser(
+        "benchmark", help="Compare load time of GraphML and binary formats"
+    )
+    bench_parser.add_argument(
+        "--graphml", help="Existing GraphML file (default: generated sample graph)"
+    )
+    bench_parser.add_argument("--nodes", type=int, default=50000)
+    bench_parser.add_argument("--repeat", type=int, default=3)
+
+    args = parser.parse_args()
+
+    if args.command == "import":
+        binary_file = args.binary_file or str(
+            Path(args.graphml_file).with_suffix(".nxb")
+        )
+        graphml_to_binary(args.graphml_file, binary_file, args.compression)
+        print(f"Wrote {binary_file}")
+    elif args.command == "export":
+        graphml_file = args.graphml_file or str(
+            Path(args.binary_file).with_suffix(".graphml")
+        )
+        binary_to_graphml(args.binary_file, graphml_file)
+        print(f"Wrote {graphml_file}")
+    else:
+        benchmark(args.graphml, args.nodes, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
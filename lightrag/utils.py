@@ -11,6 +11,9 @@ import os
 import re
 import time
 import uuid
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
 from datetime import datetime
 from functools import wraps
@@ -26,6 +29,7 @@ from lightrag.constants import (
     GRAPH_FIELD_SEP,
     DEFAULT_MAX_TOTAL_TOKENS,
     DEFAULT_MAX_FILE_PATH_LENGTH,
+    QUERY_CALL_PRIORITY,
 )
 
 # Initialize logger with basic configuration
@@ -433,6 +437,370 @@ class HealthCheckTimeoutError(Exception):
         )
 
 
+def is_overload_error(error: BaseException) -> bool:
+    """Whether an error signals that the provider is overloaded (rate limit or timeout)"""
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, WorkerTimeoutError)):
+        return True
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(error, "response", None), "status_code", None)
+    if status_code in (429, 503):
+        return True
+    error_name = type(error).__name__
+    return "RateLimit" in error_name or "Timeout" in error_name
+
+
+class AdaptiveConcurrencyLimit:
+    """AIMD concurrency limit used by priority_limit_async_func_call
+
+    The limit grows by one after a window of healthy calls (as many calls as
+    the current limit, none slower than latency_tolerance times the baseline
+    latency) and is multiplied by backoff_factor when a call fails with a rate
+    limit or timeout error, or when the LLM binding reports one it retries (see
+    `report_overload`). Slow calls hold the limit where it is.
+
+    Args:
+        initial_limit: Limit to start with
+        max_limit: Upper bound of the limit
+        min_limit: Lower bound of the limit
+        backoff_factor: Multiplicative decrease on overload errors
+        latency_tolerance: Calls slower than this multiple of the baseline are unhealthy
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        max_limit: int,
+        min_limit: int = 1,
+        backoff_factor: float = 0.5,
+        latency_tolerance: float = 2.0,
+    ):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.limit = min(max(initial_limit, self.min_limit), self.max_limit)
+        self.backoff_factor = backoff_factor
+        self.latency_tolerance = latency_tolerance
+        self.in_use = 0  # Workers allowed to take a task from the queue
+        self._condition = asyncio.Condition()
+        self._healthy_calls = 0
+        # Baseline follows lower latencies at once and higher ones slowly
+        self._latency_baseline: float | None = None
+        self._latency_avg: float | None = None
+        self._last_decrease = 0.0
+
+    async def acquire(self, timeout: float) -> bool:
+        """Wait until the number of permits in use is below the limit"""
+        async with self._condition:
+            try:
+                await asyncio.wait_for(
+                    self._condition.wait_for(lambda: self.in_use < self.limit),
+                    timeout=timeout,
+                )
+            except asyncio.TimeoutError:
+                return False
+            self.in_use += 1
+            return True
+
+    async def release(
+        self, latency: float | None = None, error: BaseException | None = None
+    ) -> None:
+        """Return a permit and adjust the limit with the outcome of its call
+
+        Args:
+            latency: Duration of the call, None if no call was made
+            error: Exception raised by the call, if any
+        """
+        async with self._condition:
+            self.in_use -= 1
+            if error is not None:
+                if is_overload_error(error):
+                    self._decrease()
+            elif latency is not None:
+                self._record_latency(latency)
+            self._condition.notify_all()
+
+    def _record_latency(self, latency: float) -> None:
+        if self._latency_baseline is None:
+            self._latency_baseline = self._latency_avg = latency
+        else:
+            self._latency_avg += (latency - self._latency_avg) * 0.2
+            if latency < self._latency_baseline:
+                self._latency_baseline = latency
+            else:
+                self._latency_baseline += (latency - self._latency_baseline) * 0.01
+
+        if latency > self._latency_baseline * self.latency_tolerance:
+            self._healthy_calls = 0
+            return
+        self._healthy_calls += 1
+        if self._healthy_calls >= self.limit and self.limit < self.max_limit:
+            self.limit += 1
+            self._healthy_calls = 0
+            logger.debug(f"Adaptive concurrency: limit increased to {self.limit}")
+
+    def _decrease(self) -> None:
+        # Calls started before the last decrease fail for the same reason,
+        # only back off once per average call duration
+        now = time.monotonic()
+        if now - self._last_decrease < (self._latency_avg or 1.0):
+            return
+        self._last_decrease = now
+        self._healthy_calls = 0
+        new_limit = max(self.min_limit, int(self.limit * self.backoff_factor))
+        if new_limit < self.limit:
+            self.limit = new_limit
+            logger.info(
+                f"Adaptive concurrency: provider overloaded, limit decreased to {self.limit}"
+            )
+
+    def report_overload(self) -> None:
+        """Back off on an overload error that the running call retries internally"""
+        self._decrease()
+
+
+class TokenBucketRateLimiter:
+    """Requests-per-minute and tokens-per-minute budget of a provider
+
+    Both buckets hold up to one minute of budget and refill continuously.
+    Callers are admitted one at a time in the order they ask, so a caller
+    waiting for tokens is not overtaken by smaller later requests.
+
+    Args:
+        rpm: Requests per minute, 0 for no limit
+        tpm: Tokens per minute, 0 for no limit
+    """
+
+    def __init__(self, rpm: int = 0, tpm: int = 0):
+        self.rpm = max(0, rpm)
+        self.tpm = max(0, tpm)
+        self._requests = float(self.rpm)
+        self._tokens = float(self.tpm)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.rpm or self.tpm)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.rpm:
+            self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        if self.tpm:
+            self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+
+    async def acquire(self, tokens: int = 0) -> int:
+        """Wait until the budget allows one request of `tokens` tokens, then debit it
+
+        Returns:
+            int: Tokens debited, to be passed to `reconcile` once the usage is known
+        """
+        async with self._lock:
+            # A request larger than the whole budget waits for a full bucket
+            tokens = min(tokens, self.tpm)
+            while True:
+                self._refill()
+                wait = 0.0
+                if self.rpm and self._requests < 1:
+                    wait = (1 - self._requests) * 60 / self.rpm
+                if self.tpm and self._tokens < tokens:
+                    wait = max(wait, (tokens - self._tokens) * 60 / self.tpm)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            if self.rpm:
+                self._requests -= 1
+            if self.tpm:
+                self._tokens -= tokens
+                return tokens
+            return 0
+
+    def reconcile(self, debited_tokens: int, actual_tokens: int) -> None:
+        """Correct the token bucket with the usage reported by the provider
+
+        Args:
+            debited_tokens: Tokens debited by `acquire` for the request
+            actual_tokens: Tokens the request actually used
+        """
+        if not self.tpm:
+            return
+        self._refill()
+        self._tokens = min(self.tpm, self._tokens - (actual_tokens - debited_tokens))
+
+    def get_stats(self) -> dict[str, Any]:
+        self._refill()
+        return {
+            "rpm": self.rpm,
+            "tpm": self.tpm,
+            "available_requests": int(self._requests) if self.rpm else None,
+            "available_tokens": int(self._tokens) if self.tpm else None,
+        }
+
+
+# Token usage reported by the LLM binding of the call a limiter worker runs
+_token_usage_sink: ContextVar[dict | None] = ContextVar(
+    "lightrag_token_usage_sink", default=None
+)
+
+
+def report_token_usage(token_counts: dict[str, int]) -> None:
+    """Report the token usage of an LLM response to the limiter running the call
+
+    LLM bindings call this with the usage returned by the provider, so
+    token-per-minute budgets are corrected from estimates to actual usage.
+    """
+    sink = _token_usage_sink.get()
+    if sink is not None:
+        total = token_counts.get("total_tokens") or (
+            token_counts.get("prompt_tokens", 0)
+            + token_counts.get("completion_tokens", 0)
+        )
+        sink["total_tokens"] = sink.get("total_tokens", 0) + total
+
+
+# Called when the LLM binding of the call a limiter worker runs retries an overload error
+_overload_handler: ContextVar[Callable[[], None] | None] = ContextVar(
+    "lightrag_overload_handler", default=None
+)
+
+
+def report_overload(error: BaseException) -> None:
+    """Report an overload error that an LLM binding retries internally
+
+    Bindings retry rate limit and timeout errors themselves, so the limiter
+    running the call would only see them once every retry failed. Reporting
+    the first retried error lets adaptive concurrency back off at once.
+    """
+    handler = _overload_handler.get()
+    if handler is not None and is_overload_error(error):
+        handler()
+
+
+def report_retried_overload(retry_state) -> None:
+    """tenacity `before_sleep` hook passing retried errors to `report_overload`"""
+    if retry_state.outcome is not None and retry_state.outcome.failed:
+        report_overload(retry_state.outcome.exception())
+
+
+# False while a caller that retries failed calls itself (e.g. EndpointRouter) runs them
+_binding_retries_enabled: ContextVar[bool] = ContextVar(
+    "lightrag_binding_retries_enabled", default=True
+)
+
+
+@contextmanager
+def binding_retries_disabled():
+    """Make LLM and embedding bindings called inside the block fail without retrying"""
+    token = _binding_retries_enabled.set(False)
+    try:
+        yield
+    finally:
+        _binding_retries_enabled.reset(token)
+
+
+def stop_if_binding_retries_disabled(retry_state) -> bool:
+    """tenacity stop condition ending binding retries inside `binding_retries_disabled`"""
+    return not _binding_retries_enabled.get()
+
+
+class HedgePolicy:
+    """Hedged requests for latency critical calls of priority_limit_async_func_call
+
+    When a call has run longer than the given percentile of recent latencies,
+    a duplicate is sent and the first successful response wins; the other
+    call is cancelled. Every call earns `budget` hedge credits (at most
+    `max_credits`) and a hedge spends one, so at most a `budget` fraction of
+    calls is duplicated.
+
+    Args:
+        percentile: Latency percentile after which a call is hedged
+        budget: Fraction of calls that may be hedged
+        min_samples: Latencies to collect before hedging starts
+        window: Number of recent latencies the percentile is computed over
+        max_credits: Cap of the hedge credits saved up while calls are fast
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95,
+        budget: float = 0.05,
+        min_samples: int = 20,
+        window: int = 200,
+        max_credits: float = 5.0,
+    ):
+        self.percentile = min(max(percentile, 0), 100)
+        self.budget = budget
+        self.min_samples = min_samples
+        self.max_credits = max_credits
+        self._latencies = deque(maxlen=window)
+        self._credits = 0.0
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def delay(self) -> float | None:
+        """Seconds after which a call is hedged, None while not enough samples"""
+        if len(self._latencies) < self.min_samples:
+            return None
+        latencies = sorted(self._latencies)
+        return latencies[int(self.percentile / 100 * (len(latencies) - 1))]
+
+    async def run(self, func: Callable, args: tuple, kwargs: dict) -> Any:
+        """Call func, hedging it once it is slower than the latency percentile"""
+        self.calls += 1
+        self._credits = min(self.max_credits, self._credits + self.budget)
+        delay = self.delay()
+        start = time.monotonic()
+        calls = [asyncio.ensure_future(func(*args, **kwargs))]
+        try:
+            if delay is not None and self._credits >= 1:
+                done, _ = await asyncio.wait(calls, timeout=delay)
+                if not done:
+                    self._credits -= 1
+                    self.hedged += 1
+                    calls.append(asyncio.ensure_future(func(*args, **kwargs)))
+            result, winner = await self._first_success(calls)
+            if winner != 0:
+                self.hedge_wins += 1
+            self._latencies.append(time.monotonic() - start)
+            return result
+        finally:
+            for call in calls:
+                if not call.done():
+                    call.cancel()
+
+    @staticmethod
+    async def _first_success(calls: list[asyncio.Future]) -> tuple[Any, int]:
+        pending = set(calls)
+        errors = {}
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for call in done:
+                if call.cancelled():
+                    continue
+                if call.exception() is None:
+                    return call.result(), calls.index(call)
+                errors[calls.index(call)] = call.exception()
+        if not errors:
+            raise asyncio.CancelledError()
+        # Prefer the error of the original call
+        raise errors[min(errors)]
+
+    def get_stats(self) -> dict[str, Any]:
+        delay = self.delay()
+        return {
+            "percentile": self.percentile,
+            "delay": round(delay, 3) if delay is not None else None,
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+        }
+
+
 def priority_limit_async_func_call(
     max_size: int,
     llm_timeout: float = None,
@@ -441,6 +809,12 @@ def priority_limit_async_func_call(
     max_queue_size: int = 1000,
     cleanup_timeout: float = 2.0,
     queue_name: str = "limit_async",
+    adaptive: bool = False,
+    max_adaptive_size: int | None = None,
+    rate_limiter: TokenBucketRateLimiter | None = None,
+    token_estimator: Callable[[tuple, dict], int] | None = None,
+    hedge_policy: HedgePolicy | None = None,
+    hedge_priority: int = 5,
 ):
     """
     Enhanced priority-limited asynchronous function call decorator with robust timeout handling
@@ -459,9 +833,16 @@ def priority_limit_async_func_call(
         max_task_duration: Maximum time before health check intervenes (defaults to llm_timeout + 60s)
         cleanup_timeout: Maximum time to wait for cleanup operations (defaults to 2.0s)
         queue_name: Optional queue name for logging identification (defaults to "limit_async")
+        adaptive: Adjust the concurrency between 1 and max_adaptive_size with AIMD,
+            starting at max_size (see AdaptiveConcurrencyLimit)
+        max_adaptive_size: Upper bound of the adaptive concurrency (defaults to 4 * max_size)
+        rate_limiter: RPM/TPM budget calls are admitted against, in priority order
+        token_estimator: Estimates the tokens of a call from its (args, kwargs)
+        hedge_policy: Hedge calls with `_priority <= hedge_priority` (query calls) after a latency percentile
+        hedge_priority: Lowest priority that is hedged (query calls use priority 5)
 
     Returns:
-        Decorator function
+        Decorator function, the decorated function has `shutdown()` and `get_stats()`
     """
 
     def final_decro(func):
@@ -494,54 +875,127 @@ def priority_limit_async_func_call(
         task_states_lock = asyncio.Lock()
         active_futures = weakref.WeakSet()
         reinit_count = 0
+        in_flight = 0
+        # priority -> calls waiting in the queue, for admission control
+        queued_by_priority = Counter()
+
+        # In adaptive mode there is a worker per possible slot, and only
+        # `concurrency.limit` of them may take tasks from the queue at a time
+        concurrency = (
+            AdaptiveConcurrencyLimit(
+                initial_limit=max_size,
+                max_limit=max_adaptive_size or max_size * 4,
+            )
+            if adaptive
+            else None
+        )
+        worker_count = concurrency.max_limit if concurrency else max_size
+        # Workers dequeue and pass rate limit admission one at a time, so the
+        # budget goes to tasks in priority order
+        admission_lock = asyncio.Lock()
 
         async def worker():
             """Enhanced worker that processes tasks with proper timeout and state management"""
+            nonlocal in_flight
+            call_overloaded = False
+
+            def on_overload() -> None:
+                # The first overload error retried by the binding backs off at once
+                nonlocal call_overloaded
+                if not call_overloaded:
+                    call_overloaded = True
+                    concurrency.report_overload()
+
             try:
                 while not shutdown_event.is_set():
+                    # Outcome of the call made with the concurrency permit
+                    call_latency = None
+                    call_error = None
+                    call_overloaded = False
+                    if concurrency is not None and not await concurrency.acquire(
+                        timeout=1.0
+                    ):
+                        continue
                     try:
-                        # Get task from queue with timeout for shutdown checking
+                        if rate_limiter is not None:
+                            await admission_lock.acquire()
                         try:
-                            (
-                                priority,
-                                count,
-                                task_id,
-                                args,
-                                kwargs,
-                            ) = await asyncio.wait_for(queue.get(), timeout=1.0)
-                        except asyncio.TimeoutError:
-                            continue
+                            # Get task from queue with timeout for shutdown checking
+                            try:
+                                (
+                                    priority,
+                                    count,
+                                    task_id,
+                                    args,
+                                    kwargs,
+                                ) = await asyncio.wait_for(queue.get(), timeout=1.0)
+                            except asyncio.TimeoutError:
+                                continue
+                            queued_by_priority[priority] -= 1
 
-                        # Get task state and mark worker as started
-                        async with task_states_lock:
-                            if task_id not in task_states:
+                            # Get task state and mark worker as started
+                            async with task_states_lock:
+                                if task_id not in task_states:
+                                    queue.task_done()
+                                    continue
+                                task_state = task_states[task_id]
+                                task_state.worker_started = True
+
+                            # Check if task was cancelled before worker started
+                            if (
+                                task_state.cancellation_requested
+                                or task_state.future.cancelled()
+                            ):
+                                async with task_states_lock:
+                                    task_states.pop(task_id, None)
                                 queue.task_done()
                                 continue
-                            task_state = task_states[task_id]
-                            task_state.worker_started = True
-                            # Record execution start time when worker actually begins processing
-                            task_state.execution_start_time = (
-                                asyncio.get_event_loop().time()
-                            )
 
-                        # Check if task was cancelled before worker started
-                        if (
-                            task_state.cancellation_requested
-                            or task_state.future.cancelled()
-                        ):
-                            async with task_states_lock:
-                                task_states.pop(task_id, None)
-                            queue.task_done()
-                            continue
+                            estimated_tokens = 0
+                            debited_tokens = 0
+                            if rate_limiter is not None:
+                                if token_estimator is not None:
+                                    try:
+                                        estimated_tokens = token_estimator(args, kwargs)
+                                    except Exception as e:
+                                        logger.debug(
+                                            f"{queue_name}: Token estimation failed: {e}"
+                                        )
+                                debited_tokens = await rate_limiter.acquire(
+                                    estimated_tokens
+                                )
+                        finally:
+                            if rate_limiter is not None:
+                                admission_lock.release()
 
+                        # Record execution start time when worker actually begins processing
+                        task_state.execution_start_time = (
+                            asyncio.get_event_loop().time()
+                        )
+                        in_flight += 1
+                        call_start = time.monotonic()
+                        usage = {}
+                        usage_token = _token_usage_sink.set(usage)
+                        overload_token = _overload_handler.set(
+                            on_overload if concurrency is not None else None
+                        )
                         try:
+                            if hedge_policy is not None and priority <= hedge_priority:
+                                call = hedge_policy.run(func, args, kwargs)
+                            else:
+                                call = func(*args, **kwargs)
                             # Execute function with timeout protection
                             if max_execution_timeout is not None:
                                 result = await asyncio.wait_for(
-                                    func(*args, **kwargs), timeout=max_execution_timeout
+                                    call, timeout=max_execution_timeout
                                 )
                             else:
-                                result = await func(*args, **kwargs)
+                                result = await call
+                            call_latency = time.monotonic() - call_start
+                            if rate_limiter is not None and usage.get("total_tokens"):
+                                rate_limiter.reconcile(
+                                    debited_tokens, usage["total_tokens"]
+                                )
 
                             # Set result if future is still valid
                             if not task_state.future.done():
@@ -552,12 +1006,11 @@ def priority_limit_async_func_call(
                             logger.warning(
                                 f"{queue_name}: Worker timeout for task {task_id} after {max_execution_timeout}s"
                             )
+                            call_error = WorkerTimeoutError(
+                                max_execution_timeout, "execution"
+                            )
                             if not task_state.future.done():
-                                task_state.future.set_exception(
-                                    WorkerTimeoutError(
-                                        max_execution_timeout, "execution"
-                                    )
-                                )
+                                task_state.future.set_exception(call_error)
                         except asyncio.CancelledError:
                             # Task was cancelled during execution
                             if not task_state.future.done():
@@ -570,9 +1023,13 @@ def priority_limit_async_func_call(
                             logger.error(
                                 f"{queue_name}: Error in decorated function for task {task_id}: {str(e)}"
                             )
+                            call_error = e
                             if not task_state.future.done():
                                 task_state.future.set_exception(e)
                         finally:
+                            _token_usage_sink.reset(usage_token)
+                            _overload_handler.reset(overload_token)
+                            in_flight -= 1
                             # Clean up task state
                             async with task_states_lock:
                                 task_states.pop(task_id, None)
@@ -584,6 +1041,13 @@ def priority_limit_async_func_call(
                             f"{queue_name}: Critical error in worker: {str(e)}"
                         )
                         await asyncio.sleep(0.1)
+                    finally:
+                        if concurrency is not None:
+                            # Latency of a call that waited for retries says
+                            # nothing about the health of the provider
+                            await concurrency.release(
+                                None if call_overloaded else call_latency, call_error
+                            )
             finally:
                 logger.debug(f"{queue_name}: Worker exiting")
 
@@ -638,7 +1102,7 @@ def priority_limit_async_func_call(
                     tasks.difference_update(done_tasks)
 
                     active_tasks_count = len(tasks)
-                    workers_needed = max_size - active_tasks_count
+                    workers_needed = worker_count - active_tasks_count
 
                     if workers_needed > 0:
                         logger.info(
@@ -688,7 +1152,7 @@ def priority_limit_async_func_call(
                     )
 
                 # Create worker tasks
-                workers_needed = max_size - active_tasks_count
+                workers_needed = worker_count - active_tasks_count
                 for _ in range(workers_needed):
                     task = asyncio.create_task(worker())
                     tasks.add(task)
@@ -710,10 +1174,31 @@ def priority_limit_async_func_call(
                 timeout_str = (
                     f"(Timeouts: {', '.join(timeout_info)})" if timeout_info else ""
                 )
+                adaptive_str = (
+                    f" (adaptive concurrency {concurrency.limit}, max {concurrency.max_limit})"
+                    if concurrency
+                    else ""
+                )
                 logger.info(
-                    f"{queue_name}: {workers_needed} new workers initialized {timeout_str}"
+                    f"{queue_name}: {workers_needed} new workers initialized{adaptive_str} {timeout_str}"
                 )
 
+        def get_stats() -> dict[str, Any]:
+            """Current concurrency limit, queued and executing calls"""
+            return {
+                "queue_name": queue_name,
+                "adaptive": concurrency is not None,
+                "limit": concurrency.limit if concurrency else max_size,
+                "max_limit": worker_count,
+                "in_flight": in_flight,
+                "queue_size": queue.qsize(),
+                "queued_by_priority": {
+                    p: n for p, n in queued_by_priority.items() if n
+                },
+                "rate_limit": rate_limiter.get_stats() if rate_limiter else None,
+                "hedging": hedge_policy.get_stats() if hedge_policy else None,
+            }
+
         async def shutdown():
             """Gracefully shut down all workers and cleanup resources"""
             logger.info(f"{queue_name}: Shutting down priority queue workers")
@@ -818,6 +1303,7 @@ def priority_limit_async_func_call(
                         await queue.put(
                             (_priority, current_count, task_id, args, kwargs)
                         )
+                    queued_by_priority[_priority] += 1
                 except asyncio.TimeoutError:
                     raise QueueFullError(
                         f"{queue_name}: Queue full, timeout after {_queue_timeout} seconds"
@@ -870,14 +1356,200 @@ def priority_limit_async_func_call(
                 async with task_states_lock:
                     task_states.pop(task_id, None)
 
-        # Add shutdown method to decorated function
+        # Add shutdown and stats methods to decorated function
         wait_func.shutdown = shutdown
+        wait_func.get_stats = get_stats
 
         return wait_func
 
     return final_decro
 
 
+def split_priority_pools(
+    query_func: Callable[..., Any],
+    background_func: Callable[..., Any],
+    query_priority: int = QUERY_CALL_PRIORITY,
+    borrow_share: float = 0.5,
+):
+    """Send query calls and background calls to separately limited pools
+
+    Both functions are wrapped by `priority_limit_async_func_call`. Calls with
+    `_priority <= query_priority` always go to the query pool, so a query never
+    waits for the extraction calls filling the background pool. Background calls
+    borrow query capacity while their own pool has a backlog and the query pool
+    is idle, but never more than `borrow_share` of its slots, which keeps room
+    for queries arriving meanwhile.
+
+    Returns:
+        Function with the call signature of the pools, plus `shutdown()`,
+        `get_stats()` and `queued_calls(max_priority)`
+    """
+    borrowed = 0
+
+    @wraps(background_func)
+    async def pooled_func(*args, _priority=10, **kwargs):
+        nonlocal borrowed
+        if _priority <= query_priority:
+            return await query_func(*args, _priority=_priority, **kwargs)
+
+        query_stats = query_func.get_stats()
+        # Running borrowed calls are part of the query pool's in_flight, so the
+        # share is checked against the borrowed count alone
+        if (
+            background_func.get_stats()["queue_size"] > 0
+            and query_stats["queue_size"] == 0
+            and query_stats["in_flight"] < query_stats["limit"]
+            and borrowed < int(query_stats["limit"] * borrow_share)
+        ):
+            borrowed += 1
+            try:
+                return await query_func(*args, _priority=_priority, **kwargs)
+            finally:
+                borrowed -= 1
+        return await background_func(*args, _priority=_priority, **kwargs)
+
+    def queued_calls(max_priority: int = query_priority) -> int:
+        """Calls with `_priority <= max_priority` waiting in either pool"""
+        return sum(
+            n
+            for func in (query_func, background_func)
+            for p, n in func.get_stats()["queued_by_priority"].items()
+            if p <= max_priority
+        )
+
+    async def shutdown():
+        await asyncio.gather(query_func.shutdown(), background_func.shutdown())
+
+    def get_stats() -> dict[str, Any]:
+        return {
+            "query": query_func.get_stats(),
+            "background": background_func.get_stats(),
+            "borrowed": borrowed,
+        }
+
+    pooled_func.shutdown = shutdown
+    pooled_func.get_stats = get_stats
+    pooled_func.queued_calls = queued_calls
+    return pooled_func
+
+
+def micro_batch_async_func_call(
+    max_batch_size: int,
+    linger: float = 0.01,
+    min_priority: int = 6,
+):
+    """Coalesce concurrent small embedding calls into batches of up to max_batch_size texts
+
+    Calls from all callers (e.g. the per-entity vector upserts of the merge
+    phase) are collected for at most `linger` seconds, sent as one call of the
+    wrapped function and the embeddings are split back per caller. The texts of
+    one caller are never split over two batches, calls with max_batch_size texts
+    or more go straight through. Calls with `_priority < min_priority` (query
+    embeddings) or other extra arguments are not delayed.
+
+    Args:
+        max_batch_size: Maximum number of texts per coalesced call
+        linger: Maximum time a call waits for others to join its batch
+        min_priority: Lowest call priority that is coalesced
+
+    Returns:
+        Decorator function, the decorated function keeps the attributes of the
+        wrapped one and adds micro batching counters to `get_stats()`
+    """
+
+    def final_decro(func):
+        pending = []  # (texts, priority, future)
+        pending_texts = 0
+        flush_handle = None
+        flush_tasks = set()
+        stats = {"calls": 0, "batches": 0}
+
+        def start_flush():
+            task = asyncio.create_task(flush())
+            flush_tasks.add(task)
+            task.add_done_callback(flush_tasks.discard)
+
+        def schedule_flush(delay: float):
+            nonlocal flush_handle
+            if flush_handle is not None:
+                flush_handle.cancel()
+            flush_handle = asyncio.get_running_loop().call_later(delay, start_flush)
+
+        async def flush():
+            nonlocal pending, pending_texts, flush_handle
+            flush_handle = None
+            batch, batch_texts = [], 0
+            while pending and (
+                not batch or batch_texts + len(pending[0][0]) <= max_batch_size
+            ):
+                texts, priority, future = pending.pop(0)
+                batch.append((texts, priority, future))
+                batch_texts += len(texts)
+            pending_texts -= batch_texts
+            if pending:
+                schedule_flush(0 if pending_texts >= max_batch_size else linger)
+            if not batch:
+                return
+
+            stats["batches"] += 1
+            try:
+                embeddings = await func(
+                    [text for texts, _, _ in batch for text in texts],
+                    _priority=min(priority for _, priority, _ in batch),
+                )
+                if len(embeddings) != batch_texts:
+                    raise ValueError(
+                        f"Embedding function returned {len(embeddings)} embeddings for {batch_texts} texts"
+                    )
+                offset = 0
+                for texts, _, future in batch:
+                    if not future.done():
+                        future.set_result(embeddings[offset : offset + len(texts)])
+                    offset += len(texts)
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            finally:
+                # Cancellation (e.g. limiter shutdown) leaves futures unresolved,
+                # cancel them so no batched caller waits forever
+                for _, _, future in batch:
+                    future.cancel()
+
+        @wraps(func)
+        async def batched_func(texts, _priority=10, **kwargs):
+            nonlocal pending_texts
+            if (
+                kwargs
+                or _priority < min_priority
+                or len(texts) >= max_batch_size
+                or linger <= 0
+            ):
+                return await func(texts, _priority=_priority, **kwargs)
+
+            stats["calls"] += 1
+            future = asyncio.get_running_loop().create_future()
+            pending.append((list(texts), _priority, future))
+            pending_texts += len(texts)
+            if pending_texts >= max_batch_size:
+                schedule_flush(0)
+            elif flush_handle is None:
+                schedule_flush(linger)
+            return await future
+
+        def get_stats() -> dict[str, Any]:
+            wrapped_stats = func.get_stats() if hasattr(func, "get_stats") else {}
+            return {
+                **wrapped_stats,
+                "micro_batching": {**stats, "pending_texts": pending_texts},
+            }
+
+        batched_func.get_stats = get_stats
+        return batched_func
+
+    return final_decro
+
+
 def wrap_embedding_func_with_attrs(**kwargs):
     """Wrap a function with attributes"""
 
@@ -2158,46 +2830,52 @@ async def pick_by_vector_similarity(
                 "Using pre-computed query embedding for vector similarity chunk selection"
             )
 
-        # Get chunk embeddings from vector database
-        chunk_vectors = await chunks_vdb.get_vectors_by_ids(all_chunk_ids)
+        # Let backends with server-side vector search rank the candidates
+        ranked = await chunks_vdb.similarity_by_ids(
+            query_embedding, all_chunk_ids, num_of_chunks
+        )
+        if ranked is not None:
+            selected_chunks = [chunk_id for chunk_id, _ in ranked[:num_of_chunks]]
+            logger.debug(
+                f"Vector similarity chunk selection: {len(selected_chunks)} chunks from {len(all_chunk_ids)} candidates (server-side)"
+            )
+            return selected_chunks
+
+        # Get chunk embeddings from vector database as one matrix
+        found_ids, chunk_matrix = await chunks_vdb.get_vector_matrix_by_ids(
+            all_chunk_ids
+        )
         logger.debug(
-            f"Vector similarity chunk selection: {len(chunk_vectors)} chunk vectors Retrieved"
+            f"Vector similarity chunk selection: {len(found_ids)} chunk vectors Retrieved"
         )
 
-        if not chunk_vectors or len(chunk_vectors) != len(all_chunk_ids):
-            if not chunk_vectors:
+        if not found_ids or len(found_ids) != len(all_chunk_ids):
+            if not found_ids:
                 logger.warning(
                     "Vector similarity chunk selection: no vectors retrieved from chunks_vdb"
                 )
             else:
                 logger.warning(
-                    f"Vector similarity chunk selection: found {len(chunk_vectors)} but expecting {len(all_chunk_ids)}"
+                    f"Vector similarity chunk selection: found {len(found_ids)} but expecting {len(all_chunk_ids)}"
                 )
             return []
 
-        # Calculate cosine similarities
-        similarities = []
-        valid_vectors = 0
-        for chunk_id in all_chunk_ids:
-            if chunk_id in chunk_vectors:
-                chunk_embedding = chunk_vectors[chunk_id]
-                try:
-                    # Calculate cosine similarity
-                    similarity = cosine_similarity(query_embedding, chunk_embedding)
-                    similarities.append((chunk_id, similarity))
-                    valid_vectors += 1
-                except Exception as e:
-                    logger.warning(
-                        f"Vector similarity chunk selection: failed to calculate similarity for chunk {chunk_id}: {e}"
-                    )
-            else:
-                logger.warning(
-                    f"Vector similarity chunk selection:  no vector found for chunk {chunk_id}"
-                )
+        # Cosine similarity of all chunks as one matrix-vector product
+        query_vector = np.asarray(query_embedding, dtype=np.float32)
+        row_norms = np.linalg.norm(chunk_matrix, axis=1)
+        row_norms[row_norms == 0] = 1.0
+        similarities = (chunk_matrix @ query_vector) / (
+            row_norms * (np.linalg.norm(query_vector) or 1.0)
+        )
 
-        # Sort by similarity (highest first) and select top num_of_chunks
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        selected_chunks = [chunk_id for chunk_id, _ in similarities[:num_of_chunks]]
+        # Top-k selection without sorting all candidates
+        k = min(num_of_chunks, len(found_ids))
+        if k < len(found_ids):
+            top_indices = np.argpartition(-similarities, k - 1)[:k]
+        else:
+            top_indices = np.arange(len(found_ids))
+        top_indices = top_indices[np.argsort(-similarities[top_indices], kind="stable")]
+        selected_chunks = [found_ids[i] for i in top_indices]
 
         logger.debug(
             f"Vector similarity chunk selection: {len(selected_chunks)} chunks from {len(all_chunk_ids)} candidates"
@@ -2232,6 +2910,7 @@ class TokenTracker:
         self.prompt_tokens = 0
         self.completion_tokens = 0
         self.total_tokens = 0
+        self.cached_tokens = 0
         self.call_count = 0
 
     def add_usage(self, token_counts):
@@ -2239,9 +2918,11 @@ class TokenTracker:
 
         Args:
             token_counts: A dictionary containing prompt_tokens, completion_tokens, total_tokens
+                and optionally cached_tokens (prompt tokens served from the provider's prompt cache)
         """
         self.prompt_tokens += token_counts.get("prompt_tokens", 0)
         self.completion_tokens += token_counts.get("completion_tokens", 0)
+        self.cached_tokens += token_counts.get("cached_tokens", 0)
 
         # If total_tokens is provided, use it directly; otherwise calculate the sum
         if "total_tokens" in token_counts:
@@ -2259,6 +2940,7 @@ class TokenTracker:
             "prompt_tokens": self.prompt_tokens,
             "completion_tokens": self.completion_tokens,
             "total_tokens": self.total_tokens,
+            "cached_tokens": self.cached_tokens,
             "call_count": self.call_count,
         }
 
@@ -2266,7 +2948,8 @@ class TokenTracker:
         usage = self.get_usage()
         return (
             f"LLM call count: {usage['call_count']}, "
-            f"Prompt tokens: {usage['prompt_tokens']}, "
+            f"Prompt tokens: {usage['prompt_tokens']} "
+            f"(cached: {usage['cached_tokens']}), "
             f"Completion tokens: {usage['completion_tokens']}, "
             f"Total tokens: {usage['total_tokens']}"
         )
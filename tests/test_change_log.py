@@ -0,0 +1,104 @@
+"""
+Unit tests for ChangeLog, the change log replayed by the workers of file based storages
+"""
+
+import os
+import struct
+
+from lightrag.kg.change_log import ChangeLog
+
+
+def _workers(tmp_path, count=2, max_bytes=1 << 20):
+    file_name = str(tmp_path / "kv_store_test.json.changes")
+    workers = [ChangeLog(file_name, max_bytes=max_bytes) for _ in range(count)]
+    for worker in workers:
+        worker.sync()
+    return workers
+
+
+def test_changes_are_replayed_in_order(tmp_path):
+    writer, reader = _workers(tmp_path)
+
+    writer.append([("upsert", {"a": 1})])
+    writer.append([("upsert", {"b": b"\x00\x01"}), ("delete", ["a"])])
+
+    assert reader.read_new() == [
+        [["upsert", {"a": 1}]],
+        [["upsert", {"b": b"\x00\x01"}], ["delete", ["a"]]],
+    ]
+    assert reader.read_new() == []
+    # The writer does not replay its own changes
+    assert writer.read_new() == []
+
+
+def test_both_workers_can_append(tmp_path):
+    first, second = _workers(tmp_path)
+
+    first.append(["from first"])
+    assert second.read_new() == [["from first"]]
+    second.append(["from second"])
+    assert first.read_new() == [["from second"]]
+
+
+def test_truncation_keeps_caught_up_workers(tmp_path):
+    writer, caught_up, behind = _workers(tmp_path, count=3, max_bytes=200)
+
+    writer.append(["x" * 50])
+    assert caught_up.read_new() == [["x" * 50]]
+
+    # Grows the log beyond max_bytes, so a new epoch starts from the last seq
+    writer.append(["y" * 200])
+    assert os.path.getsize(writer.file_name) > 200
+    assert caught_up.read_new() == [["y" * 200]]
+    # Missed the first entry, which is gone with the old epoch
+    assert behind.read_new() is None
+
+
+def test_reset_forces_a_full_reload(tmp_path):
+    writer, reader = _workers(tmp_path)
+
+    writer.append(["before drop"])
+    writer.reset()
+
+    assert reader.read_new() is None
+    reader.sync()
+    writer.append(["after drop"])
+    assert reader.read_new() == [["after drop"]]
+
+
+def test_torn_write_is_ignored_until_completed(tmp_path):
+    writer, reader = _workers(tmp_path)
+    writer.append(["complete"])
+
+    # Entry being appended: length prefix written, payload not yet
+    with open(writer.file_name, "ab") as f:
+        f.write(struct.pack("<I", 100))
+
+    assert reader.read_new() == [["complete"]]
+
+
+def test_missing_log_requires_a_full_reload(tmp_path):
+    writer, reader = _workers(tmp_path)
+    writer.append(["change"])
+    os.remove(writer.file_name)
+
+    assert reader.read_new() is None
+
+
+def test_disabled_log_writes_nothing(tmp_path):
+    file_name = str(tmp_path / "kv_store_test.json.changes")
+    log = ChangeLog(file_name, enabled=False)
+    log.sync()
+    log.append(["change"])
+
+    assert not os.path.exists(file_name)
+    assert log.read_new() is None
+
+
+def test_unsupported_values_reset_the_log(tmp_path):
+    writer, reader = _workers(tmp_path)
+    writer.append(["ok"])
+    writer.append([object()])
+
+    # Readers reload instead of missing the change
+    assert reader.read_new() is None
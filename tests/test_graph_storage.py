@@ -7,6 +7,7 @@
 
 支持的图存储类型包括：
 - NetworkXStorage
+- CompactGraphStorage
 - Neo4JStorage
 - MongoDBStorage
 - PGGraphStorage
@@ -108,8 +109,8 @@ async def initialize_graph_storage():
         "working_dir": os.environ.get("WORKING_DIR", "./rag_storage"),  # 工作目录
     }
 
-    # 如果使用 NetworkXStorage，需要先初始化 shared_storage
-    if graph_storage_type == "NetworkXStorage":
+    # 如果使用 NetworkXStorage 或 CompactGraphStorage，需要先初始化 shared_storage
+    if graph_storage_type in ("NetworkXStorage", "CompactGraphStorage"):
         initialize_share_data()  # 使用单进程模式
 
     try:
@@ -0,0 +1,95 @@
+"""
+Unit tests for LabelIndex and DegreeIndex, the label search indexes of in-memory graph storages
+"""
+
+import random
+
+from lightrag.kg.label_index import DegreeIndex, LabelIndex, score_label
+
+LABELS = [
+    "Apple",
+    "apple pie",
+    "Pineapple",
+    "APPLICATION",
+    "Big_Apple",
+    "Banana",
+    "banana split",
+    "Cherry",
+    "Apricot",
+    "ap",
+]
+
+
+def _brute_force(labels, query, limit):
+    query_lower = query.lower().strip()
+    matches = [
+        (label, score_label(label, label.lower(), query_lower))
+        for label in labels
+        if query_lower in label.lower()
+    ]
+    matches.sort(key=lambda x: (-x[1], x[0]))
+    return [label for label, _ in matches[:limit]]
+
+
+def test_substring_search_matches_a_full_scan():
+    index = LabelIndex(LABELS)
+
+    for query in ["apple", "APP", "pie", "nan", "an", "Cherry", "ple p", "xyz"]:
+        assert index.search(query, 50) == _brute_force(LABELS, query, 50), query
+
+
+def test_exact_and_prefix_matches_rank_first():
+    index = LabelIndex(LABELS)
+
+    assert index.search("apple", 2) == ["Apple", "apple pie"]
+    assert index.search("appl", 3) == ["APPLICATION", "Apple", "apple pie"]
+    # Prefix matches beyond the limit are cut in case-insensitive order
+    assert index.search("ap", 2) == ["ap", "Apple"]
+
+
+def test_random_labels_match_a_full_scan():
+    rng = random.Random(7)
+    alphabet = "abcde _"
+    labels = {
+        "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 12)))
+        for _ in range(500)
+    }
+    index = LabelIndex(labels)
+
+    for _ in range(200):
+        query = "".join(rng.choice(alphabet) for _ in range(rng.randint(3, 5)))
+        assert index.search(query, 20) == _brute_force(labels, query, 20), query
+
+
+def test_added_and_removed_labels():
+    index = LabelIndex(["Apple"])
+    index.add("Grape")
+    index.add("Grape")
+    assert len(index) == 2
+    assert index.search("rap") == ["Grape"]
+
+    index.remove("Grape")
+    index.remove("Missing")
+    assert len(index) == 1
+    assert index.search("rap") == []
+    assert index.search("gr") == []
+
+
+def test_empty_query_and_limit():
+    index = LabelIndex(LABELS)
+
+    assert index.search("  ") == []
+    assert index.search("apple", 0) == []
+
+
+def test_degree_index_top():
+    index = DegreeIndex([("a", 1), ("b", 3), ("c", 3)])
+    index.add_node("d")
+    index.adjust("a", 5)
+    index.adjust("b", -10)
+
+    assert index.top(3) == [("a", 6), ("c", 3), ("b", 0)]
+
+    index.remove_node("a")
+    assert len(index) == 3
+    assert index.top(1) == [("c", 3)]
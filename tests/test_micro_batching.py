@@ -0,0 +1,112 @@
+"""
+Unit tests for micro_batch_async_func_call, the embedding call coalescer
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from lightrag.utils import micro_batch_async_func_call
+
+
+def _embed_recorder(calls: list):
+    async def embed(texts, _priority=10):
+        calls.append(list(texts))
+        await asyncio.sleep(0)
+        return np.array([[float(len(text))] for text in texts])
+
+    return embed
+
+
+def test_concurrent_calls_are_coalesced_and_split_back():
+    calls = []
+    func = micro_batch_async_func_call(4, linger=0.01)(_embed_recorder(calls))
+
+    async def run():
+        return await asyncio.gather(
+            func(["a"]), func(["bb", "ccc"]), func(["dddd"]), func(["eeeee"])
+        )
+
+    results = asyncio.run(run())
+
+    assert [[row[0] for row in result] for result in results] == [
+        [1.0],
+        [2.0, 3.0],
+        [4.0],
+        [5.0],
+    ]
+    # The texts of one caller are never split over two batches
+    assert calls == [["a", "bb", "ccc", "dddd"], ["eeeee"]]
+    assert func.get_stats()["micro_batching"]["batches"] == 2
+
+
+def test_query_priority_and_full_calls_bypass_batching():
+    calls = []
+    func = micro_batch_async_func_call(2, linger=10)(_embed_recorder(calls))
+
+    async def run():
+        await func(["query"], _priority=5)
+        await func(["a", "b"])
+
+    asyncio.run(asyncio.wait_for(run(), timeout=1))
+    assert calls == [["query"], ["a", "b"]]
+
+
+def test_errors_are_raised_to_every_batched_caller():
+    async def embed(texts, _priority=10):
+        raise RuntimeError("provider down")
+
+    func = micro_batch_async_func_call(4, linger=0.01)(embed)
+
+    async def run():
+        return await asyncio.gather(func(["a"]), func(["b"]), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_wrong_embedding_count_is_an_error():
+    async def embed(texts, _priority=10):
+        return np.zeros((1, 1))
+
+    func = micro_batch_async_func_call(4, linger=0.01)(embed)
+
+    async def run():
+        return await asyncio.gather(func(["a"]), func(["b"]), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+def test_cancelled_batch_cancels_every_caller():
+    async def embed(texts, _priority=10):
+        raise asyncio.CancelledError()
+
+    func = micro_batch_async_func_call(4, linger=0.01)(embed)
+
+    async def run():
+        return await asyncio.wait_for(
+            asyncio.gather(func(["a"]), func(["b"]), return_exceptions=True),
+            timeout=2,
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, asyncio.CancelledError) for r in results)
+
+
+def test_cancelled_caller_does_not_break_the_batch():
+    calls = []
+    func = micro_batch_async_func_call(4, linger=0.01)(_embed_recorder(calls))
+
+    async def run():
+        cancelled = asyncio.create_task(func(["a"]))
+        kept = asyncio.create_task(func(["bb"]))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        return await kept
+
+    result = asyncio.run(run())
+    assert result[0][0] == 2.0